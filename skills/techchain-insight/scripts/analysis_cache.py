@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# =============================================================================
+# TechChain Insight - 跨运行分析结果缓存
+# 功能：按「规范化关键词 + 分析深度 + 新闻集合指纹」缓存完整分析结果
+# 策略：新闻集合无新增 → 直接复用；出现新新闻或知识库内容变化 → 重新分析
+# =============================================================================
+
+import json
+import hashlib
+import unicodedata
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+# 缓存格式版本（结构变化时递增，旧缓存自动失效）
+CACHE_VERSION = 2
+
+# 即使新闻未变化，超过该时长也重新分析（兜底，避免结果永久陈旧）
+CACHE_MAX_AGE_HOURS = 24
+
+def normalize_keyword(keyword: str) -> str:
+    """规范化关键词：全角转半角、小写、合并空白"""
+    text = unicodedata.normalize("NFKC", keyword or "")
+    return " ".join(text.lower().split())
+
+def news_keys(news_list: List[Dict[str, Any]]) -> List[str]:
+    """新闻集合的成员键（URL 优先，缺失时用标题），排序后返回"""
+    keys = set()
+    for news in news_list:
+        key = news.get("url") or news.get("title") or ""
+        if key:
+            keys.add(hashlib.sha1(key.encode("utf-8")).hexdigest()[:16])
+    return sorted(keys)
+
+def news_fingerprint(keys: List[str]) -> str:
+    """新闻集合指纹（与顺序无关）"""
+    return hashlib.sha1("\n".join(keys).encode("utf-8")).hexdigest()
+
+def _cache_file(cache_dir: Path, keyword: str, depth: str = "") -> Path:
+    # 不同分析深度的结果（细分数、公司数、搜索数不同）分开存放
+    key = hashlib.sha1(f"{normalize_keyword(keyword)}|{depth}".encode("utf-8")).hexdigest()[:20]
+    return cache_dir / f"{key}.json"
+
+def load_cached_analysis(cache_dir: Path, keyword: str, news_list: List[Dict[str, Any]],
+                         kb_version: str = "", depth: str = "") -> Optional[Dict[str, Any]]:
+    """
+    查找可复用的分析结果
+
+    命中条件：同一规范化关键词、同一分析深度、同一知识库版本，且本次新闻集合没有缓存中不存在的新条目
+    返回：{"result": {...}, "created_at": str, "age_seconds": int} 或 None
+    """
+    cache_file = _cache_file(cache_dir, keyword, depth)
+    if not cache_file.exists():
+        return None
+
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except Exception:
+        return None
+
+    if entry.get("version") != CACHE_VERSION:
+        return None
+    if entry.get("normalized_keyword") != normalize_keyword(keyword):
+        return None
+    if entry.get("kb_version", "") != kb_version:
+        return None
+    if entry.get("depth", "") != depth:
+        return None
+
+    try:
+        created_at = datetime.fromisoformat(entry["created_at"])
+    except Exception:
+        return None
+    age_seconds = int((datetime.now() - created_at).total_seconds())
+    if age_seconds > CACHE_MAX_AGE_HOURS * 3600:
+        return None
+
+    keys = news_keys(news_list)
+    if news_fingerprint(keys) != entry.get("news_fingerprint"):
+        # 指纹不同：仅当出现新条目时才需要重跑（条目减少不影响结论）
+        if not set(keys) <= set(entry.get("news_keys", [])):
+            return None
+
+    return {
+        "result": entry.get("result", {}),
+        "created_at": entry["created_at"],
+        "age_seconds": max(age_seconds, 0),
+    }
+
+def save_cached_analysis(cache_dir: Path, keyword: str, news_list: List[Dict[str, Any]], result: Dict[str, Any],
+                         kb_version: str = "", depth: str = ""):
+    """保存分析结果（先写临时文件再替换，避免并发读到半截文件）"""
+    keys = news_keys(news_list)
+    entry = {
+        "version": CACHE_VERSION,
+        "keyword": keyword,
+        "normalized_keyword": normalize_keyword(keyword),
+        "news_fingerprint": news_fingerprint(keys),
+        "news_keys": keys,
+        "kb_version": kb_version,
+        "depth": depth,
+        "created_at": datetime.now().isoformat(),
+        "result": result,
+    }
+
+    cache_file = _cache_file(cache_dir, keyword, depth)
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = cache_file.with_suffix(".tmp")
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(entry, f, ensure_ascii=False)
+    tmp_file.replace(cache_file)
+
+def format_cache_age(age_seconds: int) -> str:
+    """格式化缓存年龄"""
+    if age_seconds < 60:
+        return "1 分钟内"
+    if age_seconds < 3600:
+        return f"{age_seconds // 60} 分钟前"
+    if age_seconds < 86400:
+        return f"{age_seconds // 3600} 小时 {age_seconds % 3600 // 60} 分钟前"
+    return f"{age_seconds // 86400} 天前"
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# =============================================================================
+# TechChain Archiver - 产出物归档
+# 功能：把超过 N 小时的报告/热点/事件文件压缩到 archive/<年月>/ 下，
+#       按类型执行保留期，同步更新产出物索引
+# 效果：输出目录只保留近期明文文件，磁盘占用与目录扫描成本不随运行次数增长
+# 执行：workflow.py 每次运行结束后调用；也可单独运行
+# =============================================================================
+
+import os
+import sys
+import logging
+import gzip
+import shutil
+import argparse
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Any
+
+# ==================== 配置区域 ====================
+WORKSPACE = Path("/home/admin/.openclaw/workspace")
+SKILL_DIR = WORKSPACE / "skills" / "techchain-insight"
+SCOUT_DIR = WORKSPACE / "skills" / "techpulse-scout"
+LOG_FILE = SKILL_DIR / "logs" / "archiver.log"
+ARTIFACT_INDEX = WORKSPACE / "data" / "artifact-index.json"  # 产出物索引（两个技能共用）
+
+# 归档子目录名（位于各输出目录下）
+ARCHIVE_DIRNAME = "archive"
+
+# 各类产出的归档策略
+# compress_after_hours: 超过该时长的明文文件压缩归档（最新一份始终保留明文）
+# retention_days: 归档文件保留天数
+ARCHIVE_POLICIES = {
+    "scout_events": {
+        "dir": SCOUT_DIR / "events",
+        "pattern": "events-*.json",
+        "compress_after_hours": 24,
+        "retention_days": 30,
+    },
+    "scout_stream": {
+        "dir": SCOUT_DIR / "events",
+        "pattern": "events-*.jsonl",
+        "compress_after_hours": 24,
+        "retention_days": 7,
+    },
+    "hotspots": {
+        "dir": SKILL_DIR / "hotspots",
+        "pattern": "hotspots-*.json",
+        "compress_after_hours": 24,
+        "retention_days": 30,
+    },
+    "techchain_report": {
+        "dir": SKILL_DIR / "reports",
+        "pattern": "techchain-*.md",
+        "compress_after_hours": 48,
+        "retention_days": 90,
+    },
+    "event_driven_report": {
+        "dir": SKILL_DIR / "reports" / "event-driven",
+        "pattern": "event-driven-*.md",
+        "compress_after_hours": 48,
+        "retention_days": 180,
+    },
+    "scheduled_report": {
+        "dir": SKILL_DIR / "reports" / "scheduled",
+        "pattern": "report-*.md",
+        "compress_after_hours": 48,
+        "retention_days": 180,
+    },
+    "smart_report": {
+        "dir": SKILL_DIR / "reports" / "smart",
+        "pattern": "smart-report-*.md",
+        "compress_after_hours": 48,
+        "retention_days": 180,
+    },
+}
+
+# ==================== 共享模块 ====================
+# 共享模块位于 techpulse-scout/scripts
+SHARED_SCRIPTS_DIR = Path(__file__).resolve().parent.parent.parent / "techpulse-scout" / "scripts"
+if str(SHARED_SCRIPTS_DIR) not in sys.path:
+    sys.path.append(str(SHARED_SCRIPTS_DIR))
+
+from log_config import setup_logger, LOG_LEVELS
+
+try:
+    from artifact_index import update_index, read_artifact
+    ARTIFACT_INDEX_ENABLED = True
+except ImportError:
+    ARTIFACT_INDEX_ENABLED = False
+    
+    def read_artifact(path) -> str:
+        """读取产出文件内容（.gz 透明解压）"""
+        path = Path(path)
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            return f.read()
+
+# ==================== 日志函数 ====================
+LOGGER = setup_logger("archiver", LOG_FILE)
+
+def log(message: str, level: str = "INFO"):
+    LOGGER.log(LOG_LEVELS.get(level, logging.INFO), message)
+
+# ==================== 压缩归档 ====================
+def compress_file(path: Path, archive_root: Path) -> Path:
+    """gzip 压缩到 archive/<年月>/，保留原文件修改时间，成功后删除原文件"""
+    mtime = path.stat().st_mtime
+    month_dir = archive_root / datetime.fromtimestamp(mtime).strftime("%Y%m")
+    month_dir.mkdir(parents=True, exist_ok=True)
+
+    target = month_dir / (path.name + ".gz")
+    tmp_target = target.with_name(target.name + ".tmp")
+    with open(path, "rb") as src, gzip.open(tmp_target, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.utime(tmp_target, (mtime, mtime))
+    tmp_target.replace(target)
+    path.unlink()
+    return target
+
+def archive_type(artifact_type: str, policy: Dict[str, Any], now: datetime, dry_run: bool = False) -> Dict[str, Any]:
+    """
+    归档一种产出物
+    返回：{"compressed": {原路径: 新路径}, "deleted": [路径], "bytes_saved": int}
+    """
+    result = {"compressed": {}, "deleted": [], "bytes_saved": 0}
+    out_dir = policy["dir"]
+    if not out_dir.exists():
+        return result
+
+    archive_root = out_dir / ARCHIVE_DIRNAME
+    compress_cutoff = (now - timedelta(hours=policy["compress_after_hours"])).timestamp()
+    retention_cutoff = now - timedelta(days=policy["retention_days"])
+
+    # 1. 压缩过期明文文件（只扫描输出目录顶层，最新一份始终保留明文）
+    files = sorted(out_dir.glob(policy["pattern"]), key=lambda p: p.stat().st_mtime)
+    for path in files[:-1]:
+        mtime = path.stat().st_mtime
+        if mtime >= compress_cutoff:
+            continue
+        # 已超过保留期的直接删除，不再压缩
+        if datetime.fromtimestamp(mtime) < retention_cutoff:
+            result["deleted"].append(str(path))
+            if not dry_run:
+                path.unlink()
+            continue
+        size = path.stat().st_size
+        if dry_run:
+            result["compressed"][str(path)] = str(path) + ".gz"
+            continue
+        target = compress_file(path, archive_root)
+        result["compressed"][str(path)] = str(target)
+        result["bytes_saved"] += size - target.stat().st_size
+
+    # 2. 执行保留期：整月过期的目录直接删除，边界月份逐个文件检查
+    if archive_root.exists():
+        for month_dir in sorted(archive_root.iterdir()):
+            try:
+                month_start = datetime.strptime(month_dir.name, "%Y%m")
+            except ValueError:
+                continue
+            next_month = (month_start + timedelta(days=32)).replace(day=1)
+            if next_month <= retention_cutoff:
+                result["deleted"].extend(str(p) for p in month_dir.iterdir())
+                if not dry_run:
+                    shutil.rmtree(month_dir)
+            elif month_start <= retention_cutoff:
+                for path in month_dir.iterdir():
+                    if datetime.fromtimestamp(path.stat().st_mtime) < retention_cutoff:
+                        result["deleted"].append(str(path))
+                        if not dry_run:
+                            path.unlink()
+                if not dry_run and not any(month_dir.iterdir()):
+                    month_dir.rmdir()
+
+    return result
+
+def update_artifact_index(artifact_type: str, result: Dict[str, Any]):
+    """压缩的条目改指向归档路径，删除的条目移出索引"""
+    moved = result["compressed"]
+    deleted = set(result["deleted"])
+    if not moved and not deleted:
+        return
+
+    def apply(index: Dict[str, Any]):
+        entries = index["entries"].get(artifact_type, [])
+        kept = []
+        for entry in entries:
+            entry["path"] = moved.get(entry["path"], entry["path"])
+            if entry["path"] not in deleted:
+                kept.append(entry)
+        index["entries"][artifact_type] = kept
+        latest = index["latest"].get(artifact_type)
+        if latest:
+            latest["path"] = moved.get(latest["path"], latest["path"])
+            if latest["path"] in deleted:
+                index["latest"].pop(artifact_type)
+
+    update_index(ARTIFACT_INDEX, apply)
+
+def find_archived(path: str) -> str:
+    """查找已被归档的文件（archive/<年月>/<文件名>.gz），找不到返回空字符串"""
+    original = Path(path)
+    for match in (original.parent / ARCHIVE_DIRNAME).glob(f"*/{original.name}.gz"):
+        return str(match)
+    return ""
+
+def run_archiver(dry_run: bool = False, only: List[str] = None) -> Dict[str, Dict[str, Any]]:
+    """按策略归档全部（或指定）类型，返回各类型结果"""
+    now = datetime.now()
+    results = {}
+    for artifact_type, policy in ARCHIVE_POLICIES.items():
+        if only and artifact_type not in only:
+            continue
+        try:
+            result = archive_type(artifact_type, policy, now, dry_run)
+            if ARTIFACT_INDEX_ENABLED and not dry_run:
+                update_artifact_index(artifact_type, result)
+        except Exception as e:
+            log(f"  {artifact_type} 归档失败：{str(e)[:200]}")
+            continue
+        results[artifact_type] = result
+        if result["compressed"] or result["deleted"]:
+            log(f"  {artifact_type}：压缩 {len(result['compressed'])} 个，"
+                f"删除 {len(result['deleted'])} 个，节省 {result['bytes_saved'] // 1024}KB")
+    return results
+
+# ==================== 主流程 ====================
+def main():
+    """主入口"""
+    parser = argparse.ArgumentParser(description="TechChain 产出物归档")
+    parser.add_argument("--dry-run", action="store_true", help="只列出将要压缩/删除的文件")
+    parser.add_argument("--type", action="append", choices=list(ARCHIVE_POLICIES), help="只归档指定类型（可重复）")
+    args = parser.parse_args()
+
+    log("=" * 60)
+    log(f"TechChain Archiver - 产出物归档{'（演练）' if args.dry_run else ''}")
+    log("=" * 60)
+
+    results = run_archiver(dry_run=args.dry_run, only=args.type)
+    compressed = sum(len(r["compressed"]) for r in results.values())
+    deleted = sum(len(r["deleted"]) for r in results.values())
+    log(f"归档完成：压缩 {compressed} 个，删除 {deleted} 个")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+# =============================================================================
+# TechChain Insight - 批量模式报告分隔标记
+# 功能：main.py 批量分析时在每份报告前输出分隔标记，调用方（scheduled-report.py）据此拆分输出
+# =============================================================================
+
+import re
+from typing import List, Tuple
+
+BATCH_MARKER = "<!-- techchain:keyword={keyword} -->"
+BATCH_MARKER_PATTERN = re.compile(r"^<!-- techchain:keyword=(.+?) -->$", re.MULTILINE)
+
+def format_batch_marker(keyword: str) -> str:
+    """某个关键词报告前的分隔标记"""
+    return BATCH_MARKER.format(keyword=keyword)
+
+def split_batch_output(output: str) -> List[Tuple[str, str]]:
+    """按分隔标记拆分批量输出，返回 [(关键词, 报告输出)]（标记前的内容丢弃）"""
+    parts = BATCH_MARKER_PATTERN.split(output)
+    return list(zip(parts[1::2], parts[2::2]))
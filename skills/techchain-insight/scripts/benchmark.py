@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# =============================================================================
+# TechChain Insight - 启动耗时基准
+# 功能：用 python -X importtime 测量导入 main.py 的累计耗时并与预算比较，
+#       检查分析模块没有在导入时被加载，并测量 main.py --help 的总耗时
+# 执行：python3 scripts/benchmark.py [--runs N]；超出预算时退出码为 1
+# =============================================================================
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+# 导入 main.py 的累计耗时预算（毫秒，取多次运行的最小值比较）
+IMPORT_TIME_BUDGET_MS = 60
+
+# main.py --help 的总耗时预算（毫秒，含解释器启动）
+HELP_TIME_BUDGET_MS = 250
+
+# 导入 main.py 时不应加载的模块（首次使用时才导入）
+DEFERRED_MODULES = ["enhanced_analysis", "event_summary", "impact_analyzer", "analysis_cache", "kb_snapshot", "log_config"]
+
+# 报告中列出的最慢直接导入数
+TOP_IMPORTS = 10
+
+# ==================== 测量 ====================
+def measure_import() -> Tuple[float, Dict[str, float], List[str]]:
+    """
+    子进程中导入 main.py，解析 -X importtime 输出
+    返回：(main 的累计耗时毫秒，{main 直接导入的模块: 累计耗时毫秒}，全部已导入模块)
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=SCRIPTS_DIR, capture_output=True, text=True, env=dict(os.environ, PYTHONDONTWRITEBYTECODE="1"),
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"导入 main.py 失败：{proc.stderr.strip()[-300:]}")
+
+    main_ms = 0.0
+    children: Dict[str, float] = {}
+    imported: List[str] = []
+    for line in proc.stderr.splitlines():
+        # 格式：import time: self [us] | cumulative | imported package（子模块每层多缩进两格，先于父模块输出）
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            cumulative = int(parts[1].strip()) / 1000
+        except ValueError:
+            continue
+        name = parts[2].strip()
+        depth = (len(parts[2]) - len(parts[2].lstrip()) - 1) // 2
+        imported.append(name)
+        if depth == 1:
+            children[name] = cumulative
+        elif depth == 0:
+            if name == "main":
+                main_ms = cumulative
+                break
+            children = {}
+    return main_ms, children, imported
+
+def measure_help() -> float:
+    """main.py --help 的总耗时（毫秒）"""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "main.py", "--help"], cwd=SCRIPTS_DIR, capture_output=True)
+    return (time.perf_counter() - start) * 1000
+
+# ==================== 主流程 ====================
+def main():
+    """主入口"""
+    parser = argparse.ArgumentParser(description="TechChain 启动耗时基准")
+    parser.add_argument("--runs", type=int, default=5, help="重复次数（取最小值）")
+    args = parser.parse_args()
+
+    import_times: List[float] = []
+    modules: Dict[str, float] = {}
+    imported: List[str] = []
+    for _ in range(args.runs):
+        main_ms, modules, imported = measure_import()
+        import_times.append(main_ms)
+    help_times = [measure_help() for _ in range(args.runs)]
+
+    import_ms = min(import_times)
+    help_ms = min(help_times)
+    loaded = [m for m in DEFERRED_MODULES if m in imported]
+
+    print(f"导入 main.py：{import_ms:.1f}ms（预算 {IMPORT_TIME_BUDGET_MS}ms，{args.runs} 次取最小）")
+    print(f"main.py --help：{help_ms:.1f}ms（预算 {HELP_TIME_BUDGET_MS}ms）")
+    print("main.py 直接导入中最慢的：")
+    for name, ms in sorted(modules.items(), key=lambda x: x[1], reverse=True)[:TOP_IMPORTS]:
+        print(f"  {ms:8.2f}ms  {name}")
+
+    failures = []
+    if import_ms > IMPORT_TIME_BUDGET_MS:
+        failures.append(f"导入耗时 {import_ms:.1f}ms 超出预算 {IMPORT_TIME_BUDGET_MS}ms")
+    if help_ms > HELP_TIME_BUDGET_MS:
+        failures.append(f"--help 耗时 {help_ms:.1f}ms 超出预算 {HELP_TIME_BUDGET_MS}ms")
+    if loaded:
+        failures.append(f"导入时加载了应延迟的模块：{', '.join(loaded)}")
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        sys.exit(1)
+    print("✅ 启动耗时在预算内")
+
+if __name__ == "__main__":
+    main()
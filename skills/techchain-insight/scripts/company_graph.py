@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# =============================================================================
+# TechChain Insight - 公司知识图谱
+# 功能：预先计算「产业链细分环节 → 公司」邻接表，细分/领域查公司改为图查找
+# 边属性：relation（leader 龙头 / challenger 挑战者 / supplier 供应商，仅按定位描述判断）+ 关联业务关键词
+# 范围：公司分类只与所属领域（CATEGORY_DOMAINS）内的细分环节连边，细分环节与分类名/业务关键词精确匹配
+# 构建：随知识库快照编译（kb_snapshot.py），知识库不变时不重建
+# 校验：python3 scripts/company_graph.py 用 data/company_graph_cases.json 检查匹配结果没有跨领域扩大
+# =============================================================================
+
+import sys
+import json
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+# 关系类型
+RELATION_LEADER = "leader"
+RELATION_CHALLENGER = "challenger"
+RELATION_SUPPLIER = "supplier"
+
+# 定位描述中表示龙头地位的词（与原竞争格局分析的龙头判定一致）
+LEADER_WORDS = ["龙头", "领先"]
+
+# 定位描述中表示供应商角色的词
+SUPPLIER_WORDS = ["零部件", "上游", "材料", "供应"]
+
+# 公司分类 → 所属领域（industry_chain.json 中的领域名）
+# 未列出的分类归入同名领域（如 "固态电池"），没有同名领域时不与任何领域连边
+CATEGORY_DOMAINS = {
+    "半导体设备": ["半导体"],
+    "AI 芯片": ["人工智能"],
+    "动力电池": ["新能源汽车"],
+    "锂资源": ["新能源"],
+    "光伏": ["新能源"],
+    "激光雷达": ["自动驾驶"],
+}
+
+# 业务关键词最短长度（避免单字误连）
+MIN_KEYWORD_LENGTH = 2
+
+def business_keywords(business: str) -> List[str]:
+    """拆分业务描述（如 "刻蚀/沉积" → ["刻蚀", "沉积"]）"""
+    parts = [p.strip() for p in business.replace("、", "/").split("/")]
+    return [p for p in parts if len(p) >= MIN_KEYWORD_LENGTH]
+
+def classify_relation(company: Dict[str, Any]) -> str:
+    """根据公司定位描述判断关系类型"""
+    position = company.get("position", "")
+    if any(w in position for w in LEADER_WORDS):
+        return RELATION_LEADER
+    if any(w in position for w in SUPPLIER_WORDS):
+        return RELATION_SUPPLIER
+    return RELATION_CHALLENGER
+
+def category_domains(category: str, domains: List[str]) -> List[str]:
+    """公司分类所属的领域（只保留知识库中存在的领域）"""
+    return [d for d in CATEGORY_DOMAINS.get(category, [category]) if d in domains]
+
+def _make_edge(company: Dict[str, Any], market: str, category: str, keyword: str, stage: str = "") -> Dict[str, Any]:
+    return {
+        "code": company.get("code", ""),
+        "name": company.get("name", ""),
+        "market": market,
+        "business": company.get("business", ""),
+        "position": company.get("position", ""),
+        "category": category,
+        "relation": classify_relation(company),
+        "keyword": keyword,
+        "stage": stage,
+    }
+
+def _add_edge(edges: List[Dict[str, Any]], edge: Dict[str, Any]):
+    """同一节点下同一市场的同一公司只保留第一条边"""
+    for existing in edges:
+        if existing["code"] == edge["code"] and existing["market"] == edge["market"]:
+            return
+    edges.append(edge)
+
+def _segment_keyword(segment: str, category: str, keywords: List[str]) -> Optional[str]:
+    """细分环节与公司的关联关键词（分类名或业务关键词与细分环节同名，无关联返回 None）"""
+    if segment == category:
+        return category
+    if segment in keywords:
+        return segment
+    return None
+
+def build_company_graph(industry_chain: Dict, companies: Dict) -> Dict[str, Any]:
+    """
+    构建公司知识图谱
+
+    连边规则（公司分类只在所属领域内连边，见 CATEGORY_DOMAINS）：
+    1. 所属领域的细分环节与公司分类名或某个业务关键词同名 → 细分环节边
+    2. 所属领域 → 领域边
+    返回：{"segments": {细分: [边]}, "domains": {领域: [边]}, "segment_domains": {细分: [领域]}}
+    """
+    segments: Dict[str, List[Dict[str, Any]]] = {}
+    domains: Dict[str, List[Dict[str, Any]]] = {}
+    segment_domains: Dict[str, List[str]] = {}
+
+    chain_segments: Dict[str, List[Tuple[str, str]]] = {}
+    for domain, stages in industry_chain.items():
+        domains.setdefault(domain, [])
+        chain_segments[domain] = []
+        if not isinstance(stages, dict):
+            continue
+        for stage, segment_list in stages.items():
+            if not isinstance(segment_list, list):
+                continue
+            for segment in segment_list:
+                chain_segments[domain].append((stage, segment))
+                if domain not in segment_domains.setdefault(segment, []):
+                    segment_domains[segment].append(domain)
+
+    for category, markets in companies.items():
+        scoped_domains = category_domains(category, list(domains))
+        for market, company_list in markets.items():
+            for company in company_list:
+                keywords = business_keywords(company.get("business", ""))
+
+                for domain in scoped_domains:
+                    for stage, segment in chain_segments[domain]:
+                        keyword = _segment_keyword(segment, category, keywords)
+                        if keyword:
+                            edge = _make_edge(company, market, category, keyword, stage)
+                            _add_edge(segments.setdefault(segment, []), edge)
+                            _add_edge(domains[domain], edge)
+                    _add_edge(domains[domain], _make_edge(company, market, category, category))
+
+    return {
+        "segments": segments,
+        "domains": domains,
+        "segment_domains": segment_domains,
+    }
+
+def _filter(edges: List[Dict[str, Any]], relation: Optional[str]) -> List[Dict[str, Any]]:
+    if relation is None:
+        return list(edges)
+    return [e for e in edges if e["relation"] == relation]
+
+def segment_companies(graph: Dict[str, Any], segment: str, relation: Optional[str] = None) -> List[Dict[str, Any]]:
+    """查询细分环节关联的公司"""
+    return _filter(graph.get("segments", {}).get(segment, []), relation)
+
+def domain_companies(graph: Dict[str, Any], domain: str, relation: Optional[str] = None) -> List[Dict[str, Any]]:
+    """查询领域关联的公司（含该领域所有细分环节的公司）"""
+    return _filter(graph.get("domains", {}).get(domain, []), relation)
+
+def node_companies(graph: Dict[str, Any], name: str, relation: Optional[str] = None) -> List[Dict[str, Any]]:
+    """按名称查询：领域节点优先，其次细分环节节点"""
+    if name in graph.get("domains", {}):
+        return domain_companies(graph, name, relation)
+    return segment_companies(graph, name, relation)
+
+# ==================== 自检 ====================
+CASES_FILE = Path(__file__).resolve().parent.parent / "data" / "company_graph_cases.json"
+
+def check_cases(cases_file: Path = CASES_FILE) -> List[Tuple[str, str, str]]:
+    """
+    用当前知识库快照自检
+    - match_companies：关键词匹配到的公司集合与记录的一致（图谱上线前的结果，防止跨领域连边扩大匹配）
+    - domain_excludes：领域节点不应包含的公司
+    返回：失败列表 [(类别, 关键词/领域, 说明)]
+    """
+    import main
+
+    with open(cases_file, "r", encoding="utf-8") as f:
+        cases: Dict[str, Dict[str, List[str]]] = json.load(f)
+    main.get_knowledge()
+    graph = main.KB_INDEXES["company_graph"]
+    failures = []
+    for keyword, expected in cases.get("match_companies", {}).items():
+        actual = {c["name"] for c in main.match_companies(keyword)}
+        if actual != set(expected):
+            failures.append(("match_companies", keyword,
+                             f"多出 {sorted(actual - set(expected))}，缺少 {sorted(set(expected) - actual)}"))
+    for domain, excluded in cases.get("domain_excludes", {}).items():
+        leaked = sorted({e["name"] for e in domain_companies(graph, domain)} & set(excluded))
+        if leaked:
+            failures.append(("domain_excludes", domain, f"包含 {leaked}"))
+    return failures
+
+if __name__ == "__main__":
+    with open(CASES_FILE, "r", encoding="utf-8") as f:
+        total = sum(len(v) for v in json.load(f).values())
+    failures = check_cases()
+    for kind, name, detail in failures:
+        print(f"❌ [{kind}] {name}：{detail}")
+    print(f"{total - len(failures)}/{total} 组通过")
+    sys.exit(1 if failures else 0)
@@ -5,49 +5,29 @@
 # =============================================================================
 
 import re
+import sys
+from pathlib import Path
 from typing import Dict, List, Any, Optional
 
+from company_graph import node_companies, RELATION_LEADER
+
+# 共享模块位于 techpulse-scout/scripts
+SHARED_SCRIPTS_DIR = Path(__file__).resolve().parent.parent.parent / "techpulse-scout" / "scripts"
+if str(SHARED_SCRIPTS_DIR) not in sys.path:
+    sys.path.append(str(SHARED_SCRIPTS_DIR))
+
+from news_item import NewsItem, to_news_items
+from source_registry import analysis_class
+
 # ==================== FR-02: 多源交叉验证 ====================
 def classify_source(url: str) -> str:
     """
-    FR-02: 分类信息来源
+    FR-02: 分类信息来源（查信源表，见 techpulse-scout/scripts/source_registry.py）
     返回：来源类型（官方公告/科技媒体/财经媒体/券商研报/社交媒体/未知）
     """
-    url_lower = url.lower()
-    
-    # 官方公告
-    official = ["cninfo.com.cn", "sse.com.cn", "szse.cn", "sec.gov", "edgar-online.com", "hkexnews.hk"]
-    for domain in official:
-        if domain in url_lower:
-            return "官方公告"
-    
-    # 科技媒体
-    tech_media = ["36kr.com", "huxiu.com", "geekpark.net", "anandtech.com", "eetimes.com", "techcrunch.com"]
-    for domain in tech_media:
-        if domain in url_lower:
-            return "科技媒体"
-    
-    # 财经媒体
-    finance_media = ["cls.cn", "stcn.com", "cs.com.cn", "jjckb.cn", "bloomberg.com", "reuters.com", "wsj.com", "barrons.com", "caixin.com"]
-    for domain in finance_media:
-        if domain in url_lower:
-            return "财经媒体"
-    
-    # 券商研报
-    research = ["eastmoney.com", "10jqka.com.cn", "xueqiu.com", "sina.com.cn", "sohu.com"]
-    for domain in research:
-        if domain in url_lower:
-            return "券商研报"
-    
-    # 社交媒体
-    social = ["zhihu.com", "weibo.com", "twitter.com", "douyin.com"]
-    for domain in social:
-        if domain in url_lower:
-            return "社交媒体"
-    
-    return "未知来源"
+    return analysis_class(url)
 
-def detect_conflicts(news_list: List[Dict]) -> List[Dict]:
+def detect_conflicts(news_list: List[NewsItem]) -> List[Dict]:
     """
     FR-02: 检测信息冲突
     返回：冲突信息列表
@@ -56,8 +36,8 @@ def detect_conflicts(news_list: List[Dict]) -> List[Dict]:
     
     # 提取关键声明
     claims = {}
-    for news in news_list:
-        text = news.get("title", "") + " " + news.get("content", "")
+    for news in to_news_items(news_list):
+        text = news.text
         
         # 检测时间相关声明
         time_patterns = [
@@ -84,10 +64,12 @@ def detect_conflicts(news_list: List[Dict]) -> List[Dict]:
     
     return conflicts
 
-def verify_with_multiple_sources(news_list: List[Dict]) -> Dict:
+def verify_with_multiple_sources(news_list: List[NewsItem]) -> Dict:
     """
     FR-02: 多源交叉验证汇总
     """
+    news_list = to_news_items(news_list)
+    
     # 按来源类型分组
     sources_by_type = {
         "官方公告": [],
@@ -99,8 +81,7 @@ def verify_with_multiple_sources(news_list: List[Dict]) -> Dict:
     }
     
     for news in news_list:
-        source_type = classify_source(news.get("url", ""))
-        sources_by_type[source_type].append(news)
+        sources_by_type[news.analysis_class].append(news)
     
     # 计算来源多样性评分
     active_sources = sum(1 for v in sources_by_type.values() if len(v) > 0)
@@ -194,9 +175,10 @@ def extract_entities(text: str) -> Dict:
     return entities
 
 # ==================== FR-05: 横向竞争格局分析 ====================
-def analyze_competition(segment: str, news_list: List[Dict], company_knowledge: Dict) -> Dict:
+def analyze_competition(segment: str, news_list: List[NewsItem], company_graph: Dict) -> Dict:
     """
     FR-05: 分析竞争格局
+    segment 可以是领域名或细分环节名，公司来自知识图谱查找
     返回：龙头/黑马/市占率信息
     """
     competition = {
@@ -206,37 +188,24 @@ def analyze_competition(segment: str, news_list: List[Dict], company_knowledge:
         "market_share": {},  # 市占率
     }
     
-    # 从知识库提取龙头信息
-    for tech_keyword, companies in company_knowledge.items():
-        if tech_keyword in segment or segment in tech_keyword:
-            for market, company_list in companies.items():
-                for company_info in company_list:
-                    position = company_info.get("position", "")
-                    if "龙头" in position or "领先" in position:
-                        competition["leaders"].append({
-                            "name": company_info["name"],
-                            "code": company_info["code"],
-                            "market": market,
-                            "position": position,
-                        })
-                    elif "新兴" in position or "潜力" in position:
-                        competition["dark_horses"].append({
-                            "name": company_info["name"],
-                            "code": company_info["code"],
-                            "market": market,
-                            "position": position,
-                        })
-                    else:
-                        competition["challengers"].append({
-                            "name": company_info["name"],
-                            "code": company_info["code"],
-                            "market": market,
-                            "position": position,
-                        })
+    # 从知识图谱提取龙头信息
+    for edge in node_companies(company_graph, segment):
+        company = {
+            "name": edge["name"],
+            "code": edge["code"],
+            "market": edge["market"],
+            "position": edge["position"],
+        }
+        if edge["relation"] == RELATION_LEADER:
+            competition["leaders"].append(company)
+        elif "新兴" in edge["position"] or "潜力" in edge["position"]:
+            competition["dark_horses"].append(company)
+        else:
+            competition["challengers"].append(company)
     
     # 从新闻中提取市占率信息
-    for news in news_list:
-        text = news.get("content", "") + " " + news.get("title", "")
+    for news in to_news_items(news_list):
+        text = news.text
         
         # 提取市占率
         market_share_patterns = [
@@ -272,17 +241,18 @@ def add_citations(text: str, news_list: List[Dict]) -> str:
     
     return text + citation_text
 
-def format_with_citations(data: Dict, news_list: List[Dict]) -> str:
+def format_with_citations(data: Dict, news_list: List[NewsItem]) -> str:
     """
     FR-10: 格式化输出并添加引用
     """
     output = []
+    news_list = to_news_items(news_list)
     
     # 添加数据来源说明
     if news_list:
-        official_count = sum(1 for n in news_list if classify_source(n.get("url", "")) == "官方公告")
-        tech_media_count = sum(1 for n in news_list if classify_source(n.get("url", "")) == "科技媒体")
-        finance_media_count = sum(1 for n in news_list if classify_source(n.get("url", "")) == "财经媒体")
+        official_count = sum(1 for n in news_list if n.analysis_class == "官方公告")
+        tech_media_count = sum(1 for n in news_list if n.analysis_class == "科技媒体")
+        finance_media_count = sum(1 for n in news_list if n.analysis_class == "财经媒体")
         
         output.append(f"**数据来源**: 官方公告 ({official_count}) | 科技媒体 ({tech_media_count}) | 财经媒体 ({finance_media_count})")
         output.append("")
@@ -298,18 +268,19 @@ def format_with_citations(data: Dict, news_list: List[Dict]) -> str:
     return "\n".join(output)
 
 # ==================== 综合验证函数 ====================
-def comprehensive_verification(news_list: List[Dict], company_knowledge: Dict) -> Dict:
+def comprehensive_verification(news_list: List[NewsItem], company_graph: Dict) -> Dict:
     """
     综合验证：FR-02/03/05/10
     """
+    news_list = to_news_items(news_list)
+    
     # FR-02: 多源验证
     verification = verify_with_multiple_sources(news_list)
     
     # FR-03: 实体提取
     all_entities = []
     for news in news_list:
-        text = news.get("title", "") + " " + news.get("content", "")
-        entities = extract_entities(text)
+        entities = extract_entities(news.text)
         all_entities.append({
             "source": news.get("source", "未知"),
             "entities": entities,
@@ -317,7 +288,7 @@ def comprehensive_verification(news_list: List[Dict], company_knowledge: Dict) -
     
     # FR-05: 竞争格局（动态匹配相关领域）
     # 从新闻内容提取相关领域
-    all_text = " ".join([n.get("title", "") + " " + n.get("content", "") for n in news_list])
+    all_text = " ".join(n.text for n in news_list)
     
     # 领域关键词映射
     domain_keywords = {
@@ -347,7 +318,7 @@ def comprehensive_verification(news_list: List[Dict], company_knowledge: Dict) -
     # 只分析匹配到的领域
     competition_analysis = {}
     for segment in matched_domains[:3]:  # 最多 3 个领域
-        competition_analysis[segment] = analyze_competition(segment, news_list, company_knowledge)
+        competition_analysis[segment] = analyze_competition(segment, news_list, company_graph)
     
     # FR-10: 引用标注
     citations = format_with_citations({}, news_list)
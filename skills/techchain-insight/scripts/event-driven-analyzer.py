@@ -6,11 +6,14 @@
 
 import os
 import sys
+import logging
 import json
+import argparse
+import threading
 import subprocess
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 
 # ==================== 配置区域 ====================
 WORKSPACE = Path("/home/admin/.openclaw/workspace")
@@ -19,17 +22,39 @@ SCOUT_DIR = WORKSPACE / "skills" / "techpulse-scout"
 EMAIL_SENDER_DIR = WORKSPACE / "skills" / "email-sender"
 LOG_FILE = SKILL_DIR / "logs" / "event-driven.log"
 REPORT_DIR = SKILL_DIR / "reports" / "event-driven"
+ARTIFACT_INDEX = WORKSPACE / "data" / "artifact-index.json"  # 产出物索引（两个技能共用）
 
 EMAIL_TO = os.getenv('TECHCHAIN_REPORT_EMAIL', 'recipient@example.com')  # 使用环境变量，带默认值
 
+# 单主题分析时间预算（秒），留出余量保证在子进程超时前输出降级报告
+ANALYSIS_BUDGET_SECONDS = 100
+
+# 单次报告最多深度分析的事件数
+MAX_ANALYZED_EVENTS = 8
+
+# 消费事件流时，扫描进行中即开始分析的优先级
+STREAM_EARLY_PRIORITIES = ["HIGH"]
+
+# ==================== 共享模块 ====================
+# 共享模块位于 techpulse-scout/scripts
+SHARED_SCRIPTS_DIR = Path(__file__).resolve().parent.parent.parent / "techpulse-scout" / "scripts"
+if str(SHARED_SCRIPTS_DIR) not in sys.path:
+    sys.path.append(str(SHARED_SCRIPTS_DIR))
+
+from log_config import setup_logger, LOG_LEVELS
+from event_stream import follow_stream, RECORD_EVENT, RECORD_SUMMARY, STATUS_COMPLETED, IDLE_TIMEOUT
+
+try:
+    from artifact_index import write_artifact, latest_artifact, TYPE_SCOUT_EVENTS, TYPE_SCOUT_STREAM, TYPE_EVENT_DRIVEN_REPORT
+    ARTIFACT_INDEX_ENABLED = True
+except ImportError:
+    ARTIFACT_INDEX_ENABLED = False
+
 # ==================== 日志函数 ====================
-def log(message: str):
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    log_msg = f"[{timestamp}] {message}"
-    print(log_msg)
-    LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(log_msg + "\n")
+LOGGER = setup_logger("event_driven_analyzer", LOG_FILE)
+
+def log(message: str, level: str = "INFO"):
+    LOGGER.log(LOG_LEVELS.get(level, logging.INFO), message)
 
 # ==================== 分析事件 ====================
 def analyze_event(event: Dict) -> Dict:
@@ -54,7 +79,7 @@ def analyze_event(event: Dict) -> Dict:
     search_query = event["title"][:30]  # 截断到 30 字
     
     try:
-        cmd = ["python3", "scripts/main.py", search_query, "--event-input", str(input_file)]
+        cmd = ["python3", "scripts/main.py", search_query, "--event-input", str(input_file), "--budget", str(ANALYSIS_BUDGET_SECONDS)]
         result = subprocess.run(cmd, cwd=SKILL_DIR, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, timeout=120)
         
         if result.returncode == 0:
@@ -166,12 +191,12 @@ def generate_event_report(scout_output: Dict, analyses: List[Dict]) -> str:
     return report
 
 # ==================== 发送邮件 ====================
-def send_email(content: str):
+def send_email(content: str, subject: str = "") -> bool:
     """发送邮件"""
     log("正在发送邮件...")
     
     now = datetime.now().strftime("%Y-%m-%d %H:%M")
-    subject = f"🔗 TechChain Insight 事件驱动报告 - {now}"
+    subject = subject or f"🔗 TechChain Insight 事件驱动报告 - {now}"
     
     MAX_CONTENT_SIZE = 100 * 1024
     if len(content.encode('utf-8')) > MAX_CONTENT_SIZE:
@@ -206,66 +231,192 @@ def send_email(content: str):
         log(f"❌ 邮件发送异常：{str(e)[:200]}")
         return False
 
+# ==================== 分析流程 ====================
+def find_latest_scout_output() -> Optional[Path]:
+    """查找最新的 Scout 输出文件（优先查产出物索引）"""
+    if ARTIFACT_INDEX_ENABLED:
+        entry = latest_artifact(ARTIFACT_INDEX, TYPE_SCOUT_EVENTS)
+        if entry:
+            return Path(entry["path"])
+    
+    # 索引尚未建立（旧版 Scout 产出）时回退到目录扫描
+    scout_files = list(SCOUT_DIR.glob("events/events-*.json"))
+    if not scout_files:
+        return None
+    return max(scout_files, key=lambda p: p.stat().st_mtime)
+
+def find_latest_scout_stream() -> Optional[Path]:
+    """查找最新的 Scout 事件流文件（优先查产出物索引）"""
+    if ARTIFACT_INDEX_ENABLED:
+        entry = latest_artifact(ARTIFACT_INDEX, TYPE_SCOUT_STREAM)
+        if entry:
+            return Path(entry["path"])
+    
+    stream_files = list(SCOUT_DIR.glob("events/events-*.jsonl"))
+    if not stream_files:
+        return None
+    return max(stream_files, key=lambda p: p.stat().st_mtime)
+
+class StreamConsumer:
+    """
+    消费 Scout 事件流：扫描进行中即对 HIGH 事件做深度分析
+    
+    - run()：读到汇总记录（或超时、stop() 被调用）后返回
+    - incomplete：没有读到汇总记录（写入端超时无心跳或被停止），已收到的事件只是部分结果
+    - completed：{事件 ID: 分析结果}，交给 analyze_scout_output 复用
+    - scout_output()：按流中记录拼出与 events-*.json 等价的 Scout 输出
+    """
+    
+    def __init__(self, stream_path: Path):
+        self.stream_path = stream_path
+        self.events: List[Dict] = []
+        self.completed: Dict[str, Dict] = {}
+        self.summary: Optional[Dict] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+    
+    def run(self):
+        for record in follow_stream(self.stream_path, stop=self._stop):
+            if record.get("type") == RECORD_SUMMARY:
+                self.summary = record
+            elif record.get("type") == RECORD_EVENT:
+                event = record["event"]
+                self.events.append(event)
+                if (event.get("priority") in STREAM_EARLY_PRIORITIES and event.get("trigger_next")
+                        and len(self.completed) < MAX_ANALYZED_EVENTS):
+                    log(f"事件流：{event['priority']} 事件，扫描进行中开始分析")
+                    self.completed[event["id"]] = analyze_event(event)
+        
+        if not self.summary:
+            reason = "已停止" if self._stop.is_set() else f"{IDLE_TIMEOUT}s 无新记录"
+            log(f"⚠️ 事件流未读到汇总记录（{reason}），Scout 扫描未完成，已收到 {len(self.events)} 个事件", "WARNING")
+        elif self.summary.get("status") != STATUS_COMPLETED:
+            log(f"⚠️ Scout 扫描未正常结束（{self.summary.get('status')}），按已收到的 {len(self.events)} 个事件继续")
+    
+    @property
+    def incomplete(self) -> bool:
+        return self.summary is None
+    
+    def start(self):
+        """在后台线程中消费（与 Scout 扫描并行）"""
+        self._thread = threading.Thread(target=self.run, name="stream-consumer", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """停止消费（写入端异常退出、不会再写汇总记录时使用；进行中的分析完成后返回）"""
+        self._stop.set()
+    
+    def join(self, timeout: Optional[float] = None):
+        if self._thread:
+            self._thread.join(timeout)
+    
+    def scout_output(self) -> Dict:
+        output = {k: v for k, v in (self.summary or {}).items() if k not in ("type", "status")}
+        output["events"] = self.events
+        return output
+
+def analyze_scout_output(scout_output: Dict, completed: Optional[Dict[str, Dict]] = None) -> Optional[Dict]:
+    """
+    对 Scout 输出中的事件做深度分析并保存报告
+    completed：已提前分析的 {事件 ID: 分析结果}（消费事件流时产生），直接采用不再重复分析
+    返回：{"report_file": str, "analyzed": int, "succeeded": int}；无待分析事件时返回 None
+    """
+    events = scout_output.get("events", [])
+    completed = completed or {}
+    
+    if not events:
+        log("✅ 无 High/Medium 事件，跳过深度分析")
+        return None
+    
+    log(f"发现 {len(events)} 个待分析事件")
+    
+    # 按优先级排序，选最重要的 8 个
+    priority_order = {"HIGH": 0, "MEDIUM": 1, "LOW": 2}
+    events_sorted = sorted(events, key=lambda x: (
+        priority_order.get(x.get("priority", "LOW"), 2),
+        -len(x.get("companies", [])),
+        -len(x.get("tags", []))
+    ))
+    
+    events_to_analyze = events_sorted[:MAX_ANALYZED_EVENTS]
+    
+    if len(events_sorted) > MAX_ANALYZED_EVENTS:
+        log(f"⚠️ 事件过多 ({len(events_sorted)}个)，仅分析最重要的 {MAX_ANALYZED_EVENTS} 个")
+    
+    # 深度分析每个事件（已提前分析的直接采用，剩余名额按优先级补足）
+    analyses = [completed[e["id"]] for e in events_sorted if e["id"] in completed]
+    if analyses:
+        log(f"复用扫描期间已完成的分析：{len(analyses)}个")
+    for event in events_to_analyze:
+        if len(analyses) >= MAX_ANALYZED_EVENTS:
+            break
+        if event.get("trigger_next") and event["id"] not in completed:
+            result = analyze_event(event)
+            analyses.append(result)
+    
+    # 生成报告
+    report_content = generate_event_report(scout_output, analyses)
+    
+    # 保存报告
+    REPORT_DIR.mkdir(parents=True, exist_ok=True)
+    report_file = REPORT_DIR / f"event-driven-{datetime.now().strftime('%Y%m%d-%H%M')}.md"
+    summary = {
+        "analyzed": len(analyses),
+        "succeeded": len([a for a in analyses if a.get("success")]),
+    }
+    if ARTIFACT_INDEX_ENABLED:
+        write_artifact(ARTIFACT_INDEX, TYPE_EVENT_DRIVEN_REPORT, report_file, report_content, summary=summary)
+    else:
+        with open(report_file, "w", encoding="utf-8") as f:
+            f.write(report_content)
+    log(f"报告已保存：{report_file}")
+    
+    return dict(summary, report_file=str(report_file))
+
 # ==================== 主流程 ====================
 def main():
     """主入口"""
+    parser = argparse.ArgumentParser(description="TechChain Insight 事件驱动分析")
+    parser.add_argument("--stream", nargs="?", const="latest", default=None,
+                        help="消费 Scout 事件流（可指定 .jsonl 文件，默认最新一份），扫描进行中即分析 HIGH 事件")
+    args = parser.parse_args()
+    
     log("=" * 60)
     log("TechChain Insight - 事件驱动分析启动")
     log("=" * 60)
     
     try:
-        scout_files = list(SCOUT_DIR.glob("events/events-*.json"))
-        if not scout_files:
-            log("❌ 未找到 Scout 输出文件")
-            return
-        
-        latest_scout = max(scout_files, key=lambda p: p.stat().st_mtime)
-        log(f"Scout 输出：{latest_scout}")
-        
-        with open(latest_scout, 'r', encoding='utf-8') as f:
-            scout_output = json.load(f)
-        
-        events = scout_output.get("events", [])
-        
-        if not events:
-            log("✅ 无 High/Medium 事件，跳过深度分析")
+        if args.stream:
+            stream_path = find_latest_scout_stream() if args.stream == "latest" else Path(args.stream)
+            if not stream_path:
+                log("❌ 未找到 Scout 事件流文件")
+                return
+            
+            log(f"Scout 事件流：{stream_path}")
+            consumer = StreamConsumer(stream_path)
+            consumer.run()
+            if consumer.incomplete:
+                log("❌ 事件流不完整，跳过报告生成（避免按部分事件出报告）")
+                return
+            result = analyze_scout_output(consumer.scout_output(), completed=consumer.completed)
+        else:
+            latest_scout = find_latest_scout_output()
+            if not latest_scout:
+                log("❌ 未找到 Scout 输出文件")
+                return
+            
+            log(f"Scout 输出：{latest_scout}")
+            
+            with open(latest_scout, 'r', encoding='utf-8') as f:
+                scout_output = json.load(f)
+            
+            result = analyze_scout_output(scout_output)
+        if not result:
             return
         
-        log(f"发现 {len(events)} 个待分析事件")
-        
-        # 按优先级排序，选最重要的 8 个
-        priority_order = {"HIGH": 0, "MEDIUM": 1, "LOW": 2}
-        events_sorted = sorted(events, key=lambda x: (
-            priority_order.get(x.get("priority", "LOW"), 2),
-            -len(x.get("companies", [])),
-            -len(x.get("tags", []))
-        ))
-        
-        MAX_EVENTS = 8
-        events_to_analyze = events_sorted[:MAX_EVENTS]
-        
-        if len(events_sorted) > MAX_EVENTS:
-            log(f"⚠️ 事件过多 ({len(events_sorted)}个)，仅分析最重要的 {MAX_EVENTS} 个")
-        
-        # 深度分析每个事件
-        analyses = []
-        for event in events_to_analyze:
-            if event.get("trigger_next"):
-                result = analyze_event(event)
-                analyses.append(result)
-        
-        # 生成报告
-        report_content = generate_event_report(scout_output, analyses)
-        
-        # 保存报告
-        REPORT_DIR.mkdir(parents=True, exist_ok=True)
-        report_file = REPORT_DIR / f"event-driven-{datetime.now().strftime('%Y%m%d-%H%M')}.md"
-        with open(report_file, "w", encoding="utf-8") as f:
-            f.write(report_content)
-        log(f"报告已保存：{report_file}")
-        
         # 发送邮件
-        send_email(report_content)
+        with open(result["report_file"], "r", encoding="utf-8") as f:
+            send_email(f.read())
         
         log("=" * 60)
         log("事件驱动分析完成")
@@ -123,67 +123,3 @@ def get_segment_impact(segment: str, event_summary: Dict) -> str:
         return "中性偏多 - 封测环节"
     else:
         return "利好 - 产业链受益"
-
-
-def get_relevant_companies(event_summary: Dict, company_knowledge: Dict) -> List[Dict]:
-    """
-    根据事件摘要获取相关公司
-    """
-    tech = event_summary.get("tech", "")
-    application = event_summary.get("application", "")
-    
-    relevant = []
-    
-    # 1. 散热/热管理相关
-    if "散热" in tech or "散热" in event_summary.get("problem", ""):
-        # 找有散热、材料业务的公司
-        for keyword, companies in company_knowledge.items():
-            if "半导体设备" in keyword:
-                for market, list_ in companies.items():
-                    for co in list_:
-                        if any(kw in co.get("business", "") for kw in ["散热", "热管理", "材料"]):
-                            relevant.append({
-                                "market": market,
-                                "code": co["code"],
-                                "name": co["name"],
-                                "business": co["business"],
-                                "logic": f"散热材料/设备供应商，直接受益于芯片散热技术突破",
-                            })
-    
-    # 2. 射频相关
-    if "射频" in application:
-        for keyword, companies in company_knowledge.items():
-            if "半导体设备" in keyword:
-                for market, list_ in companies.items():
-                    for co in list_:
-                        relevant.append({
-                            "market": market,
-                            "code": co["code"],
-                            "name": co["name"],
-                            "business": co["business"],
-                            "logic": f"半导体设备供应商，射频芯片产能扩张受益",
-                        })
-    
-    # 3. 默认：返回半导体设备公司
-    if not relevant:
-        for keyword, companies in company_knowledge.items():
-            if "半导体设备" in keyword or "芯片" in keyword:
-                for market, list_ in companies.items():
-                    for co in list_[:3]:  # 每个市场最多 3 家
-                        relevant.append({
-                            "market": market,
-                            "code": co["code"],
-                            "name": co["name"],
-                            "business": co["business"],
-                            "logic": f"{co['position']}，半导体领域核心标的",
-                        })
-    
-    # 去重
-    seen = set()
-    unique = []
-    for co in relevant:
-        if co["code"] not in seen:
-            unique.append(co)
-            seen.add(co["code"])
-    
-    return unique[:10]  # 最多 10 家
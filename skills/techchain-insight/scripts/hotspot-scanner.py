@@ -8,11 +8,16 @@
 
 import os
 import sys
+import logging
 import json
+import argparse
 import subprocess
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+
+from hotspot_timeseries import HotspotTimeSeries
+from analysis_cache import news_keys, news_fingerprint
 
 # ==================== 配置区域 ====================
 WORKSPACE = Path("/home/admin/.openclaw/workspace")
@@ -20,6 +25,9 @@ SKILL_DIR = WORKSPACE / "skills" / "techchain-insight"
 SEARXNG_DIR = WORKSPACE / "skills" / "searxng"
 LOG_FILE = SKILL_DIR / "logs" / "hotspot-scanner.log"
 OUTPUT_FILE = SKILL_DIR / "hotspots" / f"hotspots-{datetime.now().strftime('%Y%m%d-%H%M')}.json"
+STATE_FILE = SKILL_DIR / "hotspots" / "scan-state.json"
+TIMESERIES_DIR = SKILL_DIR / "hotspots" / "timeseries"  # 各主题评分时间序列 + 滚动基线
+ARTIFACT_INDEX = WORKSPACE / "data" / "artifact-index.json"  # 产出物索引（两个技能共用）
 
 # 监控领域和关键词
 MONITORED_TOPICS = {
@@ -51,19 +59,52 @@ BREAKTHROUGH_KEYWORDS = [
     "新一代", "革命性", "重大进展", "正式", "宣布", "启动",
 ]
 
+# 增量扫描：按主题活跃度调整重扫间隔
+SCAN_INTERVAL_MIN_HOURS = 2     # 活跃主题（或当前热点）每次都扫
+SCAN_INTERVAL_MAX_HOURS = 12    # 任何主题最长不超过该间隔必须刷新
+SCAN_TOLERANCE_MINUTES = 10     # 定时任务启动抖动容差
+HIT_HISTORY_SIZE = 6            # 命中率统计窗口（最近 N 次扫描）
+
+# 每个主题参与评分的新闻条数上限（联网搜索与共用主题引擎传入的新闻同样截断）
+TOPIC_NEWS_LIMIT = 10
+
+# 独立扫描的搜索口径：每个主题最多 4 个查询，每个查询取前 3 条
+# 共用主题引擎传入的新闻按其实际结果位数折算到该口径，评分与基线才能和独立扫描比较
+TOPIC_QUERY_LIMIT = 4
+RESULTS_PER_QUERY = 3
+TOPIC_RESULT_SLOTS = TOPIC_QUERY_LIMIT * RESULTS_PER_QUERY
+
+# 突增判定：本次新新闻数相对滚动基线的 z 值达到该阈值才算热点（基线样本不足时沿用快照规则）
+SPIKE_ZSCORE = 2.0
+
+# ==================== 共享模块 ====================
+# 共享模块位于 techpulse-scout/scripts
+SHARED_SCRIPTS_DIR = Path(__file__).resolve().parent.parent.parent / "techpulse-scout" / "scripts"
+if str(SHARED_SCRIPTS_DIR) not in sys.path:
+    sys.path.append(str(SHARED_SCRIPTS_DIR))
+
+from log_config import setup_logger, LOG_LEVELS
+from news_item import NewsItem, to_dicts, to_news_items
+from source_registry import is_authoritative
+from url_canon import canonical_url
+
+try:
+    from artifact_index import write_artifact, TYPE_HOTSPOTS
+    ARTIFACT_INDEX_ENABLED = True
+except ImportError:
+    ARTIFACT_INDEX_ENABLED = False
+
 # ==================== 日志函数 ====================
-def log(message: str):
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    log_msg = f"[{timestamp}] {message}"
-    print(log_msg)
-    LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(log_msg + "\n")
+LOGGER = setup_logger("hotspot_scanner", LOG_FILE)
+
+def log(message: str, level: str = "INFO"):
+    LOGGER.log(LOG_LEVELS.get(level, logging.INFO), message)
 
 # ==================== 搜索新闻 ====================
-def search_topic_news(topic: str, keywords: List[str], hours: int = 48) -> List[Dict]:
+def search_topic_news(topic: str, keywords: List[str], hours: int = 48) -> List[NewsItem]:
     """搜索某个主题的新闻"""
     all_results = []
+    seen_urls = set()
     
     # 构建搜索查询
     queries = []
@@ -71,7 +112,7 @@ def search_topic_news(topic: str, keywords: List[str], hours: int = 48) -> List[
         queries.append(f"{kw} 最新进展 2026")
         queries.append(f"{kw} 突破 量产 发布")
     
-    for query in queries[:4]:  # 最多 4 个查询
+    for query in queries[:TOPIC_QUERY_LIMIT]:
         try:
             cmd = ["uv", "run", "scripts/searxng.py", "search", query, "-n", "5", "--format", "json"]
             result = subprocess.run(cmd, cwd=SEARXNG_DIR, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, timeout=60)
@@ -79,32 +120,115 @@ def search_topic_news(topic: str, keywords: List[str], hours: int = 48) -> List[
             if result.returncode == 0:
                 try:
                     data = json.loads(result.stdout)
-                    for r in data.get("results", [])[:3]:
-                        news = {
-                            "title": r.get("title", ""),
-                            "url": r.get("url", ""),
-                            "content": r.get("content", ""),
-                            "source": r.get("url", "").split("/")[2] if r.get("url") else "未知",
-                            "query": query,
-                        }
-                        # 去重
-                        if news["url"] not in [n["url"] for n in all_results]:
+                    for r in data.get("results", [])[:RESULTS_PER_QUERY]:
+                        url = r.get("url", "")
+                        news = NewsItem.from_search_result(r, source=url.split("/")[2] if url else "未知", query=query)
+                        # 去重（规范化 URL）
+                        url_key = canonical_url(news.url)
+                        if url_key not in seen_urls:
+                            seen_urls.add(url_key)
                             all_results.append(news)
                 except json.JSONDecodeError:
                     pass
         except Exception as e:
             log(f"  搜索失败：{str(e)[:50]}")
         
-        if len(all_results) >= 10:  # 最多 10 条
+        if len(all_results) >= TOPIC_NEWS_LIMIT:
             break
     
-    return all_results[:10]
+    return all_results[:TOPIC_NEWS_LIMIT]
+
+# ==================== 扫描状态 ====================
+def load_scan_state() -> Dict[str, Any]:
+    """加载各主题扫描状态（文件缺失或损坏时视为首次扫描）"""
+    if not STATE_FILE.exists():
+        return {"topics": {}}
+    try:
+        with open(STATE_FILE, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        state.setdefault("topics", {})
+        return state
+    except Exception as e:
+        log(f"读取扫描状态失败，执行全量扫描：{str(e)[:50]}")
+        return {"topics": {}}
+
+def save_scan_state(state: Dict[str, Any]):
+    """保存扫描状态（先写临时文件再替换）"""
+    STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = STATE_FILE.with_suffix(".tmp")
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    tmp_file.replace(STATE_FILE)
+
+def scan_interval_hours(topic_state: Dict) -> float:
+    """
+    根据最近命中率计算重扫间隔
+    命中 = 本次扫描出现了上次没有的新闻；当前热点始终按最短间隔扫描
+    """
+    hits = topic_state.get("hits", [])
+    if not hits:
+        return SCAN_INTERVAL_MIN_HOURS
+    if topic_state.get("last_result", {}).get("is_hot"):
+        return SCAN_INTERVAL_MIN_HOURS
+    
+    hit_rate = sum(hits) / len(hits)
+    return SCAN_INTERVAL_MIN_HOURS + (SCAN_INTERVAL_MAX_HOURS - SCAN_INTERVAL_MIN_HOURS) * (1 - hit_rate)
+
+def is_topic_due(topic_state: Dict, now: datetime) -> bool:
+    """判断主题是否到了重扫时间"""
+    if not topic_state.get("last_scan") or "last_result" not in topic_state:
+        return True
+    try:
+        last_scan = datetime.fromisoformat(topic_state["last_scan"])
+    except ValueError:
+        return True
+    
+    interval = min(scan_interval_hours(topic_state), SCAN_INTERVAL_MAX_HOURS)
+    due_at = last_scan + timedelta(hours=interval) - timedelta(minutes=SCAN_TOLERANCE_MINUTES)
+    return now >= due_at
+
+def due_topics(full: bool = False) -> List[str]:
+    """到期需要重扫的主题（工作流只把这些主题登记到共用主题引擎）"""
+    state = load_scan_state()
+    now = datetime.now()
+    return [topic for topic in MONITORED_TOPICS
+            if full or is_topic_due(state["topics"].get(topic, {}), now)]
+
+def scale_count(count: int, slots: Optional[int]) -> int:
+    """
+    把共用主题引擎采集的新闻条数折算到独立扫描的口径（TOPIC_RESULT_SLOTS 个结果位）
+    slots: 引擎实际可取的结果位数；未知时不折算
+    """
+    if not slots:
+        return count
+    return min(round(count * TOPIC_RESULT_SLOTS / slots), TOPIC_NEWS_LIMIT)
+
+def count_new_news(topic_state: Dict, news_list: List[Dict]) -> int:
+    """本次扫描中上次没有出现过的新闻条数"""
+    return len(set(news_keys(news_list)) - set(topic_state.get("news_keys", [])))
+
+def update_topic_state(topic_state: Dict, news_list: List[Dict], hotspot_result: Dict, now: datetime) -> bool:
+    """记录本次扫描结果，返回是否有新新闻"""
+    keys = news_keys(news_list)
+    has_new = bool(set(keys) - set(topic_state.get("news_keys", [])))
+    
+    hits = topic_state.get("hits", []) + [1 if has_new else 0]
+    topic_state["hits"] = hits[-HIT_HISTORY_SIZE:]
+    topic_state["last_scan"] = now.isoformat()
+    topic_state["news_keys"] = keys
+    topic_state["fingerprint"] = news_fingerprint(keys)
+    topic_state["last_result"] = dict(hotspot_result, news_samples=to_dicts(news_list[:3]))
+    return has_new
 
 # ==================== 热点判定 ====================
-def is_hotspot(topic: str, news_list: List[Dict]) -> Dict:
+def is_hotspot(topic: str, news_list: List[NewsItem], zscores: Optional[Dict[str, Optional[float]]] = None,
+               news_count: Optional[int] = None) -> Dict:
     """
     判定是否为热点
-    返回：{is_hot: bool, score: 0-100, reason: str}
+    zscores: 本次指标相对滚动基线的 z 值（HotspotTimeSeries.zscores），
+             有基线时要求新新闻数明显突增，常年热闹的主题不再每次都被判为热点
+    news_count: 数量评分用的新闻条数（共用主题引擎的新闻按结果位折算后传入），默认 len(news_list)
+    返回：{is_hot: bool, score: 0-100, reason: str, zscore: float|None}
     """
     if not news_list:
         return {"is_hot": False, "score": 0, "reason": "无相关新闻"}
@@ -113,7 +237,8 @@ def is_hotspot(topic: str, news_list: List[Dict]) -> Dict:
     reasons = []
     
     # 1. 新闻数量评分（0-40 分）
-    news_count = len(news_list)
+    if news_count is None:
+        news_count = len(news_list)
     if news_count >= 10:
         score += 40
         reasons.append(f"新闻数量多 ({news_count}条)")
@@ -129,7 +254,7 @@ def is_hotspot(topic: str, news_list: List[Dict]) -> Dict:
     # 2. 突破关键词评分（0-30 分）
     has_breakthrough = False
     for news in news_list:
-        text = (news["title"] + " " + news["content"]).lower()
+        text = news.text_lower
         for kw in BREAKTHROUGH_KEYWORDS:
             if kw.lower() in text:
                 has_breakthrough = True
@@ -142,8 +267,7 @@ def is_hotspot(topic: str, news_list: List[Dict]) -> Dict:
         reasons.append("含突破关键词")
     
     # 3. 来源权威性评分（0-30 分）
-    authoritative_domains = ["cninfo.com.cn", "sec.gov", "cls.cn", "stcn.com", "bloomberg.com", "reuters.com"]
-    has_authoritative = any(any(domain in news["url"].lower() for domain in authoritative_domains) for news in news_list)
+    has_authoritative = any(is_authoritative(news.url) for news in news_list)
     
     if has_authoritative:
         score += 30
@@ -155,6 +279,15 @@ def is_hotspot(topic: str, news_list: List[Dict]) -> Dict:
     # 判定是否为热点
     is_hot = score >= 50
     
+    # 4. 相对基线的突增（基线样本不足时 z 值为 None，沿用上面的快照判定）
+    zscore = (zscores or {}).get("new_count")
+    if zscore is not None:
+        if zscore >= SPIKE_ZSCORE:
+            reasons.append(f"新新闻数较基线突增 (z={zscore:.1f})")
+        else:
+            is_hot = False
+            reasons.append(f"处于常态水平 (z={zscore:.1f})")
+    
     return {
         "is_hot": is_hot,
         "score": score,
@@ -162,6 +295,7 @@ def is_hotspot(topic: str, news_list: List[Dict]) -> Dict:
         "news_count": news_count,
         "has_breakthrough": has_breakthrough,
         "has_authoritative": has_authoritative,
+        "zscore": None if zscore is None else round(zscore, 2),
     }
 
 # ==================== 生成热点报告 ====================
@@ -178,61 +312,120 @@ def generate_hotspot_report(hotspots: List[Dict]) -> Dict:
     return report
 
 # ==================== 主流程 ====================
-def main():
-    """主入口"""
-    log("=" * 60)
-    log("TechChain Hotspot Scanner - 热点捕捉启动")
-    log("=" * 60)
+def run_hotspot_scan(full: bool = False, topic_news: Optional[Dict[str, List[NewsItem]]] = None,
+                     topic_slots: Optional[Dict[str, int]] = None) -> Dict:
+    """
+    执行一次热点扫描，保存并返回热点报告（异常直接抛出）
+    full: 忽略扫描状态，重扫全部主题
+    topic_news: 共用主题引擎（topic_engine.py）已采集的 {主题: 新闻列表}；
+                到期主题优先用这些新闻评分（不再联网），未到期的主题照常沿用上次结果
+    topic_slots: topic_news 各主题实际可取的结果位数，新闻条数据此折算到独立扫描的口径
+    """
+    topic_news = topic_news or {}
+    topic_slots = topic_slots or {}
+    hotspots = []
+    now = datetime.now()
+    state = load_scan_state()
+    series = HotspotTimeSeries(TIMESERIES_DIR)
+    scanned = 0
+    shared = 0
     
-    try:
-        hotspots = []
+    # 扫描到期的主题，未到期的沿用上次结果
+    for topic, keywords in MONITORED_TOPICS.items():
+        topic_state = state["topics"].setdefault(topic, {})
         
-        # 扫描所有主题
-        for topic, keywords in MONITORED_TOPICS.items():
-            log(f"扫描：{topic}...")
-            
-            # 搜索新闻
-            news_list = search_topic_news(topic, keywords)
+        if full or is_topic_due(topic_state, now):
+            slots = None
+            if topic in topic_news:
+                log(f"评分：{topic}（取自本轮主题扫描）...")
+                news_list = topic_news[topic][:TOPIC_NEWS_LIMIT]
+                slots = topic_slots.get(topic)
+                shared += 1
+            else:
+                log(f"扫描：{topic}...")
+                news_list = search_topic_news(topic, keywords)
+                scanned += 1
             
-            # 判定热点
-            hotspot_result = is_hotspot(topic, news_list)
+            # 判定热点（先与基线比较，再把本次数据计入基线）
+            point = {
+                "news_count": scale_count(len(news_list), slots),
+                "new_count": scale_count(count_new_news(topic_state, news_list), slots),
+            }
+            hotspot_result = is_hotspot(topic, news_list, series.zscores(topic, point), point["news_count"])
+            point["score"] = hotspot_result["score"]
+            series.record(topic, point, now)
+            has_new = update_topic_state(topic_state, news_list, hotspot_result, now)
             
-            log(f"  评分：{hotspot_result['score']} - {hotspot_result['reason']}")
-            
-            if hotspot_result["is_hot"]:
-                hotspots.append({
-                    "topic": topic,
-                    "score": hotspot_result["score"],
-                    "reason": hotspot_result["reason"],
-                    "news_count": hotspot_result["news_count"],
-                    "has_breakthrough": hotspot_result["has_breakthrough"],
-                    "news_samples": news_list[:3],  # 前 3 条新闻摘要
-                })
-        
-        # 按评分排序
-        hotspots.sort(key=lambda x: x["score"], reverse=True)
-        
-        # 生成报告
-        report = generate_hotspot_report(hotspots)
+            log(f"  评分：{hotspot_result['score']} - {hotspot_result['reason']}"
+                f"（{'有新新闻' if has_new else '无新新闻'}，下次间隔 {scan_interval_hours(topic_state):.1f}h）")
+        else:
+            hotspot_result = topic_state["last_result"]
+            news_list = to_news_items(hotspot_result.get("news_samples", []))
+            log(f"跳过：{topic}（上次扫描 {topic_state['last_scan'][:16]}，沿用评分 {hotspot_result['score']}）")
         
-        # 保存报告
+        if hotspot_result["is_hot"]:
+            hotspots.append({
+                "topic": topic,
+                "score": hotspot_result["score"],
+                "reason": hotspot_result["reason"],
+                "news_count": hotspot_result["news_count"],
+                "has_breakthrough": hotspot_result["has_breakthrough"],
+                "zscore": hotspot_result.get("zscore"),
+                "news_samples": to_dicts(news_list[:3]),  # 前 3 条新闻摘要
+            })
+    
+    # 清理已移出监控列表的主题
+    for topic in list(state["topics"]):
+        if topic not in MONITORED_TOPICS:
+            del state["topics"][topic]
+    save_scan_state(state)
+    series.prune(MONITORED_TOPICS)
+    series.save()
+    
+    # 按评分排序
+    hotspots.sort(key=lambda x: x["score"], reverse=True)
+    
+    # 生成报告
+    report = generate_hotspot_report(hotspots)
+    
+    # 保存报告
+    if ARTIFACT_INDEX_ENABLED:
+        write_artifact(ARTIFACT_INDEX, TYPE_HOTSPOTS, OUTPUT_FILE, report, summary={
+            "hotspots_found": report["hotspots_found"],
+            "topics_scanned": scanned,
+            "topics_shared": shared,
+        })
+    else:
         OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
         with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
             json.dump(report, f, ensure_ascii=False, indent=2)
-        log(f"报告已保存：{OUTPUT_FILE}")
-        
-        # 输出摘要
-        log("=" * 60)
-        log(f"扫描完成：共扫描{len(MONITORED_TOPICS)}个主题，发现{len(hotspots)}个热点")
-        if hotspots:
-            log("热点列表（按评分排序）:")
-            for h in hotspots[:5]:
-                log(f"  - {h['topic']}: {h['score']}分 ({h['reason']})")
-            log(f"\n推荐深度分析：{report['recommended_for_analysis']}")
-        else:
-            log("本次扫描未发现热点，暂无需深度分析")
-        log("=" * 60)
-        
+    log(f"报告已保存：{OUTPUT_FILE}")
+    
+    # 输出摘要
+    log("=" * 60)
+    log(f"扫描完成：共扫描{len(MONITORED_TOPICS)}个主题（本次联网 {scanned} 个，取自主题扫描 {shared} 个），发现{len(hotspots)}个热点")
+    if hotspots:
+        log("热点列表（按评分排序）:")
+        for h in hotspots[:5]:
+            log(f"  - {h['topic']}: {h['score']}分 ({h['reason']})")
+        log(f"\n推荐深度分析：{report['recommended_for_analysis']}")
+    else:
+        log("本次扫描未发现热点，暂无需深度分析")
+    log("=" * 60)
+    return report
+
+def main():
+    """主入口"""
+    parser = argparse.ArgumentParser(description="TechChain 热点扫描")
+    parser.add_argument("--full", action="store_true", help="忽略扫描状态，重扫全部主题")
+    args = parser.parse_args()
+    
+    log("=" * 60)
+    log("TechChain Hotspot Scanner - 热点捕捉启动")
+    log("=" * 60)
+    
+    try:
+        run_hotspot_scan(full=args.full)
     except Exception as e:
         log(f"❌ 执行异常：{str(e)}")
         import traceback
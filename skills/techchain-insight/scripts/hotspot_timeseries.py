@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# =============================================================================
+# TechChain Hotspot - 主题热度时间序列
+# 功能：每次扫描追加各主题评分/新闻数到按月分文件的 JSONL；
+#       滚动基线（均值/标准差）用环形缓冲 + 累加和维护，每次更新 O(1)
+# 用途：热点判定比较「本次 vs 基线」，识别突增而不是常年热闹的主题
+# =============================================================================
+
+import json
+import math
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+# 滚动窗口长度（按扫描次数计）
+ROLLING_WINDOW = 42
+
+# 基线样本少于该数时不做突增判定（冷启动期沿用单次快照规则）
+MIN_BASELINE_SAMPLES = 8
+
+# 标准差下限（避免长期恒定的序列出现极大 z 值）
+MIN_STD = 0.5
+
+# 基线状态格式版本
+BASELINE_VERSION = 1
+
+class RollingStat:
+    """固定窗口滚动统计：环形缓冲 + 累加和/平方和，push 为 O(1)"""
+
+    __slots__ = ("window", "values", "pos", "total", "total_sq")
+
+    def __init__(self, window: int = ROLLING_WINDOW, values: Optional[List[float]] = None, pos: int = 0):
+        self.window = window
+        self.values = list(values or [])[-window:]
+        self.pos = pos % window if len(self.values) == window else 0
+        self.total = sum(self.values)
+        self.total_sq = sum(v * v for v in self.values)
+
+    @property
+    def count(self) -> int:
+        return len(self.values)
+
+    def push(self, value: float):
+        if len(self.values) < self.window:
+            self.values.append(value)
+        else:
+            old = self.values[self.pos]
+            self.values[self.pos] = value
+            self.pos = (self.pos + 1) % self.window
+            self.total -= old
+            self.total_sq -= old * old
+        self.total += value
+        self.total_sq += value * value
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def std(self) -> float:
+        if self.count < 2:
+            return 0.0
+        mean = self.mean()
+        variance = max(self.total_sq / self.count - mean * mean, 0.0)
+        return math.sqrt(variance)
+
+    def zscore(self, value: float) -> Optional[float]:
+        """相对当前基线的 z 值（样本不足返回 None）"""
+        if self.count < MIN_BASELINE_SAMPLES:
+            return None
+        return (value - self.mean()) / max(self.std(), MIN_STD)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"values": self.values, "pos": self.pos}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], window: int = ROLLING_WINDOW) -> "RollingStat":
+        return cls(window, data.get("values", []), data.get("pos", 0))
+
+class HotspotTimeSeries:
+    """
+    主题热度时间序列
+
+    - 原始记录：<dir>/scores-YYYYMM.jsonl（只追加，不回读）
+    - 滚动基线：<dir>/baselines.json（每个主题每个指标一个 RollingStat）
+    """
+
+    METRICS = ("score", "news_count", "new_count")
+
+    def __init__(self, series_dir: Path):
+        self.series_dir = series_dir
+        self.baseline_file = series_dir / "baselines.json"
+        self.baselines: Dict[str, Dict[str, RollingStat]] = {}
+        self._load()
+
+    def _load(self):
+        if not self.baseline_file.exists():
+            return
+        try:
+            with open(self.baseline_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            return
+        if data.get("version") != BASELINE_VERSION:
+            return
+        for topic, metrics in data.get("topics", {}).items():
+            self.baselines[topic] = {m: RollingStat.from_dict(metrics.get(m, {})) for m in self.METRICS}
+
+    def baseline(self, topic: str) -> Dict[str, RollingStat]:
+        if topic not in self.baselines:
+            self.baselines[topic] = {m: RollingStat() for m in self.METRICS}
+        return self.baselines[topic]
+
+    def zscores(self, topic: str, point: Dict[str, float]) -> Dict[str, Optional[float]]:
+        """本次数据相对基线的 z 值（在 record 之前调用）"""
+        stats = self.baseline(topic)
+        return {m: stats[m].zscore(point[m]) for m in self.METRICS if m in point}
+
+    def record(self, topic: str, point: Dict[str, float], when: Optional[datetime] = None):
+        """追加一条记录并更新滚动基线"""
+        when = when or datetime.now()
+        stats = self.baseline(topic)
+        for m in self.METRICS:
+            stats[m].push(point.get(m, 0))
+
+        self.series_dir.mkdir(parents=True, exist_ok=True)
+        series_file = self.series_dir / f"scores-{when.strftime('%Y%m')}.jsonl"
+        with open(series_file, "a", encoding="utf-8") as f:
+            f.write(json.dumps(dict(point, topic=topic, time=when.isoformat()), ensure_ascii=False) + "\n")
+
+    def summary(self, topic: str) -> Dict[str, Any]:
+        """主题基线摘要（用于日志/报告）"""
+        stats = self.baseline(topic)
+        return {m: {"mean": round(stats[m].mean(), 2), "std": round(stats[m].std(), 2), "n": stats[m].count}
+                for m in self.METRICS}
+
+    def prune(self, topics):
+        """移除不再监控的主题基线"""
+        for topic in list(self.baselines):
+            if topic not in topics:
+                del self.baselines[topic]
+
+    def save(self):
+        """保存滚动基线（先写临时文件再替换）"""
+        self.series_dir.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": BASELINE_VERSION,
+            "window": ROLLING_WINDOW,
+            "topics": {topic: {m: s.to_dict() for m, s in metrics.items()} for topic, metrics in self.baselines.items()},
+        }
+        tmp_file = self.baseline_file.with_suffix(".tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        tmp_file.replace(self.baseline_file)
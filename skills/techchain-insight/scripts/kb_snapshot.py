@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# =============================================================================
+# TechChain Insight - 知识库编译快照
+# 功能：把 knowledge_base/*.json 与派生索引编译为单个 pickle 快照，启动时一次读取
+# 失效：源文件 mtime/大小变化且内容哈希不同 → 重新编译（仅 mtime 变化时写回新的 stat，下次直接命中）
+# 热加载：KnowledgeBaseWatcher 节流检查源文件 stat，变化时后台重建并整体替换快照
+# =============================================================================
+
+import json
+import time
+import pickle
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, List, Any, Tuple, Optional
+
+from company_graph import build_company_graph
+
+# 快照格式版本（结构或派生索引变化时递增，旧快照自动重建）
+SNAPSHOT_VERSION = 4
+
+# 长驻进程中两次检查源文件 stat 的最小间隔（秒）
+RELOAD_CHECK_INTERVAL = 5.0
+
+# 源文件（快照中的键 → 知识库目录下的文件名）
+SOURCE_FILES = {
+    "industry_chain": "industry_chain.json",
+    "companies": "companies.json",
+}
+
+def _file_hash(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def _source_stats(kb_dir: Path) -> Dict[str, Dict[str, Any]]:
+    """源文件的 mtime/大小（不存在的文件记为 None）"""
+    stats = {}
+    for key, filename in SOURCE_FILES.items():
+        path = kb_dir / filename
+        try:
+            st = path.stat()
+            stats[key] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+        except FileNotFoundError:
+            stats[key] = None
+    return stats
+
+def build_indexes(industry_chain: Dict, companies: Dict) -> Dict[str, Any]:
+    """
+    构建派生索引
+    - segment_index: 细分环节 → [(领域, 环节)]
+    - company_by_code: 股票代码 → 公司信息（含市场和所属技术关键词）
+    - tech_keywords: 公司知识库的技术关键词列表（保持原顺序）
+    - company_graph: 细分环节/领域 → 公司邻接表（见 company_graph.py）
+    """
+    segment_index: Dict[str, List[Tuple[str, str]]] = {}
+    for domain, stages in industry_chain.items():
+        if not isinstance(stages, dict):
+            continue
+        for stage, segments in stages.items():
+            if isinstance(segments, list):
+                for segment in segments:
+                    segment_index.setdefault(segment, []).append((domain, stage))
+
+    company_by_code: Dict[str, Dict[str, Any]] = {}
+    for tech_keyword, markets in companies.items():
+        for market, company_list in markets.items():
+            for company in company_list:
+                code = company.get("code")
+                if code and code not in company_by_code:
+                    company_by_code[code] = dict(company, market=market, tech_keyword=tech_keyword)
+
+    return {
+        "segment_index": segment_index,
+        "company_by_code": company_by_code,
+        "tech_keywords": list(companies.keys()),
+        "company_graph": build_company_graph(industry_chain, companies),
+    }
+
+def compile_snapshot(kb_dir: Path) -> Dict[str, Any]:
+    """从 JSON 源文件编译快照（单个文件解析失败时该部分为空）"""
+    data: Dict[str, Any] = {}
+    errors = []
+    for key, filename in SOURCE_FILES.items():
+        path = kb_dir / filename
+        data[key] = {}
+        if not path.exists():
+            continue
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data[key] = json.load(f)
+        except Exception as e:
+            errors.append(f"{filename}: {str(e)[:100]}")
+
+    sources = _source_stats(kb_dir)
+    for key, filename in SOURCE_FILES.items():
+        if sources[key] is not None:
+            sources[key]["sha1"] = _file_hash(kb_dir / filename)
+
+    return {
+        "version": SNAPSHOT_VERSION,
+        "sources": sources,
+        "industry_chain": data["industry_chain"],
+        "companies": data["companies"],
+        "indexes": build_indexes(data["industry_chain"], data["companies"]),
+        "errors": errors,
+    }
+
+def _check_fresh(snapshot: Dict[str, Any], kb_dir: Path) -> Tuple[bool, bool]:
+    """
+    快照是否仍与源文件一致（mtime/大小相同直接通过，否则比较内容哈希）
+    返回：(是否一致, 是否有源文件仅 stat 变化、已就地更新快照中的 stat 记录)
+    含解析错误的快照视为不一致
+    """
+    if snapshot.get("version") != SNAPSHOT_VERSION or snapshot.get("errors"):
+        return False, False
+
+    current = _source_stats(kb_dir)
+    refreshed = False
+    for key, filename in SOURCE_FILES.items():
+        cached = snapshot["sources"].get(key)
+        stat = current[key]
+        if stat is None or cached is None:
+            if stat is not cached:
+                return False, False
+            continue
+        if stat["mtime_ns"] == cached["mtime_ns"] and stat["size"] == cached["size"]:
+            continue
+        # 仅 mtime 变化（如 touch、git checkout）时内容可能未变
+        if stat["size"] != cached["size"] or _file_hash(kb_dir / filename) != cached["sha1"]:
+            return False, False
+        cached.update(stat)
+        refreshed = True
+    return True, refreshed
+
+def _sources_changed(snapshot: Dict[str, Any], kb_dir: Path) -> bool:
+    """源文件 mtime/大小是否与快照记录不同（只做 stat，不读文件）"""
+    current = _source_stats(kb_dir)
+    for key in SOURCE_FILES:
+        cached = snapshot["sources"].get(key)
+        stat = current[key]
+        if stat is None or cached is None:
+            if stat is not cached:
+                return True
+            continue
+        if stat["mtime_ns"] != cached["mtime_ns"] or stat["size"] != cached["size"]:
+            return True
+    return False
+
+def snapshot_version(snapshot: Dict[str, Any]) -> str:
+    """快照内容版本（源文件内容哈希的组合，用于让依赖知识库的缓存失效）"""
+    hashes = [(snapshot["sources"].get(key) or {}).get("sha1", "") for key in SOURCE_FILES]
+    return hashlib.sha1("/".join(hashes).encode("utf-8")).hexdigest()[:16]
+
+def load_snapshot(kb_dir: Path, snapshot_file: Path) -> Tuple[Dict[str, Any], str]:
+    """
+    加载知识库快照（过期或损坏时重新编译并写回）
+    返回：(快照, 来源)，来源为 "snapshot" 或 "rebuilt"
+    """
+    if snapshot_file.exists():
+        try:
+            with open(snapshot_file, "rb") as f:
+                snapshot = pickle.loads(f.read())
+            fresh, refreshed = _check_fresh(snapshot, kb_dir)
+            if fresh:
+                # 内容未变但 stat 已更新：写回，避免之后每次加载都重新计算哈希
+                if refreshed:
+                    _save_snapshot(snapshot, snapshot_file)
+                return snapshot, "snapshot"
+        except Exception:
+            pass
+
+    snapshot = compile_snapshot(kb_dir)
+    # 源文件解析失败（如编辑到一半）时不写入，避免不完整的快照被当作有效快照复用
+    if not snapshot["errors"]:
+        _save_snapshot(snapshot, snapshot_file)
+    return snapshot, "rebuilt"
+
+def _save_snapshot(snapshot: Dict[str, Any], snapshot_file: Path):
+    """写入快照（先写临时文件再替换）"""
+    try:
+        snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = snapshot_file.with_suffix(".tmp")
+        with open(tmp_file, "wb") as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_file.replace(snapshot_file)
+    except OSError:
+        # 快照目录不可写时仍返回内存中的编译结果
+        pass
+
+class KnowledgeBaseWatcher:
+    """
+    长驻进程使用的知识库快照持有者
+
+    - current() 返回当前快照；距上次检查超过 check_interval 时 stat 一次源文件
+    - 源文件变化时在后台线程重新编译，完成后整体替换快照引用；
+      重建期间 current() 继续返回旧快照，进行中的分析不被阻塞
+    - 快照编译后不再修改，调用方在一次分析中持有同一个快照即可保证前后一致
+    """
+
+    def __init__(self, kb_dir: Path, snapshot_file: Path, check_interval: float = RELOAD_CHECK_INTERVAL):
+        self.kb_dir = kb_dir
+        self.snapshot_file = snapshot_file
+        self.check_interval = check_interval
+        self.generation = 0
+        self.origin = ""
+        self.last_errors: List[str] = []
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self._rebuilding: Optional[threading.Thread] = None
+
+    def current(self) -> Dict[str, Any]:
+        """当前快照（首次调用同步加载）"""
+        if self._snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    snapshot, self.origin = load_snapshot(self.kb_dir, self.snapshot_file)
+                    self._swap(snapshot)
+                    self._last_check = time.monotonic()
+            return self._snapshot
+
+        now = time.monotonic()
+        if now - self._last_check >= self.check_interval:
+            self._last_check = now
+            self._check()
+        return self._snapshot
+
+    def _check(self):
+        """源文件有变化且没有进行中的重建时，启动后台重建"""
+        try:
+            changed = _sources_changed(self._snapshot, self.kb_dir)
+        except OSError:
+            return
+        if not changed:
+            return
+        with self._lock:
+            if self._rebuilding and self._rebuilding.is_alive():
+                return
+            self._rebuilding = threading.Thread(target=self._rebuild, name="kb-reload", daemon=True)
+            self._rebuilding.start()
+
+    def _rebuild(self):
+        try:
+            snapshot, origin = load_snapshot(self.kb_dir, self.snapshot_file)
+        except Exception:
+            return
+        # 编辑中的源文件可能暂时不是合法 JSON：保留旧快照，下次检查再试
+        self.last_errors = snapshot.get("errors", [])
+        if self.last_errors:
+            return
+        # 只改了 mtime 的文件经哈希比对后仍是旧内容，不算重新加载
+        if snapshot_version(snapshot) == snapshot_version(self._snapshot):
+            self._snapshot = snapshot
+            return
+        with self._lock:
+            self.origin = origin
+            self._swap(snapshot)
+
+    def _swap(self, snapshot: Dict[str, Any]):
+        self._snapshot = snapshot
+        self.generation += 1
+
+    def wait(self, timeout: Optional[float] = None):
+        """等待进行中的后台重建完成（测试或需要立即生效时使用）"""
+        thread = self._rebuilding
+        if thread:
+            thread.join(timeout)
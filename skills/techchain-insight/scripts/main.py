@@ -8,110 +8,191 @@
 import os
 import sys
 import json
-import subprocess
 import re
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 
+from run_budget import RunBudget, DEPTH_PRESETS, STAGE_NAMES
+from company_graph import segment_companies, domain_companies
+from batch_marker import format_batch_marker
+
 # ==================== 配置区域 ====================
 WORKSPACE = Path(os.environ.get("WORKSPACE", Path.home() / ".openclaw" / "workspace"))
 SKILL_DIR = WORKSPACE / "skills" / "techchain-insight"
 SEARXNG_DIR = WORKSPACE / "skills" / "searxng"
 LOG_FILE = SKILL_DIR / "logs" / "techchain.log"
+CACHE_DIR = SKILL_DIR / "cache" / "analysis"
+ARTIFACT_INDEX = WORKSPACE / "data" / "artifact-index.json"  # 产出物索引（两个技能共用）
+KB_DIR = SKILL_DIR / "knowledge_base"
+KB_SNAPSHOT_FILE = SKILL_DIR / "cache" / "kb_snapshot.pickle"
+
+# 共享模块位于 techpulse-scout/scripts
+SHARED_SCRIPTS_DIR = Path(__file__).resolve().parent.parent.parent / "techpulse-scout" / "scripts"
+if str(SHARED_SCRIPTS_DIR) not in sys.path:
+    sys.path.append(str(SHARED_SCRIPTS_DIR))
+
+from news_item import NewsItem
+from source_registry import authority_points, display_name
+from url_canon import canonical_url
+
+try:
+    from artifact_index import write_artifact, TYPE_TECHCHAIN_REPORT
+    ARTIFACT_INDEX_ENABLED = True
+except ImportError:
+    ARTIFACT_INDEX_ENABLED = False
 
 # 覆盖领域
 DOMAINS = ["半导体", "人工智能", "AI", "新能源", "新能源汽车", "自动驾驶", "固态电池", "芯片", "光刻机"]
 
-# 加载知识库
-def load_knowledge_base():
-    """加载产业链和公司知识库"""
-    industry_file = SKILL_DIR / "knowledge_base" / "industry_chain.json"
-    companies_file = SKILL_DIR / "knowledge_base" / "companies.json"
-    
-    industry_chain = {}
-    companies = {}
-    
-    try:
-        if industry_file.exists():
-            with open(industry_file, 'r', encoding='utf-8') as f:
-                industry_chain = json.load(f)
-    except Exception as e:
-        log(f"加载产业链知识库失败：{str(e)}")
-    
-    try:
-        if companies_file.exists():
-            with open(companies_file, 'r', encoding='utf-8') as f:
-                companies = json.load(f)
-    except Exception as e:
-        log(f"加载公司知识库失败：{str(e)}")
-    
-    return industry_chain, companies
+# 当前运行的时间预算与分析深度（main() 中按 --budget/--depth 设置）
+BUDGET = RunBudget()
+DEPTH = dict(DEPTH_PRESETS["standard"])
 
-# 全局知识库
+# 全局知识库（当前分析使用的快照；长驻进程中源文件变化后，下一次分析开始时切换到新快照）
 INDUSTRY_CHAIN_KNOWLEDGE = {}
 COMPANY_KNOWLEDGE = {}
+KB_INDEXES: Dict[str, Any] = {}
+KB_VERSION = ""
+KB_LOAD_SECONDS = 0.0
+_KB_WATCHER = None
+_KB_GENERATION = 0
+
+def refresh_knowledge():
+    """
+    切换到最新的知识库快照（首次调用同步加载）
+    源文件变化时由 KnowledgeBaseWatcher 在后台重建，这里只替换引用，不等待重建
+    """
+    global INDUSTRY_CHAIN_KNOWLEDGE, COMPANY_KNOWLEDGE, KB_INDEXES, KB_VERSION, KB_LOAD_SECONDS
+    global _KB_WATCHER, _KB_GENERATION
+    if _KB_WATCHER is None:
+        from kb_snapshot import KnowledgeBaseWatcher
+        _KB_WATCHER = KnowledgeBaseWatcher(KB_DIR, KB_SNAPSHOT_FILE)
+    
+    started = time.monotonic()
+    snapshot = _KB_WATCHER.current()
+    if _KB_WATCHER.generation == _KB_GENERATION:
+        return INDUSTRY_CHAIN_KNOWLEDGE, COMPANY_KNOWLEDGE
+    
+    from kb_snapshot import snapshot_version
+    if _KB_GENERATION == 0:
+        KB_LOAD_SECONDS = time.monotonic() - started
+        for error in snapshot.get("errors", []):
+            log(f"加载知识库失败：{error}")
+        if _KB_WATCHER.origin == "rebuilt":
+            log(f"知识库快照已重建：{KB_SNAPSHOT_FILE}")
+    else:
+        log(f"知识库源文件已更新，切换到新快照（第 {_KB_WATCHER.generation} 版）")
+    
+    INDUSTRY_CHAIN_KNOWLEDGE = snapshot["industry_chain"]
+    COMPANY_KNOWLEDGE = snapshot["companies"]
+    KB_INDEXES = snapshot["indexes"]
+    KB_VERSION = snapshot_version(snapshot)
+    _KB_GENERATION = _KB_WATCHER.generation
+    # 匹配结果依赖知识库内容
+    _DOMAIN_MATCH_CACHE.clear()
+    _COMPANY_MATCH_CACHE.clear()
+    return INDUSTRY_CHAIN_KNOWLEDGE, COMPANY_KNOWLEDGE
 
-# 延迟加载
 def get_knowledge():
-    """获取知识库（延迟加载）"""
-    global INDUSTRY_CHAIN_KNOWLEDGE, COMPANY_KNOWLEDGE
-    if not INDUSTRY_CHAIN_KNOWLEDGE:
-        INDUSTRY_CHAIN_KNOWLEDGE, COMPANY_KNOWLEDGE = load_knowledge_base()
+    """获取知识库（首次调用时加载；分析进行中不切换快照）"""
+    if not _KB_GENERATION:
+        refresh_knowledge()
     return INDUSTRY_CHAIN_KNOWLEDGE, COMPANY_KNOWLEDGE
 
 # ==================== 日志函数 ====================
-def log(message: str):
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    log_msg = f"[{timestamp}] {message}"
-    print(log_msg, file=sys.stderr)
-    LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(log_msg + "\n")
+# 首次写日志时才配置（导入 main.py、--help 不创建日志目录和写入线程）
+_LOGGER = None
+_LOG_LEVELS: Dict[str, int] = {}
+
+def log(message: str, level: str = "INFO"):
+    global _LOGGER, _LOG_LEVELS
+    if _LOGGER is None:
+        from log_config import setup_logger, LOG_LEVELS
+        _LOGGER = setup_logger("techchain", LOG_FILE, sys.stderr)
+        _LOG_LEVELS = LOG_LEVELS
+    _LOGGER.log(_LOG_LEVELS.get(level, _LOG_LEVELS["INFO"]), message)
 
 # ==================== 搜索模块 ====================
-def calculate_credibility_score(news: Dict[str, Any], keyword: str) -> int:
+# 进程内搜索缓存：批量分析多个关键词时，相同查询只发起一次
+SEARCH_CACHE: Dict[tuple, List[Dict[str, Any]]] = {}
+SEARCH_CACHE_STATS = {"hits": 0, "misses": 0}
+
+def run_search(query: str, num: int, timeout: int, optional: bool = True) -> Optional[List[Dict[str, Any]]]:
+    """
+    调用 SearXNG 搜索（受时间预算约束，同一进程内相同查询复用结果）
+    返回：结果列表；搜索失败返回 []；预算不足跳过可选搜索时返回 None
+    """
+    cache_key = (query, num)
+    if cache_key in SEARCH_CACHE:
+        SEARCH_CACHE_STATS["hits"] += 1
+        return SEARCH_CACHE[cache_key]
+    
+    if optional and BUDGET.limited and not BUDGET.allow_optional():
+        BUDGET.mark_degraded("时间预算不足，跳过部分联网搜索")
+        return None
+    
+    import subprocess
+    
+    try:
+        cmd = ["uv", "run", "scripts/searxng.py", "search", query, "-n", str(num), "--format", "json"]
+        result = subprocess.run(cmd, cwd=SEARXNG_DIR, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, timeout=BUDGET.clamp_timeout(timeout))
+        
+        if result.returncode == 0:
+            try:
+                results = json.loads(result.stdout).get("results", [])
+                SEARCH_CACHE[cache_key] = results
+                SEARCH_CACHE_STATS["misses"] += 1
+                return results
+            except json.JSONDecodeError:
+                pass
+    except subprocess.TimeoutExpired:
+        log(f"搜索超时：{query[:50]}")
+        if BUDGET.limited:
+            BUDGET.mark_degraded("搜索超时，结果不完整")
+    except Exception as e:
+        log(f"搜索失败：{str(e)[:50]}")
+    
+    return []
+
+# 可信度评分规则
+CREDIBILITY_TIME_KEYWORDS = ("今日", "今天", "刚刚", "最新", "2026", "3 月", "03 月")
+CREDIBILITY_NEGATIVE_SIGNALS = ("广告", "推广", "赞助", "营销", "点击", "分享", "收藏")
+CREDIBILITY_SUSPICIOUS_DOMAINS = ("blogspot", "wordpress", "medium", "wattpad", "archiveofourown")
+DIGIT_PATTERN = re.compile(r'\d+')
+COMPANY_CHAR_PATTERN = re.compile(r'[公司厂集团股份]')
+
+def calculate_credibility_score(news: NewsItem, keyword: str) -> int:
     """
     计算新闻可信度评分（0-100）
     考虑因素：来源权威性、时效性、内容质量、多源验证
     """
     score = 50  # 基础分
     
-    url = news.get("url", "").lower()
-    title = news.get("title", "").lower()
-    content = news.get("content", "").lower()
-    text = title + " " + content
-    
-    # 1. 来源权威性（+0 到 +30 分）
-    authoritative_sources = {
-        "gov.cn": 30, "sec.gov": 30,  # 政府/监管
-        "bloomberg.com": 25, "reuters.com": 25, "wsj.com": 25,  # 顶级财经
-        "cls.cn": 20, "stcn.com": 20, "cs.com.cn": 20,  # 国内权威
-        "eastmoney.com": 15, "sina.com.cn": 15, "36kr.com": 15,  # 主流财经
-        "zhihu.com": 5, "weibo.com": 3,  # 社交媒体（低分）
-    }
+    url = news.url_lower
+    title = news.title.lower()
+    content = news.content.lower()
+    text = news.text_lower
     
-    for domain, points in authoritative_sources.items():
-        if domain in url:
-            score += points
-            break
+    # 1. 来源权威性（+0 到 +30 分，见 data/sources.json 的 authority）
+    score += authority_points(news.url)
     
     # 2. 时效性（+0 到 +20 分）
-    time_keywords = ["今日", "今天", "刚刚", "最新", "2026", "3 月", "03 月"]
-    if any(kw in text for kw in time_keywords):
+    if any(kw in text for kw in CREDIBILITY_TIME_KEYWORDS):
         score += 20
     elif "2025" in text:
         score += 10
     
     # 3. 内容质量（+0 到 +20 分）
     # 有具体数据/数字加分
-    if re.search(r'\d+', text):
+    if DIGIT_PATTERN.search(text):
         score += 10
     # 有公司名称加分
-    if re.search(r'[公司厂集团股份]', text):
+    if COMPANY_CHAR_PATTERN.search(text):
         score += 10
     # 标题长度适中（10-50 字）
-    if 10 <= len(news.get("title", "")) <= 50:
+    if 10 <= len(news.title) <= 50:
         score += 5
     
     # 4. 关键词相关性（+0 到 +30 分）
@@ -122,18 +203,16 @@ def calculate_credibility_score(news: Dict[str, Any], keyword: str) -> int:
         score += 10
     
     # 5. 负面信号（减分）
-    negative_signals = ["广告", "推广", "赞助", "营销", "点击", "分享", "收藏"]
-    if any(kw in text for kw in negative_signals):
+    if any(kw in text for kw in CREDIBILITY_NEGATIVE_SIGNALS):
         score -= 20
     
     # 6. 可疑来源（减分）
-    suspicious_domains = ["blogspot", "wordpress", "medium", "wattpad", "archiveofourown"]
-    if any(domain in url for domain in suspicious_domains):
+    if any(domain in url for domain in CREDIBILITY_SUSPICIOUS_DOMAINS):
         score -= 30
     
     return max(0, min(100, score))
 
-def verify_information(news_list: List[Dict[str, Any]], keyword: str) -> List[Dict[str, Any]]:
+def verify_information(news_list: List[NewsItem], keyword: str) -> List[NewsItem]:
     """
     验证信息并添加可信度评分
     """
@@ -166,7 +245,7 @@ def verify_information(news_list: List[Dict[str, Any]], keyword: str) -> List[Di
     
     return verified_results
 
-def search_news(keyword: str, hours: int = 48) -> List[Dict[str, Any]]:
+def search_news(keyword: str, hours: int = 48) -> List[NewsItem]:
     """搜索最新新闻（带验证）"""
     log(f"正在搜索：{keyword}...")
     
@@ -175,37 +254,28 @@ def search_news(keyword: str, hours: int = 48) -> List[Dict[str, Any]]:
         f"{keyword} 供应链 供应商",
         f"{keyword} 受益公司 龙头",
         f"{keyword} 产业链 影响",
+        f"{keyword} 订单 合同 签约",
+        f"{keyword} 研报 分析",
     ]
     
     all_results = []
     
-    for query in queries:
-        try:
-            cmd = ["uv", "run", "scripts/searxng.py", "search", query, "-n", "10", "--format", "json"]
-            result = subprocess.run(cmd, cwd=SEARXNG_DIR, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, timeout=60)
-            
-            if result.returncode == 0:
-                try:
-                    data = json.loads(result.stdout)
-                    for r in data.get("results", [])[:5]:
-                        all_results.append({
-                            "title": r.get("title", ""),
-                            "url": r.get("url", ""),
-                            "content": r.get("content", ""),
-                            "source": extract_source(r.get("url", "")),
-                        })
-                except json.JSONDecodeError:
-                    pass
-        except Exception as e:
-            log(f"搜索失败：{str(e)[:50]}")
+    for i, query in enumerate(queries[:DEPTH["news_queries"]]):
+        # 第一个查询必做，其余查询在预算不足时跳过
+        results = run_search(query, 10, 60, optional=i > 0)
+        if results is None:
+            break
+        for r in results[:5]:
+            all_results.append(NewsItem.from_search_result(r, source=extract_source(r.get("url", ""))))
     
-    # 去重
+    # 去重（规范化 URL：跟踪参数、移动版/AMP、http/https 视为同一篇）
     seen_urls = set()
     unique_results = []
     for r in all_results:
-        if r["url"] not in seen_urls:
+        url_key = canonical_url(r.url)
+        if url_key not in seen_urls:
             unique_results.append(r)
-            seen_urls.add(r["url"])
+            seen_urls.add(url_key)
     
     # 验证信息并添加可信度评分
     verified_results = verify_information(unique_results, keyword)
@@ -213,63 +283,74 @@ def search_news(keyword: str, hours: int = 48) -> List[Dict[str, Any]]:
     log(f"找到 {len(verified_results)} 条相关新闻（已验证）")
     return verified_results[:15]
 
+# 来源域名 → 显示名称
 def extract_source(url: str) -> str:
-    """提取来源名称"""
-    domain_map = {
-        "bloomberg.com": "彭博社", "reuters.com": "路透社", "36kr.com": "36 氪",
-        "eastmoney.com": "东方财富", "sina.com.cn": "新浪财经", "cls.cn": "财联社",
-        "stcn.com": "证券时报", "cs.com.cn": "中国证券报", "anandtech.com": "AnandTech",
-        "eetimes.com": "EE Times", "sec.gov": "SEC 公告",
-    }
-    for domain, name in domain_map.items():
-        if domain in url.lower():
-            return name
-    try:
-        from urllib.parse import urlparse
-        return urlparse(url).netloc.replace("www.", "")
-    except:
-        return "未知来源"
+    """提取来源名称（信源表中的显示名称，未收录时为主机名）"""
+    return display_name(url) or "未知来源"
 
-# ==================== 增强分析模块导入 ====================
-try:
-    from enhanced_analysis import (
-        classify_source,
-        verify_with_multiple_sources,
-        extract_entities,
-        analyze_competition,
-        format_with_citations,
-        comprehensive_verification
-    )
-    ENHANCED_ANALYSIS_ENABLED = True
-    log("增强分析模块已加载")
-except Exception as e:
-    log(f"增强分析模块加载失败：{str(e)[:100]}")
-    ENHANCED_ANALYSIS_ENABLED = False
-
-# ==================== 事件摘要模块导入 ====================
-try:
-    from event_summary import extract_event_summary, get_impact_priority, generate_segment_analysis
-    EVENT_SUMMARY_ENABLED = True
-    log("事件摘要模块已加载")
-except Exception as e:
-    log(f"事件摘要模块加载失败：{str(e)[:100]}")
-    EVENT_SUMMARY_ENABLED = False
-
-# ==================== 影响分析器导入 ====================
-try:
-    from impact_analyzer import analyze_chain_impact, detect_event_type, get_segment_impact
-    IMPACT_ANALYZER_ENABLED = True
-    log("影响分析器已加载")
-except Exception as e:
-    log(f"影响分析器加载失败：{str(e)[:100]}")
-    IMPACT_ANALYZER_ENABLED = False
+# ==================== 分析模块（首次使用时导入） ====================
+# 模块名 → (名称, 需要的函数)；--help、缓存命中等路径不导入用不到的分析模块
+OPTIONAL_MODULES = {
+    "enhanced_analysis": ("增强分析模块", ["comprehensive_verification"]),
+    "event_summary": ("事件摘要模块", ["extract_event_summary", "get_impact_priority", "generate_segment_analysis"]),
+    "impact_analyzer": ("影响分析器", ["analyze_chain_impact", "detect_event_type", "get_segment_impact"]),
+    "analysis_cache": ("分析缓存模块", ["load_cached_analysis", "save_cached_analysis", "format_cache_age"]),
+}
+_LOADED_MODULES: Dict[str, Any] = {}
+
+def optional_module(name: str):
+    """导入分析模块（进程内只尝试一次），缺少模块或所需函数时返回 None"""
+    if name not in _LOADED_MODULES:
+        import importlib
+        
+        label, required = OPTIONAL_MODULES[name]
+        try:
+            module = importlib.import_module(name)
+            missing = [attr for attr in required if not hasattr(module, attr)]
+            if missing:
+                raise ImportError(f"cannot import name '{missing[0]}' from '{name}'")
+            log(f"{label}已加载", "DEBUG")
+        except Exception as e:
+            log(f"{label}加载失败：{str(e)[:100]}")
+            module = None
+        _LOADED_MODULES[name] = module
+    return _LOADED_MODULES[name]
 
 # ==================== 产业链分析模块 ====================
+# 领域/公司匹配结果（同一进程内多个关键词共享）
+_DOMAIN_MATCH_CACHE: Dict[str, tuple] = {}
+_COMPANY_MATCH_CACHE: Dict[str, List[Dict[str, str]]] = {}
+
+# 领域模糊匹配关键词
+DOMAIN_MATCH_KEYWORDS = {
+    "半导体": {"芯片", "IC", "晶圆", "光刻", "刻蚀", "封装", "半导体", "制程", "纳米"},
+    "人工智能": {"AI", "大模型", "GPT", "机器学习", "深度学习", "神经网络", "AIGC"},
+    "新能源": {"光伏", "风电", "储能", "氢能", "太阳能", "风能"},
+    "固态电池": {"固态", "电解质", "半固态", "凝聚态", "锂金属"},
+    "新能源汽车": {"电动车", "EV", "新能源汽", "插混", "增程"},
+    "自动驾驶": {"自动驾驶", "无人驾驶", "智能驾驶", "激光雷达", "NOA", "FSD"},
+    "6G 通信": {"6G", "太赫兹", "通信", "卫星互联网"},
+    "量子计算": {"量子", "量子比特", "qubit", "量子霸权"},
+    "人形机器人": {"人形机器人", "机器人", "伺服", "减速器", "Optimus"},
+    "商业航天": {"商业航天", "火箭", "卫星", "发射", "太空"},
+    "合成生物": {"合成生物", "基因", "发酵", "菌种", "生物制造"},
+    "低空经济": {"低空经济", "eVTOL", "无人机", "飞行汽车", "通航"},
+    "脑机接口": {"脑机接口", "BCI", "神经", "脑电", "侵入式"},
+    "核聚变": {"核聚变", "托卡马克", "人造太阳", "聚变"},
+    "元宇宙": {"元宇宙", "VR", "AR", "虚拟", "NFT", "数字人"},
+    "钙钛矿电池": {"钙钛矿", "叠层电池", "光伏电池"},
+}
+
 def match_domain(keyword: str) -> tuple:
     """
-    匹配最相关的领域（优化版）
+    匹配最相关的领域（优化版，按关键词缓存）
     返回：(领域名称，置信度 0-100)
     """
+    if keyword not in _DOMAIN_MATCH_CACHE:
+        _DOMAIN_MATCH_CACHE[keyword] = _match_domain(keyword)
+    return _DOMAIN_MATCH_CACHE[keyword]
+
+def _match_domain(keyword: str) -> tuple:
     # 确保知识库已加载
     get_knowledge()
     
@@ -281,29 +362,10 @@ def match_domain(keyword: str) -> tuple:
             return (domain, 100)
     
     # 模糊匹配（按关键词匹配度评分）
-    domain_keywords = {
-        "半导体": {"芯片", "IC", "晶圆", "光刻", "刻蚀", "封装", "半导体", "制程", "纳米"},
-        "人工智能": {"AI", "大模型", "GPT", "机器学习", "深度学习", "神经网络", "AIGC"},
-        "新能源": {"光伏", "风电", "储能", "氢能", "太阳能", "风能"},
-        "固态电池": {"固态", "电解质", "半固态", "凝聚态", "锂金属"},
-        "新能源汽车": {"电动车", "EV", "新能源汽", "插混", "增程"},
-        "自动驾驶": {"自动驾驶", "无人驾驶", "智能驾驶", "激光雷达", "NOA", "FSD"},
-        "6G 通信": {"6G", "太赫兹", "通信", "卫星互联网"},
-        "量子计算": {"量子", "量子比特", "qubit", "量子霸权"},
-        "人形机器人": {"人形机器人", "机器人", "伺服", "减速器", "Optimus"},
-        "商业航天": {"商业航天", "火箭", "卫星", "发射", "太空"},
-        "合成生物": {"合成生物", "基因", "发酵", "菌种", "生物制造"},
-        "低空经济": {"低空经济", "eVTOL", "无人机", "飞行汽车", "通航"},
-        "脑机接口": {"脑机接口", "BCI", "神经", "脑电", "侵入式"},
-        "核聚变": {"核聚变", "托卡马克", "人造太阳", "聚变"},
-        "元宇宙": {"元宇宙", "VR", "AR", "虚拟", "NFT", "数字人"},
-        "钙钛矿电池": {"钙钛矿", "叠层电池", "光伏电池"},
-    }
-    
     best_match = None
     best_score = 0
     
-    for domain, keywords in domain_keywords.items():
+    for domain, keywords in DOMAIN_MATCH_KEYWORDS.items():
         match_count = sum(1 for kw in keywords if kw in keyword_lower)
         score = match_count * 30  # 每个关键词匹配得 30 分
         
@@ -328,17 +390,17 @@ def analyze_industry_chain(keyword: str, news_list: List[Dict]) -> List[Dict[str
     
     log(f"领域匹配：{matched_domain} (置信度：{confidence})")
     
-    log(f"知识库内容：{list(INDUSTRY_CHAIN_KNOWLEDGE.keys())}")
-    log(f"matched_domain={matched_domain}, in dict={matched_domain in INDUSTRY_CHAIN_KNOWLEDGE if matched_domain else False}")
+    log(f"知识库内容：{list(INDUSTRY_CHAIN_KNOWLEDGE.keys())}", "DEBUG")
+    log(f"matched_domain={matched_domain}, in dict={matched_domain in INDUSTRY_CHAIN_KNOWLEDGE if matched_domain else False}", "DEBUG")
     
     if matched_domain and matched_domain in INDUSTRY_CHAIN_KNOWLEDGE:
         knowledge = INDUSTRY_CHAIN_KNOWLEDGE[matched_domain]
-        log(f"使用领域知识：{list(knowledge.keys())}")
+        log(f"使用领域知识：{list(knowledge.keys())}", "DEBUG")
         
         # 分析各环节影响
         for stage, segments in knowledge.items():
             if isinstance(segments, list):
-                for segment in segments[:5]:  # 每个环节取前 5 个细分
+                for segment in segments[:DEPTH["segments_per_stage"]]:  # 每个环节取前 N 个细分
                     impact = assess_impact(segment, news_list, keyword)
                     log(f"  {segment}: {impact}")
                     # 保留所有环节，包括推断结果
@@ -356,6 +418,35 @@ def analyze_industry_chain(keyword: str, news_list: List[Dict]) -> List[Dict[str
     
     return chain_analysis
 
+# 事件摘要：标题中的技术点
+SUMMARY_TITLE_TECH_PATTERNS = [
+    re.compile(r'(\d{1,2}[0-9.]*nm)'),  # 2nm, 3nm, 5nm
+    re.compile(r'(GAA|FinFET|EUV|DUV|High-NA)'),
+    re.compile(r'(固态电池 | 半固态 | 凝聚态)'),
+    re.compile(r'(钙钛矿 | 叠层电池)'),
+    re.compile(r'(HBM\d*|CoWoS|Chiplet)'),
+    re.compile(r'(激光雷达 | 毫米波雷达)'),
+    re.compile(r'(大模型 | 多模态)'),
+    re.compile(r'(射频 | 微波 | 毫米波)'),  # 射频芯片相关
+    re.compile(r'(功率 | 散热 | 热管理)'),  # 功率/散热相关
+]
+
+# 事件摘要：正文中的技术点（过滤定义性文本）
+SUMMARY_CONTENT_TECH_PATTERNS = [
+    re.compile(r'(\d{1,2}[0-9.]*nm 工艺)'),
+    re.compile(r'(固态电池 | 钙钛矿电池)'),
+    re.compile(r'(HBM\d*|CoWoS)'),
+]
+
+# 事件摘要：解决的问题
+SUMMARY_PROBLEM_PATTERNS = [
+    re.compile(r'攻克 (.{5,40}?) 难题'),
+    re.compile(r'解决 (.{5,40}?) 问题'),
+    re.compile(r'突破 (.{5,40}?) 瓶颈'),
+    re.compile(r'(.{5,30}?) 成为瓶颈'),
+    re.compile(r'(.{5,30}?) 世界难题'),
+]
+
 def extract_event_summary(news_list: List[Dict], keyword: str) -> Dict:
     """
     提取事件核心摘要（先读懂新闻在说什么）
@@ -382,47 +473,23 @@ def extract_event_summary(news_list: List[Dict], keyword: str) -> Dict:
             summary["what"] = "订单/合同"
         
         # 从标题提取技术点（更准确）
-        tech_patterns = [
-            r'(\d{1,2}[0-9.]*nm)',  # 2nm, 3nm, 5nm
-            r'(GAA|FinFET|EUV|DUV|High-NA)',
-            r'(固态电池 | 半固态 | 凝聚态)',
-            r'(钙钛矿 | 叠层电池)',
-            r'(HBM\d*|CoWoS|Chiplet)',
-            r'(激光雷达 | 毫米波雷达)',
-            r'(大模型 | 多模态)',
-            r'(射频 | 微波 | 毫米波)',  # 射频芯片相关
-            r'(功率 | 散热 | 热管理)',  # 功率/散热相关
-        ]
-        
-        for pattern in tech_patterns:
-            matches = re.findall(pattern, title_text)
+        for pattern in SUMMARY_TITLE_TECH_PATTERNS:
+            matches = pattern.findall(title_text)
             if matches:
                 summary["tech"] = matches[0]
                 break
         
         # 如果标题没有，从内容提取（但过滤定义性文本）
         if not summary["tech"]:
-            content_tech_patterns = [
-                r'(\d{1,2}[0-9.]*nm 工艺)',
-                r'(固态电池 | 钙钛矿电池)',
-                r'(HBM\d*|CoWoS)',
-            ]
-            for pattern in content_tech_patterns:
-                matches = re.findall(pattern, content)
+            for pattern in SUMMARY_CONTENT_TECH_PATTERNS:
+                matches = pattern.findall(content)
                 if matches:
                     summary["tech"] = matches[0]
                     break
         
         # 提取解决的问题
-        problem_patterns = [
-            r'攻克 (.{5,40}?) 难题',
-            r'解决 (.{5,40}?) 问题',
-            r'突破 (.{5,40}?) 瓶颈',
-            r'(.{5,30}?) 成为瓶颈',
-            r'(.{5,30}?) 世界难题',
-        ]
-        for pattern in problem_patterns:
-            matches = re.findall(pattern, title_text + " " + content[:200])  # 只看标题和前 200 字
+        for pattern in SUMMARY_PROBLEM_PATTERNS:
+            matches = pattern.findall(title_text + " " + content[:200])  # 只看标题和前 200 字
             if matches:
                 summary["problem"] = matches[0][:40]
                 break
@@ -439,7 +506,21 @@ def extract_event_summary(news_list: List[Dict], keyword: str) -> Dict:
     
     return summary
 
-def extract_tech_keywords(news_list: List[Dict], keyword: str) -> List[str]:
+# 新闻中的关键技术点
+TECH_KEYWORD_PATTERNS = [
+    re.compile(r'(\d[0-9.]*[nmNM]+ 工艺)'),  # 2nm 工艺
+    re.compile(r'(\d[0-9.]*[nmNM]+)'),  # 2nm, 3nm, 5nm, 2.5nm
+    re.compile(r'(GAA|FinFET|EUV|DUV|High-NA)'),  # 技术架构
+    re.compile(r'(固态 | 半固态 | 凝聚态)'),  # 电池技术
+    re.compile(r'(钙钛矿 | 叠层)'),  # 光伏技术
+    re.compile(r'(HBM\d*|CoWoS|Chiplet|3D 封装)'),  # 封装技术
+    re.compile(r'(激光雷达 | 毫米波雷达 | 摄像头)'),  # 自动驾驶
+    re.compile(r'(大模型 | 多模态 | AIGC|LLM)'),  # AI 技术
+    re.compile(r'([^\s]{2,8} 材料)'),  # XX 材料
+    re.compile(r'([^\s]{2,8} 芯片)'),  # XX 芯片
+]
+
+def extract_tech_keywords(news_list: List[NewsItem], keyword: str) -> List[str]:
     """
     从新闻中提取关键技术点
     """
@@ -449,23 +530,10 @@ def extract_tech_keywords(news_list: List[Dict], keyword: str) -> List[str]:
     tech_keywords.append(keyword)
     
     # 2. 从新闻标题/内容提取技术关键词
-    tech_patterns = [
-        r'(\d[0-9.]*[nmNM]+ 工艺)',  # 2nm 工艺
-        r'(\d[0-9.]*[nmNM]+)',  # 2nm, 3nm, 5nm, 2.5nm
-        r'(GAA|FinFET|EUV|DUV|High-NA)',  # 技术架构
-        r'(固态 | 半固态 | 凝聚态)',  # 电池技术
-        r'(钙钛矿 | 叠层)',  # 光伏技术
-        r'(HBM\d*|CoWoS|Chiplet|3D 封装)',  # 封装技术
-        r'(激光雷达 | 毫米波雷达 | 摄像头)',  # 自动驾驶
-        r'(大模型 | 多模态 | AIGC|LLM)',  # AI 技术
-        r'([^\s]{2,8} 材料)',  # XX 材料
-        r'([^\s]{2,8} 芯片)',  # XX 芯片
-    ]
-    
     for news in news_list:
-        text = news.get("title", "") + " " + news.get("content", "")
-        for pattern in tech_patterns:
-            matches = re.findall(pattern, text)
+        text = news.text
+        for pattern in TECH_KEYWORD_PATTERNS:
+            matches = pattern.findall(text)
             tech_keywords.extend(matches)
     
     # 过滤掉太短或无意义的词
@@ -496,7 +564,7 @@ def assess_impact(segment: str, news_list: List[Dict], keyword: str = "") -> str
     
     # 2. 先理解事件核心内容
     event_summary = extract_event_summary(news_list, keyword)
-    log(f"    事件摘要：what={event_summary['what']}, tech={event_summary['tech']}, problem={event_summary['problem']}")
+    log(f"    事件摘要：what={event_summary['what']}, tech={event_summary['tech']}, problem={event_summary['problem']}", "DEBUG")
     
     # 3. 提取关键技术点
     tech_keywords = extract_tech_keywords(news_list, keyword)
@@ -517,49 +585,42 @@ def assess_impact(segment: str, news_list: List[Dict], keyword: str = "") -> str
     if event_summary["tech"] and len(event_summary["tech"]) >= 3 and event_summary["tech"] not in keyword:
         search_queries.append(f"{event_summary['tech']} {segment} 影响")
     
-    for search_query in search_queries[:5]:  # 最多搜索 5 次
-        log(f"    搜索：{search_query}")
+    for search_query in search_queries[:DEPTH["segment_searches"]]:  # 最多搜索 N 次
+        results = run_search(search_query, 5, 30)
+        if results is None:
+            log(f"    预算不足，跳过搜索：{search_query}")
+            break
+        log(f"    搜索：{search_query}", "DEBUG")
         
-        try:
-            cmd = ["uv", "run", "scripts/searxng.py", "search", search_query, "-n", "5", "--format", "json"]
-            result = subprocess.run(cmd, cwd=SEARXNG_DIR, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, timeout=30)
-            
-            if result.returncode == 0:
-                try:
-                    data = json.loads(result.stdout)
-                    results = data.get("results", [])[:3]
-                    
-                    if results:
-                        # 从搜索结果提取影响分析
-                        # 提取搜索词用于描述
-                        query_tech = search_query.split()[0] if search_query else keyword
-                        analysis = extract_impact_from_search(results, segment, query_tech, event_summary)
-                        if analysis:
-                            return analysis
-                except json.JSONDecodeError:
-                    pass
-        except Exception as e:
-            log(f"    搜索异常：{str(e)[:50]}")
+        results = results[:3]
+        if results:
+            # 从搜索结果提取影响分析
+            # 提取搜索词用于描述
+            query_tech = search_query.split()[0] if search_query else keyword
+            analysis = extract_impact_from_search(results, segment, query_tech, event_summary)
+            if analysis:
+                return analysis
     
     # 4. 搜索无果时使用事件摘要推断（更精准）
-    log(f"    搜索无结果，使用事件摘要推断")
+    log(f"    搜索无结果，使用事件摘要推断", "DEBUG")
     
-    if EVENT_SUMMARY_ENABLED and event_summary:
+    event_summary_module = optional_module("event_summary")
+    if event_summary_module and event_summary:
         # 使用事件摘要进行精准推断
-        analysis = generate_segment_analysis(segment, event_summary, None)
+        analysis = event_summary_module.generate_segment_analysis(segment, event_summary, None)
         if analysis:
-            log(f"    事件摘要推断：{analysis[:50]}...")
+            log(f"    事件摘要推断：{analysis[:50]}...", "DEBUG")
             return analysis
     
     # 5. 使用影响分析器（基于事件类型）
-    if IMPACT_ANALYZER_ENABLED:
-        from impact_analyzer import detect_event_type, get_segment_impact as get_impact_direct
-        event_type = detect_event_type(keyword, news_list)
-        log(f"    事件类型：{event_type}")
+    impact_module = optional_module("impact_analyzer")
+    if impact_module:
+        event_type = impact_module.detect_event_type(keyword, news_list)
+        log(f"    事件类型：{event_type}", "DEBUG")
         
         # 直接调用 get_segment_impact 获取具体环节的影响
-        impact = get_impact_direct(segment, event_type, keyword)
-        log(f"    {segment}: {impact[:60]}...")
+        impact = impact_module.get_segment_impact(segment, event_type, keyword)
+        log(f"    {segment}: {impact[:60]}...", "DEBUG")
         return impact
     
     # 6. 退回到通用推断
@@ -570,6 +631,20 @@ def assess_impact(segment: str, news_list: List[Dict], keyword: str = "") -> str
     # 7. 基于环节类型的通用分析
     return f"中性 - {segment}环节，事件影响待观察"
 
+# 正面影响关键词
+POSITIVE_IMPACT_KEYWORDS = ["受益", "利好", "增长", "提升", "突破", "加速", "机会", "空间", "国产替代", "渗透率", "价值量提升", "需求旺盛"]
+
+# 影响描述提取
+IMPACT_DESCRIPTION_PATTERNS = [
+    re.compile(r'(.{20,80}?) 受益'),
+    re.compile(r'(.{20,80}?) 利好'),
+    re.compile(r'(.{20,80}?) 增长'),
+    re.compile(r'(.{20,80}?) 提升'),
+    re.compile(r'(.{20,80}?) 突破'),
+    re.compile(r'(.{20,80}?) 加速'),
+    re.compile(r'(.{20,80}?) 国产替代'),
+]
+
 def extract_impact_from_search(results: List[Dict], segment: str, tech: str, event_summary: Dict = None) -> str:
     """
     从搜索结果中提取产业链影响分析
@@ -579,28 +654,15 @@ def extract_impact_from_search(results: List[Dict], segment: str, tech: str, eve
         content = r.get("content", "")
         text = title + " " + content
         
-        # 正面影响关键词
-        positive_keywords = ["受益", "利好", "增长", "提升", "突破", "加速", "机会", "空间", "国产替代", "渗透率", "价值量提升", "需求旺盛"]
-        
         # 检查是否有正面影响
-        has_positive = any(kw in text for kw in positive_keywords)
+        has_positive = any(kw in text for kw in POSITIVE_IMPACT_KEYWORDS)
         
         # 提取具体数据
         numbers = re.findall(r'\d+(?:\.\d+)?[亿万%]?', text)
         
         # 优先提取具体影响描述（从标题或开头）
-        impact_patterns = [
-            r'(.{20,80}?) 受益',
-            r'(.{20,80}?) 利好',
-            r'(.{20,80}?) 增长',
-            r'(.{20,80}?) 提升',
-            r'(.{20,80}?) 突破',
-            r'(.{20,80}?) 加速',
-            r'(.{20,80}?) 国产替代',
-        ]
-        
-        for pattern in impact_patterns:
-            matches = re.findall(pattern, text)
+        for pattern in IMPACT_DESCRIPTION_PATTERNS:
+            matches = pattern.findall(text)
             if matches:
                 desc = matches[0][:80].strip()
                 # 严格过滤：必须是有意义的完整描述
@@ -619,29 +681,35 @@ def extract_impact_from_search(results: List[Dict], segment: str, tech: str, eve
     # 搜索不到好结果时返回空，让上层使用推断
     return ""
 
-def extract_facts_from_news(news_list: List[Dict], segment: str, keyword: str) -> List[Dict]:
+# 事实依据提取
+FACT_NUMBER_PATTERN = re.compile(r'\d+(?:\.\d+)?[亿万]?[美元人民币]?元？')
+FACT_COMPANY_PATTERN = re.compile(r'[A-Za-z\u4e00-\u9fa5]{2,20}(?:公司 | 集团 | 厂 | 大学 | 研究院)')
+FACT_CONTRACT_PATTERN = re.compile(r'(签约 | 合同 | 订单 | 采购 | 中标 | 攻克 | 突破 | 发布 | 量产)')
+FACT_CAPACITY_PATTERN = re.compile(r'(产能 | 产量 | 出货量 | 效率 | 性能).{0,30}\d+')
+FACT_PROGRESS_PATTERN = re.compile(r'(攻克 | 突破 | 首创 | 领先 | 填补空白 | 世界难题)')
+FACT_QUOTE_PATTERN = re.compile(r'[""](.*?)[""]')
+
+def extract_facts_from_news(news_list: List[NewsItem], segment: str, keyword: str) -> List[Dict]:
     """
     从新闻中提取事实依据（数据/合同/签约等）
     """
-    import re
     facts = []
     
     for news in news_list:
-        title = news.get("title", "")
-        content = news.get("content", "")
-        text = title + " " + content
+        title = news.title
+        text = news.text
         
         # 提取具体数据
-        numbers = re.findall(r'\d+(?:\.\d+)?[亿万]?[美元人民币]?元？', text)
-        companies = re.findall(r'[A-Za-z\u4e00-\u9fa5]{2,20}(?:公司 | 集团 | 厂 | 大学 | 研究院)', text)
-        contracts = re.findall(r'(签约 | 合同 | 订单 | 采购 | 中标 | 攻克 | 突破 | 发布 | 量产)', text)
-        capacity = re.findall(r'(产能 | 产量 | 出货量 | 效率 | 性能).{0,30}\d+', text)
+        numbers = FACT_NUMBER_PATTERN.findall(text)
+        companies = FACT_COMPANY_PATTERN.findall(text)
+        contracts = FACT_CONTRACT_PATTERN.findall(text)
+        capacity = FACT_CAPACITY_PATTERN.findall(text)
         
         # 提取技术进展关键词
-        tech_progress = re.findall(r'(攻克 | 突破 | 首创 | 领先 | 填补空白 | 世界难题)', text)
+        tech_progress = FACT_PROGRESS_PATTERN.findall(text)
         
         # 提取人物/机构引用
-        quotes = re.findall(r'[""](.*?)[""]', text)[:2]
+        quotes = FACT_QUOTE_PATTERN.findall(text)[:2]
         
         if numbers or contracts or tech_progress:
             facts.append({
@@ -694,6 +762,132 @@ def format_fact_based_analysis(facts: List[Dict]) -> str:
     else:
         return "暂无具体数据"
 
+# 预设的产业链影响逻辑（关键词 → 细分环节 → 影响）
+IMPACT_RULES = {
+    # ==================== NVIDIA 相关 ====================
+    "nvidia": {
+        "GPU": "重大利好 - AI 芯片需求爆发",
+        "HBM": "重大利好 - HBM4 成为瓶颈，需求激增",
+        "CoWoS": "重大利好 - 先进封装产能紧张",
+        "Chiplet": "利好 - Chiplet 技术受益",
+        "光刻机": "利好 - 高端制程需求增加",
+        "刻蚀机": "利好 - 先进制程需求",
+        "薄膜沉积": "利好 - 制程升级需求",
+        "晶圆代工": "重大利好 - 台积电受益",
+        "先进制程": "重大利好 - 需求爆发",
+        "AI 服务器": "重大利好 - 下游需求爆发",
+        "数据中心": "利好 - AI 基建需求",
+        "消费电子": "中性 - 主要影响数据中心",
+    },
+    "rubin": {
+        "GPU": "重大利好",
+        "HBM": "重大利好",
+        "CoWoS": "重大利好",
+        "先进制程": "重大利好",
+    },
+    
+    # ==================== Tesla/FSD 相关 ====================
+    "tesla": {
+        "激光雷达": "中性 - Tesla 坚持纯视觉方案",
+        "摄像头": "利好 - 纯视觉方案受益",
+        "毫米波雷达": "中性",
+        "AI 芯片": "重大利好 - FSD 芯片需求",
+        "算法": "重大利好 - FSD 进步",
+        "操作系统": "利好",
+        "线控底盘": "利好 - 自动驾驶需求",
+        "线控制动": "利好",
+        "线控转向": "利好",
+        "高精地图": "中性 - Tesla 不用高精地图",
+        "FSD": "重大利好",
+        "自动驾驶": "重大利好",
+    },
+    "fsd": {
+        "摄像头": "利好",
+        "AI 芯片": "重大利好",
+        "算法": "重大利好",
+        "操作系统": "利好",
+        "线控底盘": "利好",
+        "高精地图": "中性",
+    },
+    
+    # ==================== 台积电相关 ====================
+    "tsmc": {
+        "晶圆代工": "重大利好 - 全球龙头受益",
+        "先进制程": "重大利好 - 2nm 技术领先",
+        "成熟制程": "利好 - 产能利用率提升",
+        "光刻机": "重大利好 - ASML 受益",
+        "封装": "重大利好 - CoWoS 需求",
+        "测试": "利好",
+        "Chiplet": "利好",
+    },
+    "2nm": {
+        "晶圆代工": "重大利好",
+        "先进制程": "重大利好",
+        "光刻机": "重大利好",
+        "EUV": "重大利好",
+    },
+    
+    # ==================== OpenAI/GPT 相关 ====================
+    "openai": {
+        "AI 芯片": "重大利好 - 算力需求爆发",
+        "GPU": "重大利好 - NVIDIA 独家受益",
+        "大模型": "重大利好 - 技术进步",
+        "AI 服务器": "重大利好 - 下游需求",
+        "HBM": "利好 - 内存需求",
+        "数据中心": "重大利好",
+        "云计算": "重大利好 - 微软 Azure 受益",
+    },
+    "gpt": {
+        "AI 芯片": "重大利好",
+        "GPU": "重大利好",
+        "大模型": "重大利好",
+        "AI 服务器": "重大利好",
+    },
+    "100M": {
+        "HBM": "重大利好 - 大上下文需要大内存",
+        "AI 芯片": "重大利好",
+    },
+    
+    # ==================== 特朗普/关税相关 ====================
+    "trump": {
+        "半导体": "利空 - 关税影响出口",
+        "晶圆代工": "中性偏空 - 可能转移产能",
+        "设备": "利空 - 出口限制",
+        "材料": "利空",
+        "封装": "中性",
+    },
+    "关税": {
+        "半导体": "利空",
+        "出口": "利空",
+        "设备": "利空",
+        "材料": "利空",
+    },
+    "100%": {
+        "半导体": "重大利空",
+        "出口": "重大利空",
+    },
+    
+    # ==================== 通用规则 ====================
+    "量产": {
+        "GPU": "利好",
+        "芯片": "利好",
+        "电池": "利好",
+    },
+    "突破": {
+        "技术": "利好",
+        "制程": "利好",
+        "材料": "利好",
+    },
+}
+
+# 事件类型关键词（无精确规则时按事件类型推断）
+EVENT_TYPE_KEYWORDS = {
+    "重大利好": ["量产", "发布", "突破", "提前", "确认", "宣布"],
+    "利好": ["增长", "扩张", "升级", "合作", "签约"],
+    "利空": ["关税", "制裁", "限制", "禁令", "下滑"],
+    "中性": ["报告", "技术", "研究", "分析"],
+}
+
 def infer_impact_from_keyword(segment: str, keyword: str) -> str:
     """
     基于关键词推断产业链影响（当无实际新闻内容时）- 增强版
@@ -701,141 +895,16 @@ def infer_impact_from_keyword(segment: str, keyword: str) -> str:
     keyword_lower = keyword.lower()
     segment_lower = segment.lower()
     
-    # 预设的产业链影响逻辑（增强版）
-    impact_rules = {
-        # ==================== NVIDIA 相关 ====================
-        "nvidia": {
-            "GPU": "重大利好 - AI 芯片需求爆发",
-            "HBM": "重大利好 - HBM4 成为瓶颈，需求激增",
-            "CoWoS": "重大利好 - 先进封装产能紧张",
-            "Chiplet": "利好 - Chiplet 技术受益",
-            "光刻机": "利好 - 高端制程需求增加",
-            "刻蚀机": "利好 - 先进制程需求",
-            "薄膜沉积": "利好 - 制程升级需求",
-            "晶圆代工": "重大利好 - 台积电受益",
-            "先进制程": "重大利好 - 需求爆发",
-            "AI 服务器": "重大利好 - 下游需求爆发",
-            "数据中心": "利好 - AI 基建需求",
-            "消费电子": "中性 - 主要影响数据中心",
-        },
-        "rubin": {
-            "GPU": "重大利好",
-            "HBM": "重大利好",
-            "CoWoS": "重大利好",
-            "先进制程": "重大利好",
-        },
-        
-        # ==================== Tesla/FSD 相关 ====================
-        "tesla": {
-            "激光雷达": "中性 - Tesla 坚持纯视觉方案",
-            "摄像头": "利好 - 纯视觉方案受益",
-            "毫米波雷达": "中性",
-            "AI 芯片": "重大利好 - FSD 芯片需求",
-            "算法": "重大利好 - FSD 进步",
-            "操作系统": "利好",
-            "线控底盘": "利好 - 自动驾驶需求",
-            "线控制动": "利好",
-            "线控转向": "利好",
-            "高精地图": "中性 - Tesla 不用高精地图",
-            "FSD": "重大利好",
-            "自动驾驶": "重大利好",
-        },
-        "fsd": {
-            "摄像头": "利好",
-            "AI 芯片": "重大利好",
-            "算法": "重大利好",
-            "操作系统": "利好",
-            "线控底盘": "利好",
-            "高精地图": "中性",
-        },
-        
-        # ==================== 台积电相关 ====================
-        "tsmc": {
-            "晶圆代工": "重大利好 - 全球龙头受益",
-            "先进制程": "重大利好 - 2nm 技术领先",
-            "成熟制程": "利好 - 产能利用率提升",
-            "光刻机": "重大利好 - ASML 受益",
-            "封装": "重大利好 - CoWoS 需求",
-            "测试": "利好",
-            "Chiplet": "利好",
-        },
-        "2nm": {
-            "晶圆代工": "重大利好",
-            "先进制程": "重大利好",
-            "光刻机": "重大利好",
-            "EUV": "重大利好",
-        },
-        
-        # ==================== OpenAI/GPT 相关 ====================
-        "openai": {
-            "AI 芯片": "重大利好 - 算力需求爆发",
-            "GPU": "重大利好 - NVIDIA 独家受益",
-            "大模型": "重大利好 - 技术进步",
-            "AI 服务器": "重大利好 - 下游需求",
-            "HBM": "利好 - 内存需求",
-            "数据中心": "重大利好",
-            "云计算": "重大利好 - 微软 Azure 受益",
-        },
-        "gpt": {
-            "AI 芯片": "重大利好",
-            "GPU": "重大利好",
-            "大模型": "重大利好",
-            "AI 服务器": "重大利好",
-        },
-        "100M": {
-            "HBM": "重大利好 - 大上下文需要大内存",
-            "AI 芯片": "重大利好",
-        },
-        
-        # ==================== 特朗普/关税相关 ====================
-        "trump": {
-            "半导体": "利空 - 关税影响出口",
-            "晶圆代工": "中性偏空 - 可能转移产能",
-            "设备": "利空 - 出口限制",
-            "材料": "利空",
-            "封装": "中性",
-        },
-        "关税": {
-            "半导体": "利空",
-            "出口": "利空",
-            "设备": "利空",
-            "材料": "利空",
-        },
-        "100%": {
-            "半导体": "重大利空",
-            "出口": "重大利空",
-        },
-        
-        # ==================== 通用规则 ====================
-        "量产": {
-            "GPU": "利好",
-            "芯片": "利好",
-            "电池": "利好",
-        },
-        "突破": {
-            "技术": "利好",
-            "制程": "利好",
-            "材料": "利好",
-        },
-    }
-    
     # 多级匹配策略
     # 1. 精确匹配关键词
-    for rule_keyword, impacts in impact_rules.items():
+    for rule_keyword, impacts in IMPACT_RULES.items():
         if rule_keyword in keyword_lower:
             for seg_key, impact_desc in impacts.items():
                 if seg_key.lower() in segment_lower or segment_lower in seg_key.lower():
                     return impact_desc
     
     # 2. 基于事件类型推断（当无精确匹配时）
-    event_type_keywords = {
-        "重大利好": ["量产", "发布", "突破", "提前", "确认", "宣布"],
-        "利好": ["增长", "扩张", "升级", "合作", "签约"],
-        "利空": ["关税", "制裁", "限制", "禁令", "下滑"],
-        "中性": ["报告", "技术", "研究", "分析"],
-    }
-    
-    for impact_type, keywords in event_type_keywords.items():
+    for impact_type, keywords in EVENT_TYPE_KEYWORDS.items():
         if any(kw in keyword_lower for kw in keywords):
             # 基于环节类型给出具体描述
             if any(x in segment_lower for x in ["芯片", "GPU", "AI", "算力"]):
@@ -880,79 +949,91 @@ def generate_generic_chain_analysis(keyword: str, news_list: List[Dict]) -> List
     ]
 
 # ==================== 资本市场映射模块 ====================
+def match_companies(keyword: str) -> List[Dict[str, str]]:
+    """
+    从公司知识库匹配相关公司（按关键词缓存，返回副本）
+    1. 公司分类名与关键词互相包含 → 该分类全部公司
+    2. 关键词提到的细分环节、匹配到的领域 → 知识图谱查找（公司只出现在其分类所属领域内）
+    """
+    if keyword not in _COMPANY_MATCH_CACHE:
+        get_knowledge()
+        graph = KB_INDEXES.get("company_graph", {})
+        matched_companies = []
+        seen = set()
+        
+        def add(company_info: Dict, market: str, tech_keyword: str, relation: str = ""):
+            key = (market, company_info["code"])
+            if key in seen:
+                return
+            seen.add(key)
+            matched_companies.append({
+                "market": market,
+                "code": company_info["code"],
+                "name": company_info["name"],
+                "business": company_info["business"],
+                "position": company_info["position"],
+                "tech_keyword": tech_keyword,
+                "relation": relation,
+            })
+        
+        for tech_keyword, companies in COMPANY_KNOWLEDGE.items():
+            if tech_keyword in keyword or keyword in tech_keyword:
+                for market, company_list in companies.items():
+                    for company_info in company_list:
+                        add(company_info, market, tech_keyword)
+        
+        edges = []
+        for segment in graph.get("segments", {}):
+            if segment in keyword:
+                edges.extend(segment_companies(graph, segment))
+        # 关键词直接包含领域名时取最长的（"新能源汽车" 优先于 "新能源"），否则按模糊匹配
+        named_domains = [d for d in graph.get("domains", {}) if d in keyword]
+        matched_domain = max(named_domains, key=len) if named_domains else match_domain(keyword)[0]
+        if matched_domain:
+            edges.extend(domain_companies(graph, matched_domain))
+        for edge in edges:
+            add(edge, edge["market"], edge["category"], edge["relation"])
+        
+        _COMPANY_MATCH_CACHE[keyword] = matched_companies
+    
+    return [dict(c) for c in _COMPANY_MATCH_CACHE[keyword]]
+
 def map_to_stocks(keyword: str, chain_analysis: List[Dict]) -> Dict[str, List[Dict]]:
     """映射到资本市场标的（联网搜索版）"""
     log("正在映射资本市场标的...")
     
     market_mapping = {"A_shares": [], "HK_shares": [], "US_stocks": []}
-    keyword_lower = keyword.lower()
     
     # 1. 先从知识库匹配公司
-    matched_companies = []
-    
-    for tech_keyword, companies in COMPANY_KNOWLEDGE.items():
-        matched = False
-        
-        if tech_keyword in keyword:
-            matched = True
-        elif keyword in tech_keyword:
-            matched = True
-        else:
-            common_words = ["半导体", "AI", "芯片", "电池", "新能源", "自动驾驶", "光伏", "风电", "储能", "机器人", "量子", "6G", "通信", "航天", "低空"]
-            for word in common_words:
-                if word in tech_keyword and word in keyword_lower:
-                    matched = True
-                    break
-        
-        if matched:
-            for market, company_list in companies.items():
-                for company_info in company_list:
-                    matched_companies.append({
-                        "market": market,
-                        "code": company_info["code"],
-                        "name": company_info["name"],
-                        "business": company_info["business"],
-                        "position": company_info["position"],
-                        "tech_keyword": tech_keyword,
-                    })
+    matched_companies = match_companies(keyword)
     
     # 2. 针对每个公司联网搜索具体受益逻辑
     log(f"  知识库匹配到 {len(matched_companies)} 家公司，开始搜索受益逻辑...")
     
-    for company in matched_companies[:15]:  # 最多处理 15 家公司
+    for company in matched_companies[:DEPTH["max_companies"]]:  # 最多处理 N 家公司
         # 构建搜索查询
         search_query = f"{company['name']} {company['code']} {keyword} 受益 逻辑"
-        log(f"    搜索：{search_query}")
         
-        try:
-            cmd = ["uv", "run", "scripts/searxng.py", "search", search_query, "-n", "3", "--format", "json"]
-            result = subprocess.run(cmd, cwd=SEARXNG_DIR, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, timeout=20)
+        logic = ""
+        results = run_search(search_query, 3, 20)
+        if results is not None:
+            log(f"    搜索：{search_query}", "DEBUG")
+        
+        for r in (results or [])[:2]:
+            text = r.get("title", "") + " " + r.get("content", "")
             
-            logic = ""
-            if result.returncode == 0:
-                try:
-                    data = json.loads(result.stdout)
-                    results = data.get("results", [])[:2]
-                    
-                    for r in results:
-                        text = r.get("title", "") + " " + r.get("content", "")
-                        
-                        # 提取具体受益逻辑
-                        if any(kw in text for kw in ["供应链", "客户", "订单", "技术", "独家", "领先", "龙头", "受益"]):
-                            # 尝试提取具体描述
-                            if "台积电" in text and "供应链" in text:
-                                logic = f"进入台积电供应链，{company['business']}领域间接受益"
-                            elif "独家" in text or "唯一" in text:
-                                logic = f"国内{company['business']}独家/唯一供应商，直接受益"
-                            elif "龙头" in text or "领先" in text:
-                                logic = f"{company['position']}，{keyword}领域核心受益标的"
-                            elif "订单" in text or "合同" in text:
-                                logic = f"有相关订单/合同，{company['business']}业务直接受益"
-                            break
-                except json.JSONDecodeError:
-                    pass
-        except Exception:
-            pass
+            # 提取具体受益逻辑
+            if any(kw in text for kw in ["供应链", "客户", "订单", "技术", "独家", "领先", "龙头", "受益"]):
+                # 尝试提取具体描述
+                if "台积电" in text and "供应链" in text:
+                    logic = f"进入台积电供应链，{company['business']}领域间接受益"
+                elif "独家" in text or "唯一" in text:
+                    logic = f"国内{company['business']}独家/唯一供应商，直接受益"
+                elif "龙头" in text or "领先" in text:
+                    logic = f"{company['position']}，{keyword}领域核心受益标的"
+                elif "订单" in text or "合同" in text:
+                    logic = f"有相关订单/合同，{company['business']}业务直接受益"
+                break
         
         # 如果没有搜索到具体逻辑，使用默认逻辑
         if not logic:
@@ -990,6 +1071,11 @@ def map_to_stocks(keyword: str, chain_analysis: List[Dict]) -> Dict[str, List[Di
     
     return market_mapping
 
+# 股票代码提取（A 股 / 港股 / 美股）
+CN_STOCK_PATTERN = re.compile(r'([63]\d{5})')
+HK_STOCK_PATTERN = re.compile(r'(0\d{4})\.HK')
+US_STOCK_PATTERN = re.compile(r'\b([A-Z]{2,5})\b')
+
 def search_related_stocks_with_logic(keyword: str) -> Dict[str, List[Dict]]:
     """搜索相关股票并提取受益逻辑"""
     market_mapping = {"A_shares": [], "HK_shares": [], "US_stocks": []}
@@ -1001,53 +1087,46 @@ def search_related_stocks_with_logic(keyword: str) -> Dict[str, List[Dict]]:
     ]
     
     for query, market in queries:
-        try:
-            cmd = ["uv", "run", "scripts/searxng.py", "search", query, "-n", "5", "--format", "json"]
-            result = subprocess.run(cmd, cwd=SEARXNG_DIR, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, timeout=45)
+        results = run_search(query, 5, 45)
+        if results is None:
+            break
+        
+        for r in results[:5]:
+            title = r.get("title", "")
+            content = r.get("content", "")
+            text = title + " " + content
             
-            if result.returncode == 0:
-                try:
-                    data = json.loads(result.stdout)
-                    for r in data.get("results", [])[:5]:
-                        title = r.get("title", "")
-                        content = r.get("content", "")
-                        text = title + " " + content
-                        
-                        # 提取股票代码
-                        cn_match = re.search(r'([63]\d{5})', text)
-                        hk_match = re.search(r'(0\d{4})\.HK', text)
-                        us_match = re.search(r'\b([A-Z]{2,5})\b', text)
-                        
-                        code = ""
-                        name = title[:40]
-                        
-                        if cn_match and market == "A_shares":
-                            code = cn_match.group(1)
-                        elif hk_match and market == "HK_shares":
-                            code = hk_match.group(1) + ".HK"
-                        elif us_match and market == "US_stocks":
-                            code = us_match.group(1)
-                        
-                        if code:
-                            # 提取受益逻辑
-                            logic = f"{keyword}领域受益标的"
-                            if "龙头" in text:
-                                logic = f"{keyword}龙头，核心受益标的"
-                            elif "独家" in text or "唯一" in text:
-                                logic = f"国内{keyword}独家/唯一供应商"
-                            elif "供应链" in text:
-                                logic = f"进入{keyword}供应链，间接受益"
-                            
-                            market_mapping[market].append({
-                                "code": code,
-                                "name": name,
-                                "business_relevance": f"涉及{keyword}业务",
-                                "logic": logic,
-                            })
-                except json.JSONDecodeError:
-                    pass
-        except Exception as e:
-            log(f"搜索失败：{str(e)[:50]}")
+            # 提取股票代码
+            cn_match = CN_STOCK_PATTERN.search(text)
+            hk_match = HK_STOCK_PATTERN.search(text)
+            us_match = US_STOCK_PATTERN.search(text)
+            
+            code = ""
+            name = title[:40]
+            
+            if cn_match and market == "A_shares":
+                code = cn_match.group(1)
+            elif hk_match and market == "HK_shares":
+                code = hk_match.group(1) + ".HK"
+            elif us_match and market == "US_stocks":
+                code = us_match.group(1)
+            
+            if code:
+                # 提取受益逻辑
+                logic = f"{keyword}领域受益标的"
+                if "龙头" in text:
+                    logic = f"{keyword}龙头，核心受益标的"
+                elif "独家" in text or "唯一" in text:
+                    logic = f"国内{keyword}独家/唯一供应商"
+                elif "供应链" in text:
+                    logic = f"进入{keyword}供应链，间接受益"
+                
+                market_mapping[market].append({
+                    "code": code,
+                    "name": name,
+                    "business_relevance": f"涉及{keyword}业务",
+                    "logic": logic,
+                })
     
     return market_mapping
 
@@ -1062,65 +1141,59 @@ def search_related_stocks(keyword: str) -> Dict[str, List[Dict]]:
     ]
     
     for query in queries:
-        try:
-            cmd = ["uv", "run", "scripts/searxng.py", "search", query, "-n", "5", "--format", "json"]
-            result = subprocess.run(cmd, cwd=SEARXNG_DIR, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, timeout=60)
+        results = run_search(query, 5, 60)
+        if results is None:
+            break
+        
+        for r in results[:3]:
+            title = r.get("title", "")
+            url = r.get("url", "")
+            
+            # 简单提取股票代码（正则匹配）
+            cn_stock_match = CN_STOCK_PATTERN.search(title)
+            hk_stock_match = HK_STOCK_PATTERN.search(title)
+            us_stock_match = US_STOCK_PATTERN.search(title)
             
-            if result.returncode == 0:
-                try:
-                    data = json.loads(result.stdout)
-                    for r in data.get("results", [])[:3]:
-                        title = r.get("title", "")
-                        url = r.get("url", "")
-                        
-                        # 简单提取股票代码（正则匹配）
-                        cn_stock_match = re.search(r'([63]\d{5})', title)
-                        hk_stock_match = re.search(r'(0\d{4})\.HK', title)
-                        us_stock_match = re.search(r'\b([A-Z]{2,5})\b', title)
-                        
-                        if cn_stock_match and "A 股" in query:
-                            market_mapping["A_shares"].append({
-                                "code": cn_stock_match.group(1),
-                                "name": title[:30],
-                                "business_relevance": f"涉及{keyword}业务",
-                                "logic": "搜索结果显示相关",
-                            })
-                        elif hk_stock_match and "港股" in query:
-                            market_mapping["HK_shares"].append({
-                                "code": hk_stock_match.group(1) + ".HK",
-                                "name": title[:30],
-                                "business_relevance": f"涉及{keyword}业务",
-                                "logic": "搜索结果显示相关",
-                            })
-                        elif us_stock_match and "美股" in query:
-                            market_mapping["US_stocks"].append({
-                                "code": us_stock_match.group(1),
-                                "name": title[:30],
-                                "business_relevance": f"涉及{keyword}业务",
-                                "logic": "搜索结果显示相关",
-                            })
-                except json.JSONDecodeError:
-                    pass
-        except Exception:
-            pass
+            if cn_stock_match and "A 股" in query:
+                market_mapping["A_shares"].append({
+                    "code": cn_stock_match.group(1),
+                    "name": title[:30],
+                    "business_relevance": f"涉及{keyword}业务",
+                    "logic": "搜索结果显示相关",
+                })
+            elif hk_stock_match and "港股" in query:
+                market_mapping["HK_shares"].append({
+                    "code": hk_stock_match.group(1) + ".HK",
+                    "name": title[:30],
+                    "business_relevance": f"涉及{keyword}业务",
+                    "logic": "搜索结果显示相关",
+                })
+            elif us_stock_match and "美股" in query:
+                market_mapping["US_stocks"].append({
+                    "code": us_stock_match.group(1),
+                    "name": title[:30],
+                    "business_relevance": f"涉及{keyword}业务",
+                    "logic": "搜索结果显示相关",
+                })
     
     return market_mapping
 
 # ==================== 风险分析模块 ====================
-def analyze_risks(keyword: str, news_list: List[Dict]) -> List[str]:
+# 风险类别关键词
+RISK_KEYWORDS = {
+    "技术风险": ["技术路线", "良率", "研发失败", "技术壁垒"],
+    "市场风险": ["产能过剩", "需求下滑", "价格战", "竞争加剧"],
+    "政策风险": ["制裁", "出口限制", "政策变化", "监管"],
+    "财务风险": ["亏损", "债务", "现金流", "商誉"],
+}
+
+def analyze_risks(keyword: str, news_list: List[NewsItem]) -> List[str]:
     """分析风险因素"""
-    risk_keywords = {
-        "技术风险": ["技术路线", "良率", "研发失败", "技术壁垒"],
-        "市场风险": ["产能过剩", "需求下滑", "价格战", "竞争加剧"],
-        "政策风险": ["制裁", "出口限制", "政策变化", "监管"],
-        "财务风险": ["亏损", "债务", "现金流", "商誉"],
-    }
-    
     risks = []
     
-    for category, keywords in risk_keywords.items():
+    for category, keywords in RISK_KEYWORDS.items():
         for news in news_list:
-            text = (news["title"] + " " + news["content"]).lower()
+            text = news.text_lower
             if any(kw in text for kw in keywords):
                 risk_desc = f"{category}: 需关注相关新闻提及的风险因素"
                 if risk_desc not in risks:
@@ -1138,17 +1211,38 @@ def analyze_risks(keyword: str, news_list: List[Dict]) -> List[str]:
 
 # ==================== 报告生成模块 ====================
 def generate_report(keyword: str, news_list: List[Dict], chain_analysis: List[Dict], 
-                   market_mapping: Dict, risks: List[str]) -> str:
+                   market_mapping: Dict, risks: List[str], cache_info: Optional[Dict] = None,
+                   budget_info: Optional[Dict] = None) -> str:
     """生成结构化报告（增强版：FR-02/03/05/10）"""
     log("正在生成报告...")
     
     now = datetime.now().strftime("%Y-%m-%d %H:%M")
     
+    # 缓存命中时标注结果年龄
+    cache_line = ""
+    if cache_info:
+        cache_line = f"**结果缓存**: 复用 {optional_module('analysis_cache').format_cache_age(cache_info['age_seconds'])}的分析（新闻无新增）  \n"
+    
+    # 时间预算与降级标注
+    budget_line = ""
+    degraded = {}
+    if budget_info:
+        degraded = budget_info.get("degraded", {})
+        budget_line = f"**分析深度**: {budget_info['depth']}（预算 {budget_info['budget']:.0f} 秒，用时 {budget_info['elapsed']:.0f} 秒）  \n"
+        if degraded:
+            budget_line += f"**降级环节**: {'、'.join(STAGE_NAMES.get(s, s) for s in degraded)}（部分搜索因时间预算被跳过）  \n"
+    
+    def degraded_note(stage: str) -> str:
+        if stage not in degraded:
+            return ""
+        return f"> ⚠️ 降级输出：{degraded[stage]}，本节结果可能不完整\n\n"
+    
     # 增强分析（如果可用）
     enhanced_data = None
-    if ENHANCED_ANALYSIS_ENABLED and news_list:
+    enhanced_module = optional_module("enhanced_analysis") if news_list else None
+    if enhanced_module:
         try:
-            enhanced_data = comprehensive_verification(news_list, COMPANY_KNOWLEDGE)
+            enhanced_data = enhanced_module.comprehensive_verification(news_list, KB_INDEXES["company_graph"])
             log(f"增强分析完成：来源多样性={enhanced_data['verification']['diversity_score']}分")
         except Exception as e:
             log(f"增强分析失败：{str(e)[:100]}")
@@ -1181,7 +1275,7 @@ def generate_report(keyword: str, news_list: List[Dict], chain_analysis: List[Di
 
 **分析主题**: {keyword}  
 **报告时间**: {now}  
-**信息来源**: {event_source}
+{cache_line}{budget_line}**信息来源**: {event_source}
 {source_verification}
 ---
 
@@ -1191,11 +1285,11 @@ def generate_report(keyword: str, news_list: List[Dict], chain_analysis: List[Di
 
 **核心内容**: 基于最新搜索信息，对"{keyword}"相关事件进行产业链分析和资本市场映射。
 
----
+{degraded_note("search")}---
 
 ## 🔗 产业链利益链条分析
 
-"""
+{degraded_note("chain")}"""
     
     # 竞争格局分析（增强功能）
     if enhanced_data and enhanced_data.get("competition"):
@@ -1234,7 +1328,7 @@ def generate_report(keyword: str, news_list: List[Dict], chain_analysis: List[Di
 
 ## 📈 核心受益公司映射
 
-"""
+{degraded_note("stocks")}"""
     
     has_stocks = False
     
@@ -1334,16 +1428,122 @@ def generate_report(keyword: str, news_list: List[Dict], chain_analysis: List[Di
     return report
 
 # ==================== 主流程 ====================
+def analyze_keyword(keyword: str, budget: RunBudget, no_cache: bool = False, depth_name: str = "standard",
+                    report_suffix: str = "") -> Dict[str, Any]:
+    """
+    分析单个关键词并保存报告
+    返回：{"keyword", "report", "report_file"}
+    """
+    global BUDGET
+    BUDGET = budget
+    total_budget = budget.total_seconds
+    
+    log("=" * 50)
+    log(f"TechChain Insight - 科技链·热点透视")
+    log(f"分析主题：{keyword}")
+    log(f"分析深度：{depth_name}，时间预算：{f'{total_budget:.0f} 秒' if total_budget else '不限时'}")
+    log("=" * 50)
+    
+    # 每次分析开始时切换到最新知识库（长驻进程中编辑 companies.json 等无需重启）
+    refresh_knowledge()
+    
+    # 1. 搜索新闻
+    BUDGET.start_stage("search")
+    news_list = search_news(keyword)
+    
+    # 新闻集合无新增时直接复用上次分析结果
+    cached = None
+    cache_module = optional_module("analysis_cache")
+    if cache_module and not no_cache:
+        cached = cache_module.load_cached_analysis(CACHE_DIR, keyword, news_list, KB_VERSION, depth_name)
+    
+    if cached:
+        log(f"命中分析缓存（{cache_module.format_cache_age(cached['age_seconds'])}），跳过产业链/标的分析")
+        chain_analysis = cached["result"].get("chain_analysis", [])
+        market_mapping = cached["result"].get("market_mapping", {"A_shares": [], "HK_shares": [], "US_stocks": []})
+        risks = cached["result"].get("risks", [])
+    else:
+        # 2. 分析产业链（使用事件摘要）
+        BUDGET.start_stage("chain")
+        chain_analysis = analyze_industry_chain(keyword, news_list)
+        
+        # 3. 映射资本市场（使用事件摘要）
+        BUDGET.start_stage("stocks")
+        market_mapping = map_to_stocks(keyword, chain_analysis)
+        
+        # 4. 分析风险
+        risks = analyze_risks(keyword, news_list)
+        
+        # 降级结果不完整，不写入缓存
+        if BUDGET.degraded:
+            log(f"以下环节已降级：{'、'.join(BUDGET.degraded_names())}，本次结果不写入缓存")
+        elif cache_module:
+            try:
+                cache_module.save_cached_analysis(CACHE_DIR, keyword, news_list, {
+                    "chain_analysis": chain_analysis,
+                    "market_mapping": market_mapping,
+                    "risks": risks,
+                }, KB_VERSION, depth_name)
+            except Exception as e:
+                log(f"保存分析缓存失败：{str(e)[:100]}")
+    
+    # 5. 生成报告
+    BUDGET.start_stage("report")
+    budget_info = None
+    if BUDGET.limited:
+        budget_info = {
+            "depth": depth_name,
+            "budget": total_budget,
+            "elapsed": BUDGET.elapsed(),
+            "degraded": dict(BUDGET.degraded),
+        }
+    report = generate_report(keyword, news_list, chain_analysis, market_mapping, risks,
+                             cache_info=cached, budget_info=budget_info)
+    BUDGET.end_stage()
+    
+    # 6. 保存报告
+    report_file = SKILL_DIR / "reports" / f"techchain-{datetime.now().strftime('%Y%m%d-%H%M%S')}{report_suffix}.md"
+    report_file.parent.mkdir(parents=True, exist_ok=True)
+    if ARTIFACT_INDEX_ENABLED:
+        write_artifact(ARTIFACT_INDEX, TYPE_TECHCHAIN_REPORT, report_file, report, summary={
+            "keyword": keyword,
+            "news_count": len(news_list),
+            "chain_segments": len(chain_analysis),
+            "companies": sum(len(v) for v in market_mapping.values()),
+            "degraded": list(BUDGET.degraded),
+            "cached": bool(cached),
+        })
+    else:
+        with open(report_file, "w", encoding="utf-8") as f:
+            f.write(report)
+    log(f"报告已保存：{report_file}")
+    log(f"阶段耗时：{BUDGET.format_timings()}（总计 {BUDGET.elapsed():.1f}s）")
+    
+    return {"keyword": keyword, "report": report, "report_file": str(report_file)}
+
 def main():
     """主入口"""
     import argparse
     
     parser = argparse.ArgumentParser()
-    parser.add_argument("keyword", nargs="?", default="", help="关键词或新闻标题")
+    parser.add_argument("keywords", nargs="*", help="关键词或新闻标题（可传多个，批量分析共享知识库与搜索缓存）")
     parser.add_argument("--event-input", help="事件输入文件路径（来自 Scout）")
+    parser.add_argument("--no-cache", action="store_true", help="忽略分析结果缓存，强制重新分析")
+    parser.add_argument("--budget", type=float, default=None, help="每个关键词的时间预算（秒），预算将尽时跳过可选搜索并降级输出")
+    parser.add_argument("--depth", choices=list(DEPTH_PRESETS), default=None,
+                        help="分析深度：lite/standard/deep（未指定 --budget 时使用该深度的默认预算）")
     args = parser.parse_args()
     
-    keyword = args.keyword if args.keyword else "半导体"
+    keywords = [k for k in args.keywords if k.strip()] or ["半导体"]
+    batch = len(keywords) > 1
+    
+    # 时间预算：均未指定时不限时（保持原有行为）
+    global DEPTH
+    depth_name = args.depth or "standard"
+    DEPTH = dict(DEPTH_PRESETS[depth_name])
+    total_budget = args.budget
+    if total_budget is None and args.depth:
+        total_budget = DEPTH["budget"]
     
     # 读取事件输入（如果有）
     event_input = None
@@ -1356,50 +1556,46 @@ def main():
             log(f"加载事件输入失败：{e}")
     
     # 确保知识库加载
-    global INDUSTRY_CHAIN_KNOWLEDGE, COMPANY_KNOWLEDGE
-    INDUSTRY_CHAIN_KNOWLEDGE, COMPANY_KNOWLEDGE = load_knowledge_base()
-    log(f"知识库已加载：{len(INDUSTRY_CHAIN_KNOWLEDGE)} 个领域，{len(COMPANY_KNOWLEDGE)} 个公司分类")
+    refresh_knowledge()
+    log(f"知识库已加载：{len(INDUSTRY_CHAIN_KNOWLEDGE)} 个领域，{len(COMPANY_KNOWLEDGE)} 个公司分类（{KB_LOAD_SECONDS * 1000:.1f}ms）")
+    
+    if batch:
+        log(f"批量分析：{len(keywords)} 个关键词")
+    
+    failed = []
+    for i, keyword in enumerate(keywords):
+        try:
+            budget = RunBudget(total_budget)
+            if i == 0:
+                # 知识库只加载一次，计入第一个关键词的耗时
+                budget.record("kb_load", KB_LOAD_SECONDS)
+            result = analyze_keyword(keyword, budget, no_cache=args.no_cache, depth_name=depth_name,
+                                     report_suffix=f"-{i + 1}" if batch else "")
+        except Exception as e:
+            log(f"执行异常：{str(e)}")
+            import traceback
+            log(traceback.format_exc())
+            if not batch:
+                print(f"错误：{str(e)}")
+                sys.exit(1)
+            failed.append(keyword)
+            continue
+        
+        # 输出报告（批量模式下先输出分隔标记）
+        if batch:
+            print("\n" + format_batch_marker(keyword))
+        print("\n" + result["report"], flush=True)
+    
+    if batch:
+        log(f"批量分析完成：成功 {len(keywords) - len(failed)}/{len(keywords)}，搜索缓存命中 {SEARCH_CACHE_STATS['hits']} 次")
+        if failed:
+            log(f"失败关键词：{', '.join(failed)}")
     
     log("=" * 50)
-    log(f"TechChain Insight - 科技链·热点透视")
-    log(f"分析主题：{keyword}")
+    log("分析完成")
     log("=" * 50)
     
-    try:
-        # 1. 搜索新闻
-        news_list = search_news(keyword)
-        
-        # 2. 分析产业链（使用事件摘要）
-        chain_analysis = analyze_industry_chain(keyword, news_list)
-        
-        # 3. 映射资本市场（使用事件摘要）
-        market_mapping = map_to_stocks(keyword, chain_analysis)
-        
-        # 4. 分析风险
-        risks = analyze_risks(keyword, news_list)
-        
-        # 5. 生成报告
-        report = generate_report(keyword, news_list, chain_analysis, market_mapping, risks)
-        
-        # 6. 输出报告
-        print("\n" + report)
-        
-        # 7. 保存报告
-        report_file = SKILL_DIR / "reports" / f"techchain-{datetime.now().strftime('%Y%m%d-%H%M%S')}.md"
-        report_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(report_file, "w", encoding="utf-8") as f:
-            f.write(report)
-        log(f"报告已保存：{report_file}")
-        
-        log("=" * 50)
-        log("分析完成")
-        log("=" * 50)
-        
-    except Exception as e:
-        log(f"执行异常：{str(e)}")
-        import traceback
-        log(traceback.format_exc())
-        print(f"错误：{str(e)}")
+    if len(failed) == len(keywords):
         sys.exit(1)
 
 if __name__ == "__main__":
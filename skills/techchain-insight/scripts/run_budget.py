@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# =============================================================================
+# TechChain Insight - 运行时间预算
+# 功能：把总预算按阶段切分，预算将尽时跳过可选搜索，记录降级环节与各阶段耗时
+# =============================================================================
+
+import time
+from typing import Dict, List, Optional
+
+# 分析深度预设（--depth）
+DEPTH_PRESETS = {
+    "lite": {
+        "budget": 45,             # 总预算（秒）
+        "news_queries": 2,        # 新闻搜索查询数
+        "segments_per_stage": 2,  # 每个产业链环节分析的细分数
+        "segment_searches": 1,    # 每个细分的联网搜索次数
+        "max_companies": 5,       # 联网搜索受益逻辑的公司数
+    },
+    "standard": {
+        "budget": 110,
+        "news_queries": 4,
+        "segments_per_stage": 5,
+        "segment_searches": 5,
+        "max_companies": 15,
+    },
+    "deep": {
+        "budget": 600,
+        "news_queries": 6,
+        "segments_per_stage": 8,
+        "segment_searches": 5,
+        "max_companies": 25,
+    },
+}
+
+# 各阶段预算占比（未用完的时间顺延给后续阶段）
+STAGE_SHARES = {
+    "search": 0.25,   # 新闻搜索
+    "chain": 0.40,    # 产业链分析
+    "stocks": 0.30,   # 资本市场映射
+    "report": 0.05,   # 报告生成
+}
+
+# 阶段显示名称
+STAGE_NAMES = {
+    "kb_load": "知识库加载",
+    "search": "新闻搜索",
+    "chain": "产业链分析",
+    "stocks": "标的映射",
+    "report": "报告生成",
+}
+
+# 阶段剩余时间低于该值时不再发起可选搜索
+MIN_SEARCH_SECONDS = 5
+
+class RunBudget:
+    """
+    单次分析的时间预算
+
+    total_seconds 为 None 时不限时，只记录各阶段耗时
+    """
+
+    def __init__(self, total_seconds: Optional[float] = None):
+        self.total_seconds = total_seconds
+        self.started = time.monotonic()
+        self.stage: Optional[str] = None
+        self.stage_started = 0.0
+        self.stage_deadline: Optional[float] = None
+        self.timings: Dict[str, float] = {}
+        self.degraded: Dict[str, str] = {}
+
+    @property
+    def limited(self) -> bool:
+        return self.total_seconds is not None
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def remaining(self) -> float:
+        """总预算剩余秒数（不限时返回无穷大）"""
+        if not self.limited:
+            return float("inf")
+        return max(0.0, self.total_seconds - self.elapsed())
+
+    def start_stage(self, name: str):
+        """进入新阶段：按剩余总预算和后续阶段占比计算本阶段截止时间"""
+        self.end_stage()
+        self.stage = name
+        self.stage_started = time.monotonic()
+        if not self.limited or name not in STAGE_SHARES:
+            self.stage_deadline = None
+            return
+
+        stages = list(STAGE_SHARES)
+        pending = stages[stages.index(name):]
+        share = STAGE_SHARES[name] / sum(STAGE_SHARES[s] for s in pending)
+        self.stage_deadline = self.stage_started + self.remaining() * share
+
+    def end_stage(self):
+        """结束当前阶段并记录耗时"""
+        if self.stage:
+            self.timings[self.stage] = self.timings.get(self.stage, 0.0) + time.monotonic() - self.stage_started
+        self.stage = None
+        self.stage_deadline = None
+
+    def record(self, name: str, seconds: float):
+        """记录不属于预算阶段的耗时（如知识库加载）"""
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    def stage_remaining(self) -> float:
+        if self.stage_deadline is None:
+            return self.remaining()
+        return max(0.0, min(self.stage_deadline - time.monotonic(), self.remaining()))
+
+    def allow_optional(self) -> bool:
+        """是否还有时间发起可选搜索"""
+        return self.stage_remaining() >= MIN_SEARCH_SECONDS
+
+    def clamp_timeout(self, timeout: float) -> float:
+        """把单次搜索超时限制在阶段剩余时间内（至少保留 MIN_SEARCH_SECONDS）"""
+        if not self.limited:
+            return timeout
+        return max(MIN_SEARCH_SECONDS, min(timeout, self.stage_remaining()))
+
+    def mark_degraded(self, reason: str, stage: Optional[str] = None):
+        """标记某阶段被降级（同一阶段只记录第一次原因）"""
+        stage = stage or self.stage
+        if stage and stage not in self.degraded:
+            self.degraded[stage] = reason
+
+    def degraded_names(self) -> List[str]:
+        return [STAGE_NAMES.get(s, s) for s in self.degraded]
+
+    def format_timings(self) -> str:
+        return ", ".join(f"{STAGE_NAMES.get(k, k)}={v:.1f}s" for k, v in self.timings.items())
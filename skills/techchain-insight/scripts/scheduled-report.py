@@ -8,6 +8,8 @@
 
 import os
 import sys
+import logging
+import re
 import json
 import subprocess
 from datetime import datetime, timedelta
@@ -19,9 +21,13 @@ SKILL_DIR = WORKSPACE / "skills" / "techchain-insight"
 EMAIL_SENDER_DIR = WORKSPACE / "skills" / "email-sender"
 LOG_FILE = SKILL_DIR / "logs" / "scheduled-report.log"
 REPORT_DIR = SKILL_DIR / "reports" / "scheduled"
+ARTIFACT_INDEX = WORKSPACE / "data" / "artifact-index.json"  # 产出物索引（两个技能共用）
 
 EMAIL_TO = os.getenv('TECHCHAIN_REPORT_EMAIL', 'recipient@example.com')  # 使用环境变量，带默认值
 
+# 单主题分析时间预算（秒），留出余量保证在子进程超时前输出降级报告
+ANALYSIS_BUDGET_SECONDS = 100
+
 # 监控的热点主题（每次随机选择 3-5 个分析）
 HOT_TOPICS = [
     "固态电池 最新进展",
@@ -38,14 +44,96 @@ HOT_TOPICS = [
     "合成生物 制造",
 ]
 
+# ==================== 共享模块 ====================
+# 共享模块位于 techpulse-scout/scripts
+SHARED_SCRIPTS_DIR = Path(__file__).resolve().parent.parent.parent / "techpulse-scout" / "scripts"
+if str(SHARED_SCRIPTS_DIR) not in sys.path:
+    sys.path.append(str(SHARED_SCRIPTS_DIR))
+
+from log_config import setup_logger, LOG_LEVELS
+from batch_marker import split_batch_output
+
+try:
+    from artifact_index import write_artifact, TYPE_SCHEDULED_REPORT
+    ARTIFACT_INDEX_ENABLED = True
+except ImportError:
+    ARTIFACT_INDEX_ENABLED = False
+
 # ==================== 日志函数 ====================
-def log(message: str):
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    log_msg = f"[{timestamp}] {message}"
-    print(log_msg)
-    LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(log_msg + "\n")
+LOGGER = setup_logger("scheduled_report", LOG_FILE)
+
+def log(message: str, level: str = "INFO"):
+    LOGGER.log(LOG_LEVELS.get(level, logging.INFO), message)
+
+# ==================== 提取报告摘要 ====================
+def summarize_output(topic: str, output: str) -> dict:
+    """从 main.py 输出的报告中提取关键信息"""
+    summary = {
+        "topic": topic,
+        "success": True,
+        "full_report": output,  # 完整报告
+        "companies_count": 0,
+        "high_cred_count": 0,
+    }
+    
+    # 统计公司数量
+    if "A 股" in output:
+        summary["companies_count"] += output.count("| 代码 |")
+    if "高可信度" in output:
+        summary["high_cred_count"] = output.count("`可信度：")
+    
+    # 提取产业链亮点
+    if "重大利好" in output:
+        summary["highlight"] = "重大利好"
+    elif "利好" in output:
+        summary["highlight"] = "利好"
+    else:
+        summary["highlight"] = "中性"
+    
+    # 分析结果来自缓存时记录缓存年龄
+    cache_match = re.search(r"\*\*结果缓存\*\*: 复用 (.+?)的分析", output)
+    if cache_match:
+        summary["cache_age"] = cache_match.group(1)
+    
+    return summary
+
+# ==================== 批量分析（单进程） ====================
+def analyze_topics_batch(topics: list) -> dict:
+    """
+    一次调用 main.py 分析全部主题（共享知识库与搜索缓存）
+    返回：{主题: 摘要}，未产出报告的主题不在结果中
+    """
+    log(f"  批量分析：{len(topics)} 个主题...")
+    
+    try:
+        cmd = ["python3", "scripts/main.py", *topics, "--budget", str(ANALYSIS_BUDGET_SECONDS)]
+        result = subprocess.run(
+            cmd,
+            cwd=SKILL_DIR,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            timeout=120 * len(topics)
+        )
+        stdout = result.stdout
+    except subprocess.TimeoutExpired as e:
+        # 超时前已输出的报告仍然可用
+        log(f"    批量分析超时，使用已完成部分")
+        stdout = e.stdout or ""
+        if isinstance(stdout, bytes):
+            stdout = stdout.decode("utf-8", errors="ignore")
+    except Exception as e:
+        log(f"    批量分析异常：{str(e)[:100]}")
+        return {}
+    
+    # 按分隔标记拆分输出
+    summaries = {}
+    for topic, output in split_batch_output(stdout):
+        if topic in topics:
+            summaries[topic] = summarize_output(topic, output)
+    
+    log(f"    批量分析完成：{len(summaries)}/{len(topics)} 个主题产出报告")
+    return summaries
 
 # ==================== 分析单个主题（完整版） ====================
 def analyze_topic(topic: str) -> dict:
@@ -53,7 +141,7 @@ def analyze_topic(topic: str) -> dict:
     log(f"  分析：{topic}...")
     
     try:
-        cmd = ["python3", "scripts/main.py", topic]
+        cmd = ["python3", "scripts/main.py", topic, "--budget", str(ANALYSIS_BUDGET_SECONDS)]
         result = subprocess.run(
             cmd,
             cwd=SKILL_DIR,
@@ -64,32 +152,7 @@ def analyze_topic(topic: str) -> dict:
         )
         
         if result.returncode == 0:
-            output = result.stdout
-            
-            # 提取关键信息
-            summary = {
-                "topic": topic,
-                "success": True,
-                "full_report": output,  # 完整报告
-                "companies_count": 0,
-                "high_cred_count": 0,
-            }
-            
-            # 统计公司数量
-            if "A 股" in output:
-                summary["companies_count"] += output.count("| 代码 |")
-            if "高可信度" in output:
-                summary["high_cred_count"] = output.count("`可信度：")
-            
-            # 提取产业链亮点
-            if "重大利好" in output:
-                summary["highlight"] = "重大利好"
-            elif "利好" in output:
-                summary["highlight"] = "利好"
-            else:
-                summary["highlight"] = "中性"
-            
-            return summary
+            return summarize_output(topic, result.stdout)
         else:
             log(f"    失败：{result.stderr[:100]}")
             return {"topic": topic, "success": False, "error": result.stderr[:200]}
@@ -139,7 +202,8 @@ def generate_full_report(analyses: list) -> str:
             full = analysis["full_report"]
             
             # 添加主题标题
-            report += f"\n---\n\n### {i}. {analysis['topic']} - {analysis.get('highlight', '中性')}\n\n"
+            cache_note = f"（缓存：{analysis['cache_age']}）" if analysis.get("cache_age") else ""
+            report += f"\n---\n\n### {i}. {analysis['topic']} - {analysis.get('highlight', '中性')}{cache_note}\n\n"
             
             # 提取产业链分析部分
             chain_start = full.find("## 🔗 产业链")
@@ -278,10 +342,11 @@ def main():
         selected_topics = HOT_TOPICS  # 分析全部主题
         log(f"本次分析主题：{len(selected_topics)} 个热点（全覆盖）")
         
-        # 分析每个主题
+        # 批量分析全部主题，未产出报告的主题逐个重试
+        batch_results = analyze_topics_batch(selected_topics)
         analyses = []
         for topic in selected_topics:
-            result = analyze_topic(topic)
+            result = batch_results.get(topic) or analyze_topic(topic)
             analyses.append(result)
         
         # 生成完整报告
@@ -289,8 +354,14 @@ def main():
         
         # 保存报告
         report_file = REPORT_DIR / f"report-{datetime.now().strftime('%Y%m%d-%H%M')}.md"
-        with open(report_file, "w", encoding="utf-8") as f:
-            f.write(report_content)
+        if ARTIFACT_INDEX_ENABLED:
+            write_artifact(ARTIFACT_INDEX, TYPE_SCHEDULED_REPORT, report_file, report_content, summary={
+                "topics": len(analyses),
+                "succeeded": sum(1 for a in analyses if a.get("success")),
+            })
+        else:
+            with open(report_file, "w", encoding="utf-8") as f:
+                f.write(report_content)
         log(f"报告已保存：{report_file}")
         
         # 发送邮件
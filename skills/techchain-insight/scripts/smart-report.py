@@ -7,6 +7,8 @@
 
 import os
 import sys
+import logging
+import re
 import json
 import subprocess
 from datetime import datetime, timedelta
@@ -20,21 +22,70 @@ EMAIL_SENDER_DIR = WORKSPACE / "skills" / "email-sender"
 LOG_FILE = SKILL_DIR / "logs" / "smart-report.log"
 REPORT_DIR = SKILL_DIR / "reports" / "smart"
 HOTSPOTS_DIR = SKILL_DIR / "hotspots"
+ARTIFACT_INDEX = WORKSPACE / "data" / "artifact-index.json"  # 产出物索引（两个技能共用）
 
 EMAIL_TO = os.getenv('TECHCHAIN_REPORT_EMAIL', 'recipient@example.com')  # 使用环境变量，带默认值
 
+# 单主题分析时间预算（秒），留出余量保证在子进程超时前输出降级报告
+ANALYSIS_BUDGET_SECONDS = 100
+
+# 最新热点报告在该时间内（分钟）直接复用，不再重新扫描（工作流 Scout 阶段会顺带生成热点报告）
+HOTSPOT_REUSE_MINUTES = 120
+
+# ==================== 共享模块 ====================
+# 共享模块位于 techpulse-scout/scripts
+SHARED_SCRIPTS_DIR = Path(__file__).resolve().parent.parent.parent / "techpulse-scout" / "scripts"
+if str(SHARED_SCRIPTS_DIR) not in sys.path:
+    sys.path.append(str(SHARED_SCRIPTS_DIR))
+
+from log_config import setup_logger, LOG_LEVELS
+
+try:
+    from artifact_index import write_artifact, latest_artifact, TYPE_HOTSPOTS, TYPE_SMART_REPORT
+    ARTIFACT_INDEX_ENABLED = True
+except ImportError:
+    ARTIFACT_INDEX_ENABLED = False
+
 # ==================== 日志函数 ====================
-def log(message: str):
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    log_msg = f"[{timestamp}] {message}"
-    print(log_msg)
-    LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(log_msg + "\n")
+LOGGER = setup_logger("smart_report", LOG_FILE)
+
+def log(message: str, level: str = "INFO"):
+    LOGGER.log(LOG_LEVELS.get(level, logging.INFO), message)
 
 # ==================== 运行热点捕捉 ====================
+def load_latest_hotspots() -> Dict:
+    """读取最新的热点报告（优先查产出物索引），没有时返回空字典"""
+    latest = None
+    entry = latest_artifact(ARTIFACT_INDEX, TYPE_HOTSPOTS) if ARTIFACT_INDEX_ENABLED else None
+    if entry:
+        latest = Path(entry["path"])
+    else:
+        hotspots_files = list(HOTSPOTS_DIR.glob("hotspots-*.json"))
+        if hotspots_files:
+            latest = max(hotspots_files, key=lambda p: p.stat().st_mtime)
+    if not latest:
+        return {}
+    with open(latest, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def is_hotspots_fresh(hotspot_data: Dict) -> bool:
+    """热点报告是否在复用时间窗内"""
+    try:
+        scan_time = datetime.strptime(hotspot_data["scan_time"], "%Y-%m-%d %H:%M")
+    except (KeyError, ValueError):
+        return False
+    return datetime.now() - scan_time <= timedelta(minutes=HOTSPOT_REUSE_MINUTES)
+
 def run_hotspot_scanner() -> Dict:
-    """运行热点捕捉技能"""
+    """运行热点捕捉技能（最近已有热点报告时直接复用）"""
+    try:
+        hotspot_data = load_latest_hotspots()
+        if is_hotspots_fresh(hotspot_data):
+            log(f"复用 {hotspot_data['scan_time']} 的热点报告：{hotspot_data.get('hotspots_found', 0)}个热点")
+            return hotspot_data
+    except Exception as e:
+        log(f"读取热点报告失败：{str(e)[:100]}")
+    
     log("正在运行热点捕捉技能...")
     
     try:
@@ -42,12 +93,8 @@ def run_hotspot_scanner() -> Dict:
         result = subprocess.run(cmd, cwd=SKILL_DIR, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, timeout=300)
         
         if result.returncode == 0:
-            # 查找最新的热点文件
-            hotspots_files = list(HOTSPOTS_DIR.glob("hotspots-*.json"))
-            if hotspots_files:
-                latest = max(hotspots_files, key=lambda p: p.stat().st_mtime)
-                with open(latest, 'r', encoding='utf-8') as f:
-                    hotspot_data = json.load(f)
+            hotspot_data = load_latest_hotspots()
+            if hotspot_data:
                 log(f"热点捕捉完成：发现{hotspot_data.get('hotspots_found', 0)}个热点")
                 return hotspot_data
             else:
@@ -67,7 +114,7 @@ def analyze_hotspot(topic: str) -> Dict:
     log(f"  深度分析：{topic}...")
     
     try:
-        cmd = ["python3", "scripts/main.py", topic]
+        cmd = ["python3", "scripts/main.py", topic, "--budget", str(ANALYSIS_BUDGET_SECONDS)]
         result = subprocess.run(cmd, cwd=SKILL_DIR, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, timeout=120)
         
         if result.returncode == 0:
@@ -86,6 +133,11 @@ def analyze_hotspot(topic: str) -> Dict:
             elif "利好" in output:
                 summary["highlight"] = "利好"
             
+            # 分析结果来自缓存时记录缓存年龄
+            cache_match = re.search(r"\*\*结果缓存\*\*: 复用 (.+?)的分析", output)
+            if cache_match:
+                summary["cache_age"] = cache_match.group(1)
+            
             return summary
         else:
             log(f"    失败：{result.stderr[:100]}")
@@ -136,7 +188,8 @@ def generate_smart_report(hotspot_data: Dict, analyses: List[Dict]) -> str:
         if analysis.get("success") and analysis.get("full_report"):
             full = analysis["full_report"]
             
-            report += f"\n---\n\n### {i}. {analysis['topic']} - {analysis.get('highlight', '中性')}\n\n"
+            cache_note = f"（缓存：{analysis['cache_age']}）" if analysis.get("cache_age") else ""
+            report += f"\n---\n\n### {i}. {analysis['topic']} - {analysis.get('highlight', '中性')}{cache_note}\n\n"
             
             # 提取产业链
             chain_start = full.find("## 🔗 产业链")
@@ -243,8 +296,14 @@ def main():
         
         # 4. 保存报告
         report_file = REPORT_DIR / f"smart-report-{datetime.now().strftime('%Y%m%d-%H%M')}.md"
-        with open(report_file, "w", encoding="utf-8") as f:
-            f.write(report_content)
+        if ARTIFACT_INDEX_ENABLED:
+            write_artifact(ARTIFACT_INDEX, TYPE_SMART_REPORT, report_file, report_content, summary={
+                "hotspots_found": hotspot_data.get("hotspots_found", 0),
+                "analyzed": len(analyses),
+            })
+        else:
+            with open(report_file, "w", encoding="utf-8") as f:
+                f.write(report_content)
         log(f"报告已保存：{report_file}")
         
         # 5. 发送邮件
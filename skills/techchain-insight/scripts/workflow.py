@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+# =============================================================================
+# TechChain Workflow - 两阶段工作流（Python 流水线版，取代 workflow.sh）
+# 流程：Skill A (TechPulse Scout) → 决策 → Skill B (TechChain Insight) → 邮件
+# 特性：各阶段在进程内以函数执行，按运行 ID 保存检查点，可从断点续跑
+# 执行频率：每 2 小时
+# 退出码：0 = 完成，或 Scout 阶段失败且已发送无事件通知（与原 workflow.sh 一致）；
+#         1 = 其余阶段失败（可用 --resume 续跑）
+# =============================================================================
+
+import sys
+import logging
+import json
+import time
+import argparse
+import importlib.util
+from functools import partial
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+# ==================== 配置区域 ====================
+WORKSPACE = Path("/home/admin/.openclaw/workspace")
+SCOUT_DIR = WORKSPACE / "skills" / "techpulse-scout"
+SKILL_DIR = WORKSPACE / "skills" / "techchain-insight"
+LOG_FILE = WORKSPACE / "logs" / "workflow-cron.log"
+RUNS_DIR = SKILL_DIR / "runs"
+
+# 失败后已做过处理（发送无事件通知）的阶段，进程仍以 0 退出，不触发定时任务告警
+HANDLED_FAILURE_STAGES = {"scout"}
+
+# Scout 扫描失败后等待事件流消费者结束的最长时间（秒），超时不再等待后台分析
+STREAM_STOP_TIMEOUT = 30
+
+# 共享模块位于 techpulse-scout/scripts
+SHARED_SCRIPTS_DIR = Path(__file__).resolve().parent.parent.parent / "techpulse-scout" / "scripts"
+if str(SHARED_SCRIPTS_DIR) not in sys.path:
+    sys.path.append(str(SHARED_SCRIPTS_DIR))
+
+from log_config import setup_logger, LOG_LEVELS
+from topic_engine import TopicScanEngine, merge_topics
+
+# ==================== 日志函数 ====================
+LOGGER = setup_logger("workflow", LOG_FILE)
+
+def log(message: str, level: str = "INFO"):
+    LOGGER.log(LOG_LEVELS.get(level, logging.INFO), message)
+
+# ==================== 模块加载 ====================
+_MODULES: Dict[str, Any] = {}
+
+def load_module(name: str, path: Path):
+    """按文件路径加载脚本模块（支持 event-driven-analyzer.py 这类带连字符的文件名）"""
+    if name in _MODULES:
+        return _MODULES[name]
+
+    # 让脚本内的同目录导入（如 nitter_health_check）可用
+    if str(path.parent) not in sys.path:
+        sys.path.insert(0, str(path.parent))
+
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    _MODULES[name] = module
+    return module
+
+def get_scout():
+    return load_module("scout", SCOUT_DIR / "scripts" / "scout.py")
+
+def get_analyzer():
+    return load_module("event_driven_analyzer", SKILL_DIR / "scripts" / "event-driven-analyzer.py")
+
+def get_hotspot_scanner():
+    return load_module("hotspot_scanner", SKILL_DIR / "scripts" / "hotspot-scanner.py")
+
+def get_archiver():
+    return load_module("archiver", SKILL_DIR / "scripts" / "archiver.py")
+
+# ==================== 检查点 ====================
+def write_json_atomic(path: Path, data: Any):
+    """先写临时文件再替换，保证检查点不会半写"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    tmp_path.replace(path)
+
+def read_json(path: Path) -> Any:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def new_run_state(run_id: str) -> Dict:
+    return {
+        "run_id": run_id,
+        "status": "running",
+        "started_at": datetime.now().isoformat(),
+        "finished_at": "",
+        "stages": {},
+    }
+
+def find_resumable_run() -> Optional[str]:
+    """查找最近一次未完成的运行"""
+    if not RUNS_DIR.exists():
+        return None
+    for run_dir in sorted(RUNS_DIR.iterdir(), reverse=True):
+        state_file = run_dir / "state.json"
+        if not state_file.exists():
+            continue
+        try:
+            if read_json(state_file).get("status") != "completed":
+                return run_dir.name
+        except Exception:
+            continue
+    return None
+
+# ==================== 通知 ====================
+def send_notification(subject: str, message: str):
+    """发送简短通知（失败不影响流程）"""
+    try:
+        if not get_analyzer().send_email(message, subject=subject):
+            log("⚠️ 邮件发送失败（非致命）")
+    except Exception as e:
+        log(f"⚠️ 邮件发送失败（非致命）：{str(e)[:100]}")
+
+def send_no_event_notification():
+    """发送无事件通知（Scout 未产出）"""
+    message = f"""🔍 科技热点监控汇报
+
+时间：{datetime.now().strftime('%Y-%m-%d %H:%M')}
+状态：Scout 未产出事件
+原因：数据源可能暂时不可用
+
+下次检查：2 小时后"""
+    send_notification(f"【科技热点监控】无事件汇报 - {datetime.now().strftime('%m-%d %H:%M')}", message)
+    log("📧 无事件通知已发送")
+
+def send_brief_notification(event_count: int):
+    """发送简短汇报（无 High/Medium 事件）"""
+    message = f"""🔍 科技热点监控汇报
+
+时间：{datetime.now().strftime('%Y-%m-%d %H:%M')}
+扫描结果：发现 {event_count} 个事件
+评级：无 High/Medium 级别事件
+操作：已跳过深度分析
+
+说明：当前事件重要性不足，无需特别关注。
+下次检查：2 小时后"""
+    send_notification(f"【科技热点监控】简短汇报 - {datetime.now().strftime('%m-%d %H:%M')}", message)
+    log(f"📧 简短汇报已发送（{event_count} 个事件）")
+
+# ==================== 流水线阶段 ====================
+def stage_scout(ctx: Dict) -> Dict:
+    """
+    阶段 1：TechPulse Scout 热点捕捉 + 主题热度评分
+    Scout 领域与到期的热点扫描主题合并为一轮搜索（同名主题只搜一次），结果分别交给两边处理；
+    热点评分按 Scout 实际取结果的结果位数折算新闻条数，与独立扫描的评分、基线口径一致；
+    扫描同时在后台消费事件流，HIGH 事件不等全部领域扫描完即开始深度分析
+    """
+    from nitter_health_check import refresh_status, best_source_from_status
+
+    scout = get_scout()
+    hotspot = get_hotspot_scanner()
+    best_source = best_source_from_status(refresh_status())
+    due = hotspot.due_topics()
+    result_slots: Dict[str, int] = {}
+    engine = TopicScanEngine(
+        merge_topics({"scout": scout.MONITORED_DOMAINS,
+                      "hotspot": {t: kw for t, kw in hotspot.MONITORED_TOPICS.items() if t in due}}),
+        {"scout": partial(scout.collect_domain, best_source=best_source, slots=result_slots),
+         "hotspot": hotspot.search_topic_news},
+        workers=scout.SCAN_WORKERS,
+    )
+    # 清掉同名旧流文件，避免消费者读到上一次运行的汇总记录
+    if scout.STREAM_FILE.exists():
+        scout.STREAM_FILE.unlink()
+    consumer = get_analyzer().StreamConsumer(scout.STREAM_FILE)
+    consumer.start()
+    try:
+        output = scout.run_scan(topic_news=engine.scan(), best_source=best_source)
+    except BaseException:
+        # 事件流可能没有创建成功、不会写入失败汇总：主动停止消费者，限时等待
+        consumer.stop()
+        consumer.join(STREAM_STOP_TIMEOUT)
+        raise
+    # 汇总记录已写入，消费者处理完进行中的分析后结束
+    consumer.join()
+    if consumer.completed:
+        log(f"扫描期间已完成 {len(consumer.completed)} 个 HIGH 事件的深度分析")
+    stats = engine.stats()
+    log(f"主题扫描：共 {stats['topics']} 个主题，{stats['shared_topics']} 个与热点评分共用"
+        f"（热点主题到期 {len(due)}/{len(hotspot.MONITORED_TOPICS)} 个）")
+
+    # 热点评分失败不影响事件分析（smart-report 会在报告缺失时自行扫描）
+    hotspots_found = None
+    try:
+        hotspots_found = hotspot.run_hotspot_scan(topic_news=engine.news_for("hotspot"), topic_slots=result_slots)["hotspots_found"]
+    except Exception as e:
+        log(f"⚠️ 热点评分失败：{str(e)[:100]}", "WARNING")
+    return {
+        "hotspots_file": str(hotspot.OUTPUT_FILE) if hotspots_found is not None else None,
+        "hotspots_found": hotspots_found,
+        "events_file": str(scout.OUTPUT_FILE),
+        "stream_file": str(scout.STREAM_FILE),
+        "output": output,
+        "early_analyses": consumer.completed,
+    }
+
+def stage_decide(ctx: Dict) -> Dict:
+    """阶段 2：决定是否触发 TechChain Insight"""
+    output = ctx["scout"]["output"]
+    return {
+        "trigger": bool(output.get("trigger_techchain")),
+        "event_count": len(output.get("events", [])),
+        "total_events": output.get("total_events", 0),
+    }
+
+def stage_analyze(ctx: Dict) -> Dict:
+    """阶段 3：事件驱动深度分析"""
+    if not ctx["decide"]["trigger"]:
+        log("❌ 无 High/Medium 事件，跳过深度分析")
+        return {"skipped": True}
+
+    log("✅ 发现 High/Medium 事件，触发 TechChain Insight...")
+    result = get_analyzer().analyze_scout_output(ctx["scout"]["output"], completed=ctx["scout"].get("early_analyses"))
+    return result or {"skipped": True}
+
+def stage_notify(ctx: Dict) -> Dict:
+    """阶段 4：发送报告或简短汇报"""
+    report_file = ctx["analyze"].get("report_file")
+    if not report_file:
+        send_brief_notification(ctx["decide"]["total_events"])
+        return {"type": "brief"}
+
+    # 续跑时报告可能已被归档压缩，按索引中的新路径读取
+    if not Path(report_file).exists():
+        entry = get_archiver().find_archived(report_file)
+        if not entry:
+            raise RuntimeError(f"报告文件不存在：{report_file}")
+        report_file = entry
+    content = get_archiver().read_artifact(report_file)
+    # 报告邮件失败视为阶段失败，续跑时只需重发邮件
+    if not get_analyzer().send_email(content):
+        raise RuntimeError("深度报告邮件发送失败")
+    return {"type": "report", "report_file": report_file}
+
+STAGES: List[tuple] = [
+    ("scout", stage_scout),
+    ("decide", stage_decide),
+    ("analyze", stage_analyze),
+    ("notify", stage_notify),
+]
+
+# ==================== 流水线执行 ====================
+def run_pipeline(run_id: str, resume: bool = False) -> Dict:
+    """执行（或续跑）一次流水线，返回运行状态（status 为 completed / failed，失败时含 failed_stage）"""
+    run_dir = RUNS_DIR / run_id
+    state_file = run_dir / "state.json"
+
+    if resume and state_file.exists():
+        state = read_json(state_file)
+        state["status"] = "running"
+        state.pop("failed_stage", None)
+        log(f"续跑运行：{run_id}")
+    else:
+        state = new_run_state(run_id)
+        log(f"新运行：{run_id}")
+
+    ctx: Dict[str, Any] = {}
+    for name, func in STAGES:
+        stage_state = state["stages"].get(name, {})
+        checkpoint = run_dir / f"{name}.json"
+
+        # 已完成阶段直接读取检查点
+        if stage_state.get("status") == "done" and checkpoint.exists():
+            ctx[name] = read_json(checkpoint)
+            log(f"【{name}】已完成，读取检查点（耗时 {stage_state.get('duration_seconds', 0)}s）")
+            continue
+
+        log(f"【{name}】开始...")
+        started = time.monotonic()
+        stage_state = {"status": "running", "started_at": datetime.now().isoformat()}
+        state["stages"][name] = stage_state
+        write_json_atomic(state_file, state)
+
+        try:
+            ctx[name] = func(ctx)
+        except Exception as e:
+            stage_state["status"] = "failed"
+            stage_state["error"] = str(e)[:500]
+            stage_state["duration_seconds"] = round(time.monotonic() - started, 2)
+            state["status"] = "failed"
+            state["failed_stage"] = name
+            write_json_atomic(state_file, state)
+            log(f"❌ 阶段 {name} 失败：{str(e)[:200]}")
+            import traceback
+            log(traceback.format_exc())
+            if name == "scout":
+                send_no_event_notification()
+            log_timings(state)
+            return state
+
+        write_json_atomic(checkpoint, ctx[name])
+        stage_state["status"] = "done"
+        stage_state["finished_at"] = datetime.now().isoformat()
+        stage_state["duration_seconds"] = round(time.monotonic() - started, 2)
+        write_json_atomic(state_file, state)
+        log(f"【{name}】完成（耗时 {stage_state['duration_seconds']}s）")
+
+    state["status"] = "completed"
+    state["finished_at"] = datetime.now().isoformat()
+    write_json_atomic(state_file, state)
+    log_timings(state)
+    return state
+
+def log_timings(state: Dict):
+    """输出各阶段耗时"""
+    parts = []
+    for name, _ in STAGES:
+        stage_state = state["stages"].get(name)
+        if stage_state:
+            parts.append(f"{name}={stage_state.get('duration_seconds', 0)}s({stage_state.get('status')})")
+    log(f"阶段耗时：{', '.join(parts) if parts else '无'}")
+
+# ==================== 主流程 ====================
+def main():
+    """主入口"""
+    parser = argparse.ArgumentParser(description="TechChain 两阶段工作流")
+    parser.add_argument("--resume", nargs="?", const="latest", default=None,
+                        help="从上次未完成的运行续跑（可指定运行 ID，默认最近一次）")
+    args = parser.parse_args()
+
+    log("==========================================")
+    log("TechChain Workflow - 两阶段工作流启动")
+    log("==========================================")
+
+    run_id = None
+    if args.resume:
+        run_id = find_resumable_run() if args.resume == "latest" else args.resume
+        if not run_id or not (RUNS_DIR / run_id / "state.json").exists():
+            log("未找到可续跑的运行，开始新运行")
+            run_id = None
+
+    if run_id:
+        state = run_pipeline(run_id, resume=True)
+    else:
+        state = run_pipeline(datetime.now().strftime("%Y%m%d-%H%M%S"))
+    ok = state["status"] == "completed"
+
+    # 归档过期产出物（失败不影响本次结果）
+    try:
+        get_archiver().run_archiver()
+    except Exception as e:
+        log(f"⚠️ 归档失败（非致命）：{str(e)[:100]}")
+    
+    log("==========================================")
+    log("TechChain Workflow 完成" if ok else "TechChain Workflow 中断（可用 --resume 续跑）")
+    log("==========================================")
+
+    sys.exit(0 if ok or state.get("failed_stage") in HANDLED_FAILURE_STAGES else 1)
+
+if __name__ == "__main__":
+    main()
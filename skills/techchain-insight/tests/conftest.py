@@ -0,0 +1,15 @@
+# =============================================================================
+# TechChain Insight - 测试公共配置
+# 脚本目录与共享模块目录（techpulse-scout/scripts）加入 sys.path，与脚本运行时的导入方式一致
+# =============================================================================
+
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+SHARED_SCRIPTS_DIR = Path(__file__).resolve().parent.parent.parent / "techpulse-scout" / "scripts"
+
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+if str(SHARED_SCRIPTS_DIR) not in sys.path:
+    sys.path.append(str(SHARED_SCRIPTS_DIR))
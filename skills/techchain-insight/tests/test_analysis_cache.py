@@ -0,0 +1,65 @@
+# =============================================================================
+# 分析结果缓存：命中 / 未命中 / 知识库版本与分析深度失效
+# =============================================================================
+
+import json
+from datetime import datetime, timedelta
+
+import analysis_cache
+from analysis_cache import load_cached_analysis, save_cached_analysis
+
+NEWS = [
+    {"title": "HBM4 量产提前", "url": "https://example.com/a"},
+    {"title": "CoWoS 扩产", "url": "https://example.com/b"},
+]
+RESULT = {"keyword": "HBM", "stages": ["上游"]}
+
+def test_hit_on_same_news(tmp_path):
+    save_cached_analysis(tmp_path, "HBM", NEWS, RESULT, kb_version="v1", depth="standard")
+    cached = load_cached_analysis(tmp_path, "HBM", list(reversed(NEWS)), kb_version="v1", depth="standard")
+    assert cached is not None
+    assert cached["result"] == RESULT
+
+def test_hit_on_normalized_keyword(tmp_path):
+    save_cached_analysis(tmp_path, "AI 芯片", NEWS, RESULT)
+    assert load_cached_analysis(tmp_path, "ａｉ  芯片", NEWS) is not None
+
+def test_hit_when_news_subset(tmp_path):
+    save_cached_analysis(tmp_path, "HBM", NEWS, RESULT)
+    assert load_cached_analysis(tmp_path, "HBM", NEWS[:1]) is not None
+
+def test_miss_on_new_news(tmp_path):
+    save_cached_analysis(tmp_path, "HBM", NEWS, RESULT)
+    news = NEWS + [{"title": "SK 海力士财报", "url": "https://example.com/c"}]
+    assert load_cached_analysis(tmp_path, "HBM", news) is None
+
+def test_miss_without_entry(tmp_path):
+    assert load_cached_analysis(tmp_path, "HBM", NEWS) is None
+
+def test_kb_version_invalidates(tmp_path):
+    save_cached_analysis(tmp_path, "HBM", NEWS, RESULT, kb_version="v1")
+    assert load_cached_analysis(tmp_path, "HBM", NEWS, kb_version="v2") is None
+    assert load_cached_analysis(tmp_path, "HBM", NEWS, kb_version="v1") is not None
+
+def test_depth_keyed_separately(tmp_path):
+    lite = {"keyword": "HBM", "depth": "lite"}
+    deep = {"keyword": "HBM", "depth": "deep"}
+    save_cached_analysis(tmp_path, "HBM", NEWS, lite, depth="lite")
+    assert load_cached_analysis(tmp_path, "HBM", NEWS, depth="deep") is None
+
+    save_cached_analysis(tmp_path, "HBM", NEWS, deep, depth="deep")
+    assert load_cached_analysis(tmp_path, "HBM", NEWS, depth="lite")["result"] == lite
+    assert load_cached_analysis(tmp_path, "HBM", NEWS, depth="deep")["result"] == deep
+
+def test_expired_entry_misses(tmp_path):
+    save_cached_analysis(tmp_path, "HBM", NEWS, RESULT)
+    cache_file = next(tmp_path.glob("*.json"))
+    entry = json.loads(cache_file.read_text(encoding="utf-8"))
+    entry["created_at"] = (datetime.now() - timedelta(hours=analysis_cache.CACHE_MAX_AGE_HOURS + 1)).isoformat()
+    cache_file.write_text(json.dumps(entry), encoding="utf-8")
+    assert load_cached_analysis(tmp_path, "HBM", NEWS) is None
+
+def test_old_cache_version_misses(tmp_path, monkeypatch):
+    save_cached_analysis(tmp_path, "HBM", NEWS, RESULT)
+    monkeypatch.setattr(analysis_cache, "CACHE_VERSION", analysis_cache.CACHE_VERSION + 1)
+    assert load_cached_analysis(tmp_path, "HBM", NEWS) is None
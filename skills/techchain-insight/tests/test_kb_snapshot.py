@@ -0,0 +1,160 @@
+# =============================================================================
+# 知识库快照：stat/内容哈希判定新鲜度、KnowledgeBaseWatcher 后台重建与替换
+# =============================================================================
+
+import os
+import json
+import pickle
+
+import pytest
+
+import kb_snapshot
+from kb_snapshot import KnowledgeBaseWatcher, load_snapshot, snapshot_version
+
+INDUSTRY_CHAIN = {"半导体": {"上游": ["光刻机", "硅片"], "中游": ["晶圆制造"]}}
+COMPANIES = {"半导体设备": {"A 股": [{"code": "688012", "name": "中微公司", "business": "刻蚀设备", "position": "国内刻蚀龙头"}]}}
+
+def write_json(path, data):
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+def bump_mtime(path):
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000_000))
+
+def check_and_wait(watcher):
+    """触发一次源文件检查并等待后台重建完成（先等进行中的重建，避免本次检查被跳过）"""
+    watcher.wait(5)
+    snapshot = watcher.current()
+    watcher.wait(5)
+    return snapshot
+
+@pytest.fixture
+def kb(tmp_path):
+    kb_dir = tmp_path / "knowledge_base"
+    kb_dir.mkdir()
+    write_json(kb_dir / "industry_chain.json", INDUSTRY_CHAIN)
+    write_json(kb_dir / "companies.json", COMPANIES)
+    return kb_dir, tmp_path / "cache" / "kb_snapshot.pickle"
+
+def test_rebuild_then_reuse(kb):
+    kb_dir, snapshot_file = kb
+    snapshot, origin = load_snapshot(kb_dir, snapshot_file)
+    assert origin == "rebuilt"
+    assert snapshot_file.exists()
+    assert snapshot["industry_chain"] == INDUSTRY_CHAIN
+    assert snapshot["indexes"]["segment_index"]["光刻机"] == [("半导体", "上游")]
+
+    again, origin = load_snapshot(kb_dir, snapshot_file)
+    assert origin == "snapshot"
+    assert snapshot_version(again) == snapshot_version(snapshot)
+
+def test_mtime_only_change_reuses_and_records_stat(kb, monkeypatch):
+    kb_dir, snapshot_file = kb
+    load_snapshot(kb_dir, snapshot_file)
+    bump_mtime(kb_dir / "companies.json")
+
+    _, origin = load_snapshot(kb_dir, snapshot_file)
+    assert origin == "snapshot"
+    # 新 stat 已写回快照：之后的加载不再计算内容哈希
+    saved = pickle.loads(snapshot_file.read_bytes())
+    assert saved["sources"]["companies"]["mtime_ns"] == (kb_dir / "companies.json").stat().st_mtime_ns
+    monkeypatch.setattr(kb_snapshot, "_file_hash", lambda path: pytest.fail("不应重新计算哈希"))
+    assert load_snapshot(kb_dir, snapshot_file)[1] == "snapshot"
+
+def test_same_size_content_change_rebuilds(kb):
+    kb_dir, snapshot_file = kb
+    old, _ = load_snapshot(kb_dir, snapshot_file)
+    path = kb_dir / "industry_chain.json"
+    changed = path.read_text(encoding="utf-8").replace("硅片", "光阻")
+    path.write_text(changed, encoding="utf-8")
+    bump_mtime(path)
+
+    snapshot, origin = load_snapshot(kb_dir, snapshot_file)
+    assert origin == "rebuilt"
+    assert "光阻" in snapshot["indexes"]["segment_index"]
+    assert snapshot_version(snapshot) != snapshot_version(old)
+
+def test_added_source_file_rebuilds(tmp_path):
+    kb_dir = tmp_path / "knowledge_base"
+    kb_dir.mkdir()
+    write_json(kb_dir / "industry_chain.json", INDUSTRY_CHAIN)
+    snapshot_file = tmp_path / "kb_snapshot.pickle"
+    assert load_snapshot(kb_dir, snapshot_file)[0]["companies"] == {}
+
+    write_json(kb_dir / "companies.json", COMPANIES)
+    snapshot, origin = load_snapshot(kb_dir, snapshot_file)
+    assert origin == "rebuilt"
+    assert "688012" in snapshot["indexes"]["company_by_code"]
+
+def test_parse_error_is_not_saved(kb):
+    kb_dir, snapshot_file = kb
+    load_snapshot(kb_dir, snapshot_file)
+    saved = snapshot_file.read_bytes()
+    (kb_dir / "companies.json").write_text("{\"半导体\": ", encoding="utf-8")
+
+    snapshot, origin = load_snapshot(kb_dir, snapshot_file)
+    assert origin == "rebuilt"
+    assert snapshot["errors"]
+    assert snapshot_file.read_bytes() == saved
+
+def test_old_snapshot_version_rebuilds(kb, monkeypatch):
+    kb_dir, snapshot_file = kb
+    load_snapshot(kb_dir, snapshot_file)
+    monkeypatch.setattr(kb_snapshot, "SNAPSHOT_VERSION", kb_snapshot.SNAPSHOT_VERSION + 1)
+    assert load_snapshot(kb_dir, snapshot_file)[1] == "rebuilt"
+
+def test_corrupt_snapshot_rebuilds(kb):
+    kb_dir, snapshot_file = kb
+    load_snapshot(kb_dir, snapshot_file)
+    snapshot_file.write_bytes(b"not a pickle")
+    snapshot, origin = load_snapshot(kb_dir, snapshot_file)
+    assert origin == "rebuilt"
+    assert snapshot["industry_chain"] == INDUSTRY_CHAIN
+
+def test_watcher_swaps_after_background_rebuild(kb):
+    kb_dir, snapshot_file = kb
+    watcher = KnowledgeBaseWatcher(kb_dir, snapshot_file, check_interval=0)
+    old = watcher.current()
+    assert watcher.generation == 1
+
+    write_json(kb_dir / "industry_chain.json", {"半导体": {"上游": ["光刻胶"]}})
+    bump_mtime(kb_dir / "industry_chain.json")
+    # 检查到变化后在后台重建，本次调用仍返回旧快照
+    assert check_and_wait(watcher) is old
+
+    new = watcher.current()
+    assert watcher.generation == 2
+    assert "光刻胶" in new["indexes"]["segment_index"]
+    # 旧快照不被修改，进行中的分析前后一致
+    assert "光刻机" in old["indexes"]["segment_index"]
+
+def test_watcher_ignores_mtime_only_change(kb):
+    kb_dir, snapshot_file = kb
+    watcher = KnowledgeBaseWatcher(kb_dir, snapshot_file, check_interval=0)
+    watcher.current()
+    bump_mtime(kb_dir / "companies.json")
+    check_and_wait(watcher)
+    check_and_wait(watcher)
+    assert watcher.generation == 1
+
+def test_watcher_keeps_snapshot_on_parse_error(kb):
+    kb_dir, snapshot_file = kb
+    watcher = KnowledgeBaseWatcher(kb_dir, snapshot_file, check_interval=0)
+    old = watcher.current()
+    (kb_dir / "companies.json").write_text("{", encoding="utf-8")
+    check_and_wait(watcher)
+    assert check_and_wait(watcher) is old
+    assert watcher.generation == 1
+    assert watcher.last_errors
+
+    write_json(kb_dir / "companies.json", {})
+    check_and_wait(watcher)
+    assert watcher.generation == 2
+    assert not watcher.last_errors
+
+def test_watcher_throttles_stat_checks(kb, monkeypatch):
+    kb_dir, snapshot_file = kb
+    watcher = KnowledgeBaseWatcher(kb_dir, snapshot_file, check_interval=3600)
+    watcher.current()
+    monkeypatch.setattr(kb_snapshot, "_sources_changed", lambda snapshot, kb_dir: pytest.fail("检查间隔内不应 stat"))
+    watcher.current()
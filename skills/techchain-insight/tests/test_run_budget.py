@@ -0,0 +1,83 @@
+# =============================================================================
+# 运行时间预算：阶段切分、预算将尽时跳过可选搜索并记录降级
+# =============================================================================
+
+import json
+import subprocess
+
+import pytest
+
+import main
+import run_budget
+from run_budget import RunBudget, MIN_SEARCH_SECONDS
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(run_budget.time, "monotonic", fake)
+    return fake
+
+def test_unlimited_budget_never_degrades(clock):
+    budget = RunBudget()
+    budget.start_stage("search")
+    clock.now += 10_000
+    assert budget.allow_optional()
+    assert budget.clamp_timeout(30) == 30
+    assert budget.remaining() == float("inf")
+
+def test_stage_deadline_follows_shares(clock):
+    budget = RunBudget(100)
+    budget.start_stage("search")
+    assert budget.stage_remaining() == pytest.approx(25)
+
+    # 搜索阶段只用了 5 秒：剩余 95 秒按后续阶段占比切分（chain 0.40 / 0.75）
+    clock.now += 5
+    budget.start_stage("chain")
+    assert budget.stage_remaining() == pytest.approx(95 * 0.40 / 0.75)
+    assert budget.timings["search"] == pytest.approx(5)
+
+def test_optional_searches_stop_near_stage_deadline(clock):
+    budget = RunBudget(100)
+    budget.start_stage("search")
+    assert budget.allow_optional()
+    clock.now += 25 - MIN_SEARCH_SECONDS + 1
+    assert not budget.allow_optional()
+    # 超时不低于 MIN_SEARCH_SECONDS，也不超过原值
+    assert budget.clamp_timeout(30) == MIN_SEARCH_SECONDS
+    clock.now += 100
+    assert budget.remaining() == 0
+
+def test_mark_degraded_keeps_first_reason(clock):
+    budget = RunBudget(60)
+    budget.start_stage("chain")
+    budget.mark_degraded("时间预算不足")
+    budget.mark_degraded("搜索超时")
+    budget.mark_degraded("搜索超时", stage="stocks")
+    assert budget.degraded == {"chain": "时间预算不足", "stocks": "搜索超时"}
+    assert budget.degraded_names() == ["产业链分析", "标的映射"]
+
+def test_run_search_skips_optional_when_budget_spent(clock, monkeypatch):
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append(kwargs["timeout"])
+        return subprocess.CompletedProcess(cmd, 0, stdout=json.dumps({"results": [{"title": "t"}]}), stderr="")
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    monkeypatch.setattr(main, "SEARCH_CACHE", {})
+    monkeypatch.setattr(main, "BUDGET", RunBudget(20))
+    main.BUDGET.start_stage("search")
+    clock.now += 4
+
+    # 阶段剩余约 1 秒：可选搜索跳过并记录降级，必需搜索仍执行（超时按下限收紧）
+    assert main.run_search("HBM 最新进展", 5, 30) is None
+    assert main.BUDGET.degraded == {"search": "时间预算不足，跳过部分联网搜索"}
+    assert main.run_search("HBM", 5, 30, optional=False) == [{"title": "t"}]
+    assert calls == [MIN_SEARCH_SECONDS]
@@ -0,0 +1,93 @@
+# =============================================================================
+# 工作流检查点：失败中断、--resume 续跑跳过已完成阶段、退出码
+# =============================================================================
+
+import sys
+
+import pytest
+
+import workflow
+
+class FakeStages:
+    """按名称记录调用次数的阶段函数，fail 中的阶段抛出异常"""
+
+    def __init__(self):
+        self.calls = {}
+        self.fail = set()
+        self.seen_ctx = {}
+
+    def stage(self, name):
+        def run(ctx):
+            self.calls[name] = self.calls.get(name, 0) + 1
+            self.seen_ctx[name] = dict(ctx)
+            if name in self.fail:
+                raise RuntimeError(f"{name} 失败")
+            return {"stage": name}
+        return run
+
+@pytest.fixture
+def stages(tmp_path, monkeypatch):
+    fake = FakeStages()
+    monkeypatch.setattr(workflow, "RUNS_DIR", tmp_path / "runs")
+    monkeypatch.setattr(workflow, "STAGES", [(name, fake.stage(name)) for name in ("scout", "decide", "analyze", "notify")])
+    monkeypatch.setattr(workflow, "log", lambda message, level="INFO": None)
+    monkeypatch.setattr(workflow, "send_no_event_notification", lambda: fake.calls.update(no_event_mail=1))
+    return fake
+
+def test_failure_writes_checkpoints(stages, tmp_path):
+    stages.fail = {"analyze"}
+    state = workflow.run_pipeline("run-1")
+
+    assert state["status"] == "failed"
+    assert state["failed_stage"] == "analyze"
+    run_dir = tmp_path / "runs" / "run-1"
+    assert (run_dir / "scout.json").exists()
+    assert (run_dir / "decide.json").exists()
+    assert not (run_dir / "analyze.json").exists()
+    assert workflow.read_json(run_dir / "state.json")["stages"]["analyze"]["status"] == "failed"
+
+def test_resume_skips_done_stages(stages):
+    stages.fail = {"analyze"}
+    workflow.run_pipeline("run-1")
+    assert workflow.find_resumable_run() == "run-1"
+
+    stages.fail = set()
+    state = workflow.run_pipeline("run-1", resume=True)
+
+    assert state["status"] == "completed"
+    assert "failed_stage" not in state
+    assert stages.calls == {"scout": 1, "decide": 1, "analyze": 2, "notify": 1}
+    # 续跑时已完成阶段的结果从检查点读回
+    assert stages.seen_ctx["analyze"] == {"scout": {"stage": "scout"}, "decide": {"stage": "decide"}}
+    assert workflow.find_resumable_run() is None
+
+def test_resume_reruns_stage_without_checkpoint(stages, tmp_path):
+    workflow.run_pipeline("run-1")
+    (tmp_path / "runs" / "run-1" / "decide.json").unlink()
+
+    workflow.run_pipeline("run-1", resume=True)
+    assert stages.calls["scout"] == 1
+    assert stages.calls["decide"] == 2
+
+def test_find_resumable_run_picks_latest(stages):
+    stages.fail = {"notify"}
+    workflow.run_pipeline("20261001-080000")
+    workflow.run_pipeline("20261002-080000")
+    stages.fail = set()
+    workflow.run_pipeline("20261003-080000")
+    assert workflow.find_resumable_run() == "20261002-080000"
+
+@pytest.mark.parametrize("failed, code", [("scout", 0), ("analyze", 1), (None, 0)])
+def test_main_exit_code(stages, monkeypatch, failed, code):
+    class Archiver:
+        @staticmethod
+        def run_archiver():
+            pass
+
+    stages.fail = {failed} if failed else set()
+    monkeypatch.setattr(workflow, "get_archiver", lambda: Archiver)
+    monkeypatch.setattr(sys, "argv", ["workflow.py"])
+    with pytest.raises(SystemExit) as exc:
+        workflow.main()
+    assert exc.value.code == code
+    assert ("no_event_mail" in stages.calls) == (failed == "scout")
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# =============================================================================
+# 产出物索引（TechPulse Scout / TechChain Insight 共用）
+# 功能：记录各类产出文件（类型、运行 ID、时间、路径、摘要计数），
+#       「最新一份 X」直接查索引，不再 glob 扫描输出目录
+# 写入：产出文件与索引均先写临时文件再替换；索引更新加文件锁
+# =============================================================================
+
+import gzip
+import json
+import fcntl
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Union
+
+# 索引格式版本
+INDEX_VERSION = 1
+
+# 每种类型保留的历史条目数（索引大小有上限）
+MAX_ENTRIES_PER_TYPE = 200
+
+# 产出物类型
+TYPE_SCOUT_EVENTS = "scout_events"
+TYPE_SCOUT_STREAM = "scout_stream"
+TYPE_HOTSPOTS = "hotspots"
+TYPE_TECHCHAIN_REPORT = "techchain_report"
+TYPE_EVENT_DRIVEN_REPORT = "event_driven_report"
+TYPE_SCHEDULED_REPORT = "scheduled_report"
+TYPE_SMART_REPORT = "smart_report"
+
+def _empty_index() -> Dict[str, Any]:
+    return {"version": INDEX_VERSION, "latest": {}, "entries": {}}
+
+def _read_index(index_file: Path) -> Dict[str, Any]:
+    if not index_file.exists():
+        return _empty_index()
+    try:
+        with open(index_file, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") != INDEX_VERSION:
+            return _empty_index()
+        return index
+    except Exception:
+        return _empty_index()
+
+def _write_json_atomic(path: Path, data: Any, indent: Optional[int] = None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+    tmp_path.replace(path)
+
+@contextmanager
+def _locked(index_file: Path):
+    """索引读改写期间持有排他锁（多个定时任务可能同时写）"""
+    index_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(index_file.with_name(index_file.name + ".lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+def update_index(index_file: Path, func):
+    """在锁内读取索引、调用 func(index) 修改、原子写回"""
+    with _locked(index_file):
+        index = _read_index(index_file)
+        func(index)
+        _write_json_atomic(index_file, index)
+
+def record_artifact(index_file: Path, artifact_type: str, path: Path,
+                    summary: Optional[Dict[str, Any]] = None, run_id: str = "") -> Dict[str, Any]:
+    """登记一个已写好的产出文件，返回索引条目"""
+    entry = {
+        "type": artifact_type,
+        "run_id": run_id or datetime.now().strftime("%Y%m%d-%H%M%S"),
+        "time": datetime.now().isoformat(),
+        "path": str(path),
+        "summary": summary or {},
+    }
+
+    def add(index: Dict[str, Any]):
+        entries = index["entries"].setdefault(artifact_type, [])
+        entries.insert(0, entry)
+        del entries[MAX_ENTRIES_PER_TYPE:]
+        index["latest"][artifact_type] = entry
+
+    update_index(index_file, add)
+    return entry
+
+def write_artifact(index_file: Path, artifact_type: str, path: Path, content: Union[str, Dict, List],
+                   summary: Optional[Dict[str, Any]] = None, run_id: str = "") -> Dict[str, Any]:
+    """原子写入产出文件（字符串按文本写，其余按 JSON 写）并登记到索引"""
+    if isinstance(content, str):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        tmp_path.replace(path)
+    else:
+        _write_json_atomic(path, content, indent=2)
+    return record_artifact(index_file, artifact_type, path, summary, run_id)
+
+def latest_artifact(index_file: Path, artifact_type: str) -> Optional[Dict[str, Any]]:
+    """某类型最新的产出条目（文件已不存在时返回 None）"""
+    entry = _read_index(index_file)["latest"].get(artifact_type)
+    if entry and Path(entry["path"]).exists():
+        return entry
+    return None
+
+def read_artifact(path: Union[str, Path]) -> str:
+    """读取产出文件内容（已归档压缩的 .gz 文件透明解压）"""
+    path = Path(path)
+    if path.suffix == ".gz":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return f.read()
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+def list_artifacts(index_file: Path, artifact_type: str) -> List[Dict[str, Any]]:
+    """某类型的历史条目（新 → 旧）"""
+    return list(_read_index(index_file)["entries"].get(artifact_type, []))
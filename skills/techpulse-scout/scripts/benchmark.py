@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+# =============================================================================
+# TechPulse Scout - 基准测试
+# 功能：在已记录的事件语料上测量热点路径的耗时与结果一致性
+# 语料：默认读取事件库（data/events.db）最近 7 天事件；--corpus 可指定
+#       scout 输出文件（events-*.json）或事件列表 JSON
+#       判重基准先去掉重复记录的同一事件（相同标题/URL），再插入生成的近重复变体；
+#       另用 ratio 落在阈值附近的标题对单独测 LSH 候选召回（逐条比对回退关闭）
+# 执行：python3 scripts/benchmark.py dedup [--corpus FILE ...] [--limit N]
+#       python3 scripts/benchmark.py tags [--batch N]
+# =============================================================================
+
+import sys
+import json
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Dict, List, Any, Callable, Tuple
+
+from event_store import EventStore, parse_event_time
+import dedup_index
+from dedup_index import DedupIndex, SIMILARITY_THRESHOLD, band_keys, minhash_signature, title_shingles
+from news_item import NewsItem
+from url_canon import canonical_url
+
+# ==================== 配置区域 ====================
+WORKSPACE = Path("/home/admin/.openclaw/workspace")
+EVENTS_DB = WORKSPACE / "skills" / "techpulse-scout" / "data" / "events.db"
+
+# 语料默认时间范围（小时）
+CORPUS_HOURS = 7 * 24
+
+# 为每条语料生成的近重复变体数（语料中天然的近重复很少，用于衡量召回）
+VARIANTS_PER_EVENT = 2
+
+# 标签提取基准的新闻批量（语料不足时循环使用）
+TAG_BATCH_SIZE = 20000
+
+# 变体后缀（转载时常见的来源/栏目尾巴）
+VARIANT_SUFFIXES = [" - 36氪", " | 财联社", "（附图）", " - 新浪财经", "【快讯】"]
+
+# 近阈值标题对：ratio 落在 (SIMILARITY_THRESHOLD, NEAR_RATIO_MAX] 内，对数与最低候选召回
+NEAR_RATIO_MAX = 0.86
+NEAR_PAIRS = 2000
+NEAR_RECALL_MIN = 0.99
+
+# ==================== 语料 ====================
+def load_corpus(paths: List[str]) -> List[Dict[str, Any]]:
+    """读取语料事件（按时间升序，丢弃时间戳无法解析的事件）"""
+    events: List[Dict[str, Any]] = []
+    if paths:
+        for path in paths:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            events.extend(data.get("events", []) if isinstance(data, dict) else data)
+    elif EVENTS_DB.exists():
+        with EventStore(EVENTS_DB) as store:
+            events = store.recent(CORPUS_HOURS)
+    events = [e for e in events if e.get("title") and parse_event_time(e.get("timestamp", ""))]
+    events.sort(key=lambda e: parse_event_time(e["timestamp"]))
+    return events
+
+def drop_repeats(events: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    去掉重复记录的同一事件（标题相同或规范化 URL 相同，保留最早一条）
+    多次扫描会把同一事件以不同 URL 反复入库，不去掉时几乎整个语料都是重复，测不出索引的效果
+    返回：(去重后的事件, 去掉的条数)
+    """
+    seen_titles, seen_urls = set(), set()
+    unique = []
+    for event in events:
+        title = " ".join(event["title"].split())
+        url_key = canonical_url(event.get("source_url", "")) if event.get("source_url") else ""
+        if title in seen_titles or (url_key and url_key in seen_urls):
+            continue
+        seen_titles.add(title)
+        if url_key:
+            seen_urls.add(url_key)
+        unique.append(event)
+    return unique, len(events) - len(unique)
+
+def make_variant(title: str, rng: random.Random) -> str:
+    """构造标题的近重复变体：加来源后缀、删去末尾几个字或替换个别字符"""
+    kind = rng.randrange(3)
+    if kind == 0:
+        return title + rng.choice(VARIANT_SUFFIXES)
+    if kind == 1 and len(title) > 12:
+        return title[:-rng.randint(1, 3)]
+    chars = list(title)
+    for _ in range(max(1, len(chars) // 20)):
+        chars[rng.randrange(len(chars))] = rng.choice("的了在和与及")
+    return "".join(chars)
+
+def with_variants(events: List[Dict[str, Any]], per_event: int, seed: int = 7) -> List[Dict[str, Any]]:
+    """在语料中插入近重复变体（时间稍晚、URL 不同，只能靠标题相似度识别）"""
+    rng = random.Random(seed)
+    mixed = list(events)
+    for i, event in enumerate(events):
+        base_time = parse_event_time(event["timestamp"])
+        for j in range(per_event):
+            variant_time = base_time + timedelta(minutes=rng.randint(1, 600))
+            mixed.append({
+                "title": make_variant(event["title"], rng),
+                "source_url": f"https://variant.example/{i}/{j}",
+                "timestamp": variant_time.isoformat(),
+                "variant_of": i,
+            })
+    mixed.sort(key=lambda e: parse_event_time(e["timestamp"]))
+    return mixed
+
+def near_threshold_pairs(titles: List[str], count: int, seed: int = 11) -> List[Tuple[str, str]]:
+    """对标题逐字替换/插入/删除，直到与原标题的 ratio 刚好高于阈值（最难召回的重复）"""
+    rng = random.Random(seed)
+    chars = "".join(set("".join(titles)))
+    pairs: List[Tuple[str, str]] = []
+    for _ in range(count * 50):
+        if len(pairs) >= count:
+            break
+        title = rng.choice(titles)
+        variant = list(title)
+        for _ in range(len(title)):
+            op, pos = rng.randrange(3), rng.randrange(len(variant))
+            if op == 0:
+                variant[pos] = rng.choice(chars)
+            elif op == 1:
+                variant.insert(pos, rng.choice(chars))
+            elif len(variant) > 6:
+                del variant[pos]
+            ratio = SequenceMatcher(None, "".join(variant), title).ratio()
+            if ratio <= NEAR_RATIO_MAX:
+                break
+        if SIMILARITY_THRESHOLD < ratio <= NEAR_RATIO_MAX:
+            pairs.append(("".join(variant), title))
+    return pairs
+
+# ==================== 去重 ====================
+def brute_force_duplicate(new_event: Dict[str, Any], known_events: List[Dict[str, Any]], now: datetime,
+                          hours: int = 24) -> bool:
+    """原逐条比对实现（基准参照）"""
+    cutoff_time = now - timedelta(hours=hours)
+    for event in known_events:
+        event_time = parse_event_time(event.get("timestamp", ""))
+        if event_time is None or event_time < cutoff_time:
+            continue
+        if SequenceMatcher(None, new_event["title"], event["title"]).ratio() > SIMILARITY_THRESHOLD:
+            return True
+        if new_event.get("source_url") == event.get("source_url"):
+            return True
+    return False
+
+def replay(events: List[Dict[str, Any]], check: Callable[[Dict[str, Any], datetime], bool],
+           add: Callable[[Dict[str, Any]], None]) -> List[bool]:
+    """按时间顺序回放语料：每条事件先判重（以事件时间为当前时间），再加入已知集合"""
+    decisions = []
+    for event in events:
+        decisions.append(check(event, parse_event_time(event["timestamp"])))
+        add(event)
+    return decisions
+
+def bench_dedup(events: List[Dict[str, Any]], dropped: int = 0) -> bool:
+    """
+    对比索引与逐条比对的判重结果和耗时，结果不一致率超过 1% 时返回 False
+    events 为原始事件与生成的变体（带 variant_of）混合后的语料；召回同时按变体单独统计
+    """
+    known: List[Dict[str, Any]] = []
+    started = time.perf_counter()
+    expected = replay(events, lambda e, now: brute_force_duplicate(e, known, now), known.append)
+    brute_seconds = time.perf_counter() - started
+
+    index = DedupIndex(hours=24)
+    started = time.perf_counter()
+    actual = replay(events, lambda e, now: index.is_duplicate(e, now), index.add)
+    index_seconds = time.perf_counter() - started
+
+    positives = sum(expected)
+    missed = sum(1 for e, a in zip(expected, actual) if e and not a)
+    extra = sum(1 for e, a in zip(expected, actual) if a and not e)
+    recall = (positives - missed) / positives if positives else 1.0
+
+    # 语料构成：原始事件之间天然的近重复多时（如模板化标题），索引候选集变大，速度优势随之缩小
+    is_variant = ["variant_of" in e for e in events]
+    originals = is_variant.count(False)
+    variants = len(events) - originals
+    natural = sum(1 for v, e in zip(is_variant, expected) if not v and e)
+    variant_expected = sum(1 for v, e in zip(is_variant, expected) if v and e)
+    variant_found = sum(1 for v, e, a in zip(is_variant, expected, actual) if v and e and a)
+
+    print(f"语料：原始事件 {originals} 条（已去掉重复记录 {dropped} 条，其中 {natural} 条与更早的原始事件近重复）"
+          f" + 生成变体 {variants} 条 = {len(events)} 条")
+    print(f"逐条比对判定重复 {positives} 条（变体 {variant_expected}/{variants}）")
+    print(f"逐条比对：{brute_seconds * 1000:.1f}ms（{brute_seconds / len(events) * 1e6:.0f}µs/条）")
+    print(f"LSH 索引：{index_seconds * 1000:.1f}ms（{index_seconds / len(events) * 1e6:.0f}µs/条，"
+          f"复核 {index.comparisons} 次，平均 {index.comparisons / len(events):.1f} 次/条）")
+    print(f"召回：{recall:.1%}（漏判 {missed} 条），多判 {extra} 条")
+    if variant_expected:
+        print(f"变体召回：{variant_found / variant_expected:.1%}（{variant_found}/{variant_expected}）")
+    return (missed + extra) <= len(events) * 0.01
+
+def bench_near_threshold(events: List[Dict[str, Any]], count: int = NEAR_PAIRS) -> bool:
+    """
+    近阈值标题对的 LSH 候选召回（不经过小窗口的逐条比对回退），低于 NEAR_RECALL_MIN 时返回 False
+    """
+    titles = [e["title"] for e in events if len(e["title"]) >= 8]
+    pairs = near_threshold_pairs(titles, count) if titles else []
+    if not pairs:
+        print("近阈值标题对：语料标题过短，跳过")
+        return True
+    found = sum(1 for a, b in pairs
+                if set(band_keys(minhash_signature(title_shingles(a)))) & set(band_keys(minhash_signature(title_shingles(b)))))
+    recall = found / len(pairs)
+    print(f"近阈值标题对（ratio {SIMILARITY_THRESHOLD}~{NEAR_RATIO_MAX}，{dedup_index.LSH_BANDS} 段 × "
+          f"{dedup_index.LSH_ROWS} 行）：LSH 候选召回 {recall:.2%}（{found}/{len(pairs)}）")
+    return recall >= NEAR_RECALL_MIN
+
+# ==================== 标签提取 ====================
+def legacy_extract_tags(domain: str, text: str) -> List[str]:
+    """原 scout.extract_tags 实现（基准参照：每个词都对全文重新转小写）"""
+    tags = [domain]
+    for company in ["NVIDIA", "特斯拉", "比亚迪", "宁德时代", "华为", "ASML", "台积电", "英特尔", "AMD", "OpenAI", "Anthropic", "SpaceX"]:
+        if company.lower() in text.lower():
+            tags.append(company)
+    for kw in ["HBM", "CoWoS", "GAA", "EUV", "FSD", "eVTOL", "6G", "量子"]:
+        if kw.lower() in text.lower():
+            tags.append(kw)
+    x_accounts = {"elonmusk": "马斯克", "OpenAI": "OpenAI", "sama": "Sam Altman", "AnthropicAI": "Anthropic",
+                  "realDonaldTrump": "特朗普", "NVIDIA": "NVIDIA 官方", "Tesla": "Tesla 官方", "SpaceX": "SpaceX 官方"}
+    for account, name in x_accounts.items():
+        if f"twitter.com/{account}" in text.lower() or f"x.com/{account}" in text.lower():
+            tags.append(f"X:{name}")
+    return list(set(tags))[:8]
+
+def bench_tags(events: List[Dict[str, Any]], batch_size: int) -> bool:
+    """对比原实现（每条新闻调用两次）与单次提取的吞吐量"""
+    from scout import extract_entities, MONITORED_DOMAINS
+
+    domains = list(MONITORED_DOMAINS)
+    batch = [(events[i % len(events)], domains[i % len(domains)]) for i in range(batch_size)]
+
+    started = time.perf_counter()
+    for event, domain in batch:
+        text = event["title"] + " " + event.get("summary", "")
+        legacy_extract_tags(domain, text)
+        [t for t in legacy_extract_tags(domain, text) if t not in MONITORED_DOMAINS]
+    legacy_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for event, domain in batch:
+        extract_entities(NewsItem(event["title"], event.get("source_url", ""), event.get("summary", "")), domain)
+    single_seconds = time.perf_counter() - started
+
+    print(f"批量：{batch_size} 条新闻（语料 {len(events)} 条循环使用）")
+    print(f"原实现（两次提取）：{legacy_seconds * 1000:.1f}ms，{batch_size / legacy_seconds:,.0f} 条/秒")
+    print(f"单次提取：{single_seconds * 1000:.1f}ms，{batch_size / single_seconds:,.0f} 条/秒"
+          f"（{legacy_seconds / single_seconds:.1f}x）")
+    return True
+
+# ==================== 主流程 ====================
+def main():
+    """主入口"""
+    parser = argparse.ArgumentParser(description="TechPulse Scout 基准测试")
+    parser.add_argument("suite", choices=["dedup", "tags"], help="测试项")
+    parser.add_argument("--corpus", action="append", default=[], help="语料文件（可重复）")
+    parser.add_argument("--limit", type=int, default=0, help="最多使用的语料事件数")
+    parser.add_argument("--variants", type=int, default=VARIANTS_PER_EVENT, help="每条事件生成的近重复变体数")
+    parser.add_argument("--batch", type=int, default=TAG_BATCH_SIZE, help="标签提取基准的新闻条数")
+    args = parser.parse_args()
+
+    events = load_corpus(args.corpus)
+    dropped = 0
+    if args.suite == "dedup":
+        events, dropped = drop_repeats(events)
+    if args.limit:
+        events = events[-args.limit:]
+    if not events:
+        print("❌ 没有可用的语料事件")
+        sys.exit(1)
+
+    ok = True
+    if args.suite == "dedup":
+        ok = bench_dedup(with_variants(events, args.variants), dropped)
+        ok = bench_near_threshold(events) and ok
+    elif args.suite == "tags":
+        ok = bench_tags(events, args.batch)
+    if not ok:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# =============================================================================
+# TechPulse Scout - 事件库（SQLite）
+# 功能：替代 known_events.json 全量读写，按时间/规范化 URL/标题指纹建索引
+# 写入：新事件增量插入；过期事件按时间范围删除
+# =============================================================================
+
+import re
+import json
+import sqlite3
+import hashlib
+import unicodedata
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+from url_canon import canonical_url
+
+# 事件保留天数
+RETENTION_DAYS = 7
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    title_fp TEXT NOT NULL,
+    source_url TEXT,
+    url_key TEXT,
+    ts REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_ts ON events (ts);
+CREATE INDEX IF NOT EXISTS idx_events_source_url ON events (source_url);
+CREATE INDEX IF NOT EXISTS idx_events_title_fp ON events (title_fp);
+"""
+
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+
+def parse_event_time(timestamp: str) -> Optional[datetime]:
+    """
+    解析事件时间戳（本地时间，兼容末尾带 "Z" 的历史格式）
+    返回不带时区的本地时间，解析失败返回 None
+    """
+    if not timestamp:
+        return None
+    try:
+        parsed = datetime.fromisoformat(timestamp.rstrip("Z"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+def title_fingerprint(title: str) -> str:
+    """标题指纹：全角转半角、小写、去掉空白和标点后取哈希"""
+    text = _NON_WORD.sub("", unicodedata.normalize("NFKC", title or "").lower())
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+class EventStore:
+    """已知事件库（SQLite）"""
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(db_path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+        self.conn.commit()
+
+    def _migrate(self):
+        """旧版库补充 url_key 列（规范化 URL，去重键）并按 source_url 回填"""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(events)")}
+        if "url_key" not in columns:
+            with self.conn:
+                self.conn.execute("ALTER TABLE events ADD COLUMN url_key TEXT")
+                rows = self.conn.execute("SELECT id, source_url FROM events").fetchall()
+                self.conn.executemany(
+                    "UPDATE events SET url_key = ? WHERE id = ?",
+                    [(canonical_url(url or ""), event_id) for event_id, url in rows],
+                )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_events_url_key ON events (url_key)")
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    def _row(self, event: Dict[str, Any]) -> Optional[tuple]:
+        event_time = parse_event_time(event.get("timestamp", ""))
+        if not event.get("id") or event_time is None:
+            return None
+        return (
+            event["id"],
+            event.get("title", ""),
+            title_fingerprint(event.get("title", "")),
+            event.get("source_url", ""),
+            canonical_url(event.get("source_url", "")),
+            event_time.timestamp(),
+            json.dumps(event, ensure_ascii=False),
+        )
+
+    def insert(self, events: List[Dict[str, Any]]) -> int:
+        """增量插入事件（ID 已存在的忽略），返回插入条数"""
+        rows = [row for row in (self._row(e) for e in events) if row]
+        before = self.conn.total_changes
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO events (id, title, title_fp, source_url, url_key, ts, data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return self.conn.total_changes - before
+
+    def expire(self, days: int = RETENTION_DAYS) -> int:
+        """删除超过保留期的事件，返回删除条数"""
+        cutoff = (datetime.now() - timedelta(days=days)).timestamp()
+        with self.conn:
+            cursor = self.conn.execute("DELETE FROM events WHERE ts < ?", (cutoff,))
+        return cursor.rowcount
+
+    def recent(self, hours: int = 24) -> List[Dict[str, Any]]:
+        """最近 N 小时的事件（按时间升序）"""
+        cutoff = (datetime.now() - timedelta(hours=hours)).timestamp()
+        rows = self.conn.execute("SELECT data FROM events WHERE ts >= ? ORDER BY ts", (cutoff,))
+        return [json.loads(data) for (data,) in rows]
+
+    def has_url(self, url: str, hours: int = 24) -> bool:
+        """最近 N 小时内是否出现过同一 URL（按规范化 URL 比较）"""
+        if not url:
+            return False
+        cutoff = (datetime.now() - timedelta(hours=hours)).timestamp()
+        row = self.conn.execute(
+            "SELECT 1 FROM events WHERE url_key = ? AND ts >= ? LIMIT 1", (canonical_url(url), cutoff)
+        ).fetchone()
+        return row is not None
+
+    def has_title(self, title: str, hours: int = 24) -> bool:
+        """最近 N 小时内是否出现过指纹相同的标题"""
+        cutoff = (datetime.now() - timedelta(hours=hours)).timestamp()
+        row = self.conn.execute(
+            "SELECT 1 FROM events WHERE title_fp = ? AND ts >= ? LIMIT 1", (title_fingerprint(title), cutoff)
+        ).fetchone()
+        return row is not None
+
+    def import_json(self, json_file: Path) -> int:
+        """
+        导入旧版 known_events.json（导入后重命名为 .imported，避免重复导入）
+        返回导入条数
+        """
+        if not json_file.exists():
+            return 0
+        try:
+            with open(json_file, "r", encoding="utf-8") as f:
+                events = json.load(f)
+        except Exception:
+            return 0
+
+        imported = self.insert(events if isinstance(events, list) else [])
+        json_file.replace(json_file.with_suffix(json_file.suffix + ".imported"))
+        return imported
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# =============================================================================
+# 事件流（TechPulse Scout → TechChain Insight）
+# 功能：Scout 每确认一个事件（评分、去重完成）就追加一行 JSON 到流文件，
+#       扫描结束时追加一条汇总记录；下游边读边处理，不必等全部领域扫描完
+# 格式：JSONL，每行一条记录
+#       {"type": "event", "event": {...}}
+#       {"type": "heartbeat", "time": "..."}（批量扫描期间定时写入、watch 模式空闲时写入，读取端据此判断写入端存活）
+#       {"type": "summary", "status": "completed" | "failed", ...输出统计}
+# =============================================================================
+
+import json
+import time
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional
+
+# 记录类型
+RECORD_EVENT = "event"
+RECORD_SUMMARY = "summary"
+RECORD_HEARTBEAT = "heartbeat"
+
+# 汇总状态
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+
+# 读取端轮询间隔（秒）
+POLL_INTERVAL = 1.0
+
+# 读取端无新记录的最长等待（秒），超过后视为写入端已异常退出
+IDLE_TIMEOUT = 600
+
+# 写入端定时心跳间隔（秒），须远小于 IDLE_TIMEOUT
+HEARTBEAT_INTERVAL = 60
+
+def stream_path_for(output_file: Path) -> Path:
+    """与 Scout 输出文件同名的流文件（events-*.json → events-*.jsonl）"""
+    return output_file.with_suffix(".jsonl")
+
+class EventStreamWriter:
+    """
+    写事件流（打开时清空同名旧文件；每条记录写完立即 flush，读取端可随时看到）
+
+    - emit(event)：追加一条事件记录
+    - heartbeat(info)：追加心跳记录（长时间无事件时避免读取端超时退出）
+    - start_heartbeat(interval)：后台线程定时写心跳，直到 finish/close
+    - finish(summary, status)：追加汇总记录并关闭，之后的 emit 忽略
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self.emitted = 0
+
+    def _write(self, record: Dict[str, Any]):
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._file.flush()
+
+    def emit(self, event: Dict[str, Any]):
+        self._write({"type": RECORD_EVENT, "event": event})
+        self.emitted += 1
+
+    def heartbeat(self, info: Optional[Dict[str, Any]] = None):
+        self._write(dict(info or {}, type=RECORD_HEARTBEAT, time=datetime.now().isoformat()))
+
+    def start_heartbeat(self, interval: float = HEARTBEAT_INTERVAL):
+        def beat():
+            while not self._closed.wait(interval):
+                self.heartbeat()
+        threading.Thread(target=beat, name="stream-heartbeat", daemon=True).start()
+
+    def finish(self, summary: Optional[Dict[str, Any]] = None, status: str = STATUS_COMPLETED):
+        self._write(dict(summary or {}, type=RECORD_SUMMARY, status=status))
+        self.close()
+
+    @property
+    def finished(self) -> bool:
+        return self._file is None
+
+    def close(self):
+        self._closed.set()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # 异常退出时补一条失败汇总，读取端不必等到超时
+        if not self.finished:
+            self.finish(status=STATUS_FAILED if exc_type else STATUS_COMPLETED)
+
+def follow_stream(path: Path, poll_interval: float = POLL_INTERVAL, idle_timeout: float = IDLE_TIMEOUT,
+                  stop: Optional[threading.Event] = None) -> Iterator[Dict[str, Any]]:
+    """
+    逐条读取事件流（类似 tail -f），读到汇总记录后结束
+    文件尚未创建时等待；超过 idle_timeout 没有新记录、或 stop 被置位时直接结束（不产出汇总记录）
+    """
+    last_activity = time.monotonic()
+    while not path.exists():
+        if time.monotonic() - last_activity > idle_timeout or (stop and stop.is_set()):
+            return
+        time.sleep(poll_interval)
+
+    with open(path, "r", encoding="utf-8") as f:
+        pending = ""
+        while True:
+            if stop and stop.is_set():
+                return
+            chunk = f.readline()
+            if not chunk:
+                if time.monotonic() - last_activity > idle_timeout:
+                    return
+                time.sleep(poll_interval)
+                continue
+            # 写入端可能正写到一半，凑满一整行再解析
+            pending += chunk
+            if not pending.endswith("\n"):
+                continue
+            line, pending = pending.strip(), ""
+            last_activity = time.monotonic()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            yield record
+            if record.get("type") == RECORD_SUMMARY:
+                return
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# =============================================================================
+# 日志配置（TechPulse Scout / TechChain Insight 共用）
+# 功能：控制台同步输出（保持与 print 的先后顺序），文件经队列由后台线程写入；
+#       按大小轮转，日志级别由环境变量 OPENCLAW_LOG_LEVEL 控制（默认 INFO）
+# 用法：LOGGER = setup_logger("scout", LOG_FILE)；log(msg, "DEBUG") 输出调试信息
+# =============================================================================
+
+import os
+import sys
+import queue
+import atexit
+import logging
+import logging.handlers
+from pathlib import Path
+from typing import Dict, List, TextIO
+
+# 日志级别环境变量（DEBUG / INFO / WARNING / ERROR）
+LOG_LEVEL_ENV = "OPENCLAW_LOG_LEVEL"
+DEFAULT_LOG_LEVEL = "INFO"
+
+# 单个日志文件上限与保留的轮转文件数
+MAX_LOG_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+
+LOG_FORMAT = "[%(asctime)s] %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# log(message, level) 的级别名
+LOG_LEVELS: Dict[str, int] = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+}
+
+# 已启动的文件写入线程（进程退出时停止并写完队列）
+_LISTENERS: List[logging.handlers.QueueListener] = []
+
+def configured_level() -> int:
+    """环境变量指定的日志级别（无效值按 INFO 处理）"""
+    return LOG_LEVELS.get(os.environ.get(LOG_LEVEL_ENV, DEFAULT_LOG_LEVEL).upper(), logging.INFO)
+
+def setup_logger(name: str, log_file: Path, stream: TextIO = sys.stdout) -> logging.Logger:
+    """
+    获取（首次调用时配置）指定名称的 logger
+    stream: 控制台输出流（main.py 用 stderr，保证 stdout 只有报告正文）
+    """
+    logger = logging.getLogger(name)
+    if logger.handlers:
+        return logger
+
+    logger.setLevel(configured_level())
+    logger.propagate = False
+    formatter = logging.Formatter(LOG_FORMAT, DATE_FORMAT)
+
+    console = logging.StreamHandler(stream)
+    console.setFormatter(formatter)
+    logger.addHandler(console)
+
+    # 文件写入不阻塞调用方：记录进队列，由后台线程轮转写入
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_file, maxBytes=MAX_LOG_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8", delay=True
+    )
+    file_handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, file_handler)
+    listener.start()
+    _LISTENERS.append(listener)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    return logger
+
+@atexit.register
+def shutdown_logging():
+    """停止后台写入线程（队列中剩余的日志写完后返回）"""
+    while _LISTENERS:
+        _LISTENERS.pop().stop()
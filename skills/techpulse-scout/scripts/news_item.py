@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# =============================================================================
+# 新闻条目（TechPulse Scout / TechChain Insight 共用）
+# 功能：替代各环节自由拼装的新闻 dict；__slots__ 存放字段，
+#       拼接文本、小写文本、可注册域名、两种口径的来源分类首次访问时计算并缓存
+# 兼容：支持 news["title"] / news.get("title") 的 dict 式访问，
+#       from_dict / to_dict 与原有 JSON 结构互转
+# =============================================================================
+
+from typing import Dict, List, Any, Optional, Iterable
+from urllib.parse import urlparse
+
+import source_registry
+
+# 核心字段（其余键存放在 extra 中，如 credibility_score）
+CORE_FIELDS = ("title", "url", "content", "source", "domain", "query")
+
+# 需要取三级域名的公共后缀（如 sina.com.cn、bbc.co.uk）
+MULTI_LABEL_SUFFIXES = {
+    "com.cn", "net.cn", "org.cn", "gov.cn", "edu.cn", "ac.cn",
+    "com.hk", "com.tw", "com.sg", "com.au", "co.uk", "co.jp", "co.kr",
+}
+
+def registrable_domain(url: str) -> str:
+    """URL 的可注册域名（www.cls.cn/a → cls.cn，finance.sina.com.cn → sina.com.cn）"""
+    try:
+        host = (urlparse(url).hostname or "").lower()
+    except ValueError:
+        return ""
+    labels = [label for label in host.split(".") if label]
+    if len(labels) >= 3 and ".".join(labels[-2:]) in MULTI_LABEL_SUFFIXES:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+class NewsItem:
+    """新闻条目：字段 + 惰性缓存的派生值"""
+
+    __slots__ = CORE_FIELDS + ("extra", "_text", "_text_lower", "_url_lower", "_registrable_domain",
+                                 "_scout_class", "_analysis_class")
+
+    def __init__(self, title: str = "", url: str = "", content: str = "", source: str = "",
+                 domain: str = "", query: str = "", extra: Optional[Dict[str, Any]] = None):
+        self.title = title or ""
+        self.url = url or ""
+        self.content = content or ""
+        self.source = source or ""
+        self.domain = domain or ""
+        self.query = query or ""
+        self.extra = extra or {}
+        self._reset_cache()
+
+    def _reset_cache(self):
+        self._text = None
+        self._text_lower = None
+        self._url_lower = None
+        self._registrable_domain = None
+        self._scout_class = None
+        self._analysis_class = None
+
+    # ==================== 派生值（首次访问时计算） ====================
+    @property
+    def text(self) -> str:
+        """标题 + 正文"""
+        if self._text is None:
+            self._text = self.title + " " + self.content
+        return self._text
+
+    @property
+    def text_lower(self) -> str:
+        if self._text_lower is None:
+            self._text_lower = self.text.lower()
+        return self._text_lower
+
+    @property
+    def url_lower(self) -> str:
+        if self._url_lower is None:
+            self._url_lower = self.url.lower()
+        return self._url_lower
+
+    @property
+    def registrable_domain(self) -> str:
+        if self._registrable_domain is None:
+            self._registrable_domain = registrable_domain(self.url)
+        return self._registrable_domain
+
+    @property
+    def scout_class(self) -> str:
+        """scout 口径的来源类型（source_registry.source_class）"""
+        if self._scout_class is None:
+            self._scout_class = source_registry.source_class(self.url)
+        return self._scout_class
+
+    @property
+    def analysis_class(self) -> str:
+        """techchain 口径的来源类型（source_registry.analysis_class）"""
+        if self._analysis_class is None:
+            self._analysis_class = source_registry.analysis_class(self.url)
+        return self._analysis_class
+
+    # ==================== dict 兼容访问 ====================
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in CORE_FIELDS:
+            return getattr(self, key)
+        return self.extra.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in CORE_FIELDS:
+            return getattr(self, key)
+        return self.extra[key]
+
+    def __setitem__(self, key: str, value: Any):
+        if key in CORE_FIELDS:
+            setattr(self, key, value or "")
+            self._reset_cache()
+        else:
+            self.extra[key] = value
+
+    def __contains__(self, key: str) -> bool:
+        return key in CORE_FIELDS or key in self.extra
+
+    def __repr__(self) -> str:
+        return f"NewsItem(title={self.title[:30]!r}, url={self.url!r})"
+
+    # ==================== 与 dict / JSON 互转 ====================
+    @classmethod
+    def from_dict(cls, data: Any) -> "NewsItem":
+        """从 dict（或已是 NewsItem）构造"""
+        if isinstance(data, cls):
+            return data
+        extra = {k: v for k, v in data.items() if k not in CORE_FIELDS}
+        return cls(*(data.get(k, "") for k in CORE_FIELDS), extra=extra)
+
+    @classmethod
+    def from_search_result(cls, result: Dict[str, Any], **fields) -> "NewsItem":
+        """从 SearXNG 搜索结果构造（fields 补充 source/domain/query 等）"""
+        return cls(result.get("title", ""), result.get("url", ""), result.get("content", ""), **fields)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转回原有 dict 结构（title/url/content 必有，其余字段非空才输出）"""
+        data = {"title": self.title, "url": self.url, "content": self.content}
+        for key in ("source", "domain", "query"):
+            value = getattr(self, key)
+            if value:
+                data[key] = value
+        data.update(self.extra)
+        return data
+
+def to_news_items(news_list: Iterable[Any]) -> List[NewsItem]:
+    """批量转换（已是 NewsItem 的原样保留）"""
+    return [NewsItem.from_dict(n) for n in news_list]
+
+def to_dicts(news_list: Iterable[NewsItem]) -> List[Dict[str, Any]]:
+    """批量转回 dict（用于写 JSON）"""
+    return [n.to_dict() for n in news_list]
@@ -2,13 +2,18 @@
 # =============================================================================
 # Nitter 实例可用性检测模块
 # 功能：定期检测 Nitter 实例是否可用，不可用时自动切换到国内替代源
+# 缓存：状态文件按 (mtime, 大小) 缓存，未变化时不重复读取解析；
+#       过期重测时加锁，并发调用只触发一次检测；各实例并行探测
 # =============================================================================
 
+import os
 import subprocess
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 
 # Nitter 实例列表
 NITTER_INSTANCES = [
@@ -55,6 +60,19 @@ DOMESTIC_ALTERNATIVES = {
 # 可用性状态文件
 STATUS_FILE = Path(__file__).parent.parent / "data" / "nitter_status.json"
 
+# 检测结果有效期（超过后 get_best_source 重新检测）
+STATUS_MAX_AGE = timedelta(hours=1)
+
+# 后台刷新间隔（秒，SourceRefresher 默认值）
+REFRESH_INTERVAL = 1800
+
+# 状态文件缓存：(mtime_ns, 大小) → 最新一条检测结果
+_STATUS_CACHE: Dict[str, Any] = {"key": None, "status": {}}
+_STATUS_LOCK = threading.Lock()
+
+# 过期重测锁（并发调用 get_best_source 时只有一个线程执行检测）
+_RECHECK_LOCK = threading.Lock()
+
 def check_nitter_instance(url: str, timeout: int = 10) -> Dict[str, Any]:
     """
     检测单个 Nitter 实例是否可用
@@ -115,12 +133,12 @@ def check_all_nitter_instances() -> Dict[str, Any]:
             "best_instance": str (fastest)
         }
     """
-    results = []
+    # 各实例并行探测（总耗时约等于最慢的一个，而不是逐个累加）
+    with ThreadPoolExecutor(max_workers=len(NITTER_INSTANCES)) as pool:
+        results = list(pool.map(check_nitter_instance, NITTER_INSTANCES))
     
-    for url in NITTER_INSTANCES:
-        result = check_nitter_instance(url)
-        results.append(result)
-        print(f"检测：{url} - {'✅ 可用' if result['available'] else '❌ 不可用'} ({result.get('error', '')})")
+    for result in results:
+        print(f"检测：{result['url']} - {'✅ 可用' if result['available'] else '❌ 不可用'} ({result.get('error', '')})")
     
     available = [r for r in results if r["available"]]
     
@@ -154,18 +172,37 @@ def save_status(summary: Dict):
     
     with open(STATUS_FILE, 'w', encoding='utf-8') as f:
         json.dump(history, f, ensure_ascii=False, indent=2)
+    
+    # 刚写入的结果直接进缓存，随后的 load_status 不必再读文件
+    with _STATUS_LOCK:
+        _STATUS_CACHE["key"] = _status_file_key()
+        _STATUS_CACHE["status"] = summary
+
+def _status_file_key() -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(STATUS_FILE)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
 
 def load_status() -> Dict:
-    """加载最新检测结果"""
-    if not STATUS_FILE.exists():
+    """加载最新检测结果（文件未变化时直接返回缓存）"""
+    key = _status_file_key()
+    if key is None:
         return {}
     
-    try:
-        with open(STATUS_FILE, 'r', encoding='utf-8') as f:
-            history = json.load(f)
-            return history[-1] if history else {}
-    except:
-        return {}
+    with _STATUS_LOCK:
+        if _STATUS_CACHE["key"] == key:
+            return _STATUS_CACHE["status"]
+        try:
+            with open(STATUS_FILE, 'r', encoding='utf-8') as f:
+                history = json.load(f)
+            status = history[-1] if history else {}
+        except:
+            status = {}
+        _STATUS_CACHE["key"] = key
+        _STATUS_CACHE["status"] = status
+        return status
 
 def parse_iso_datetime(iso_string: str) -> datetime:
     """
@@ -180,9 +217,25 @@ def parse_iso_datetime(iso_string: str) -> datetime:
         clean_str = iso_string.split('.')[0].replace('Z', '')
         return datetime.strptime(clean_str, "%Y-%m-%dT%H:%M:%S")
 
+def is_status_stale(status: Dict) -> bool:
+    """检测结果是否缺失或超过有效期"""
+    if not status or not status.get("check_time"):
+        return True
+    try:
+        return datetime.now() - parse_iso_datetime(status["check_time"]) > STATUS_MAX_AGE
+    except ValueError:
+        return True
+
+def refresh_status() -> Dict:
+    """重新检测全部实例并保存，返回检测结果"""
+    status = check_all_nitter_instances()
+    save_status(status)
+    return status
+
 def get_best_source() -> Dict[str, Any]:
     """
     获取最佳数据源（优先 Nitter，不可用时用国内替代）
+    检测结果缺失或超过 STATUS_MAX_AGE 时重新检测；并发调用只检测一次
     
     Returns:
         {
@@ -194,19 +247,18 @@ def get_best_source() -> Dict[str, Any]:
     # 加载最新检测结果
     status = load_status()
     
-    # 如果没有检测结果或超过 1 小时，重新检测
-    if not status or not status.get("check_time"):
-        print("未找到检测结果，执行检测...")
-        status = check_all_nitter_instances()
-        save_status(status)
-    else:
-        check_time = parse_iso_datetime(status["check_time"])
-        if datetime.now() - check_time > timedelta(hours=1):
-            print("检测结果已过时，重新检测...")
-            status = check_all_nitter_instances()
-            save_status(status)
+    if is_status_stale(status):
+        with _RECHECK_LOCK:
+            # 等锁期间其他线程可能已完成检测
+            status = load_status()
+            if is_status_stale(status):
+                print("检测结果缺失或已过时，重新检测...")
+                status = refresh_status()
     
-    # 返回最佳源
+    return best_source_from_status(status)
+
+def best_source_from_status(status: Dict) -> Dict[str, Any]:
+    """由一次检测结果得出最佳数据源（结构同 get_best_source）"""
     if status.get("has_available"):
         return {
             "source_type": "nitter",
@@ -220,6 +272,43 @@ def get_best_source() -> Dict[str, Any]:
             "sources": DOMESTIC_ALTERNATIVES,
         }
 
+class SourceRefresher:
+    """
+    后台定时刷新数据源（常驻进程使用）
+
+    - start()：先同步取一次最佳数据源，再启动后台线程每 interval 秒重新检测
+    - current()：最近一次的最佳数据源（不读文件、不阻塞）
+    - stop()：停止后台线程
+    """
+
+    def __init__(self, interval: float = REFRESH_INTERVAL):
+        self.interval = interval
+        self._best: Dict[str, Any] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> Dict[str, Any]:
+        self._best = get_best_source()
+        self._thread = threading.Thread(target=self._run, name="source-refresher", daemon=True)
+        self._thread.start()
+        return self._best
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self._best = best_source_from_status(refresh_status())
+            except Exception as e:
+                # 检测失败时保留上一次结果
+                print(f"数据源刷新失败：{str(e)[:100]}")
+
+    def current(self) -> Dict[str, Any]:
+        return self._best or get_best_source()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=1)
+
 if __name__ == "__main__":
     print("=" * 60)
     print("Nitter 实例可用性检测")
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# =============================================================================
+# 搜索查询编译（TechPulse Scout）
+# 功能：把「关键词 × 限定站点」编译为搜索查询
+#       - 后端支持时，同一关键词的多个 site: 限定合并为一条 OR 查询
+#         （kw (site:a OR site:b ...)），结果再按站点拆回各自分桶
+#       - 后端不支持时（结果不落在任何限定站点），退回逐站点单独查询
+# 配置：环境变量 SCOUT_SITE_OR = auto（默认，按实际结果自动判断）/ on（始终合并）/ off（始终分开）
+# =============================================================================
+
+import os
+import threading
+from typing import Dict, List, Any, Optional, Sequence
+from urllib.parse import urlsplit
+
+SITE_OR_ENV = "SCOUT_SITE_OR"
+SITE_OR_MODES = ("auto", "on", "off")
+
+# auto 模式：连续该次数合并查询都没有命中任何限定站点，即判定后端不支持 OR，本进程内不再合并
+SITE_OR_MAX_MISSES = 2
+
+class SiteQuery:
+    """
+    一条搜索查询
+    sites 为空：通用搜索（关键词 + suffix）；一个站点：单站点查询；多个站点：OR 合并查询
+    站点可带路径前缀（如 nitter.net/elonmusk）
+    """
+
+    __slots__ = ("keyword", "sites", "suffix")
+
+    def __init__(self, keyword: str, sites: Sequence[str] = (), suffix: str = ""):
+        self.keyword = keyword
+        self.sites = list(sites)
+        self.suffix = suffix
+
+    @property
+    def merged(self) -> bool:
+        return len(self.sites) > 1
+
+    def text(self) -> str:
+        """查询字符串"""
+        if not self.sites:
+            return f"{self.keyword} {self.suffix}".strip()
+        if len(self.sites) == 1:
+            return f"{self.keyword} site:{self.sites[0]}"
+        return f"{self.keyword} (" + " OR ".join(f"site:{site}" for site in self.sites) + ")"
+
+    def split(self) -> List["SiteQuery"]:
+        """拆成逐站点的单独查询"""
+        return [SiteQuery(self.keyword, [site]) for site in self.sites]
+
+    def __repr__(self) -> str:
+        return f"SiteQuery({self.text()!r})"
+
+def compile_queries(keywords: Sequence[str], sites: Sequence[str], generic_suffix: str = "",
+                    merge: bool = True) -> List[SiteQuery]:
+    """
+    编译某个领域的查询列表
+    每个关键词：限定站点查询（merge=True 时合并为一条，否则每站点一条）+ 通用搜索（generic_suffix 非空时）
+    查询顺序与逐站点查询一致，合并后结果按站点顺序拆回，整体顺序不变
+    """
+    queries = []
+    for kw in keywords:
+        site_query = SiteQuery(kw, sites)
+        queries.extend([site_query] if merge and site_query.merged else site_query.split())
+        if generic_suffix:
+            queries.append(SiteQuery(kw, suffix=generic_suffix))
+    return queries
+
+def match_site(url: str, site: str) -> bool:
+    """URL 是否落在限定站点内（主机名相同或为其子域；站点带路径时还需路径前缀一致，不区分大小写）"""
+    try:
+        parts = urlsplit(url if "://" in url else "https://" + url)
+        host = (parts.hostname or "").lower()
+    except ValueError:
+        return False
+    site_host, _, site_path = site.lower().partition("/")
+    if host != site_host and not host.endswith("." + site_host):
+        return False
+    if not site_path:
+        return True
+    path = parts.path.lower().rstrip("/") + "/"
+    return path.startswith("/" + site_path.rstrip("/") + "/")
+
+def split_by_site(results: List[Dict[str, Any]], sites: Sequence[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    合并查询的结果按限定站点拆回分桶（保持各自的原始排名）
+    每条结果归入第一个匹配的站点；不属于任何限定站点的结果丢弃
+    """
+    buckets: Dict[str, List[Dict[str, Any]]] = {site: [] for site in sites}
+    for result in results:
+        site = next((s for s in sites if match_site(result.get("url", ""), s)), None)
+        if site is not None:
+            buckets[site].append(result)
+    return buckets
+
+class SiteOrSupport:
+    """
+    后端是否支持 site: OR 合并（多线程共享）
+
+    - on / off：固定合并 / 不合并
+    - auto：默认合并；合并查询成功返回但没有命中任何限定站点时，调用方对该关键词退回逐站点查询，
+      连续 SITE_OR_MAX_MISSES 次如此即判定不支持，本进程内不再合并
+    """
+
+    def __init__(self, mode: Optional[str] = None):
+        mode = (mode or os.getenv(SITE_OR_ENV, "auto")).strip().lower()
+        self.mode = mode if mode in SITE_OR_MODES else "auto"
+        self._enabled = self.mode != "off"
+        self._misses = 0
+        self._lock = threading.Lock()
+        self.merged_queries = 0
+        self.fallbacks = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @property
+    def fallback_allowed(self) -> bool:
+        """合并查询未命中时是否退回逐站点查询（on 模式信任后端，不退回）"""
+        return self.mode == "auto"
+
+    def record(self, hit: bool) -> bool:
+        """
+        记录一次合并查询的结果（hit：至少一条结果落在限定站点内）
+        返回：本次是否刚判定为不支持（调用方据此记日志）
+        """
+        with self._lock:
+            self.merged_queries += 1
+            if hit:
+                self._misses = 0
+                return False
+            self.fallbacks += 1
+            self._misses += 1
+            if self.mode == "auto" and self._enabled and self._misses >= SITE_OR_MAX_MISSES:
+                self._enabled = False
+                return True
+            return False
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# =============================================================================
+# 令牌桶限速（TechPulse Scout）
+# 功能：多线程共享的全局搜索速率上限，令牌按固定速率补充，桶满后不再累积，
+#       允许短时突发但长期速率不超过设定值
+# =============================================================================
+
+import time
+import threading
+from typing import Optional
+
+class TokenBucket:
+    """
+    令牌桶
+
+    rate_per_minute：每分钟补充的令牌数（长期速率上限）
+    burst：桶容量（允许的突发次数），启动时桶满
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.waited_seconds = 0.0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """有令牌则取走一个并返回 True，否则立即返回 False"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self.acquired += 1
+                return True
+            return False
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """取一个令牌，不足时等待补充；超过 timeout 秒仍未取到返回 False"""
+        started = time.monotonic()
+        deadline = started + timeout if timeout is not None else None
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    self.acquired += 1
+                    self.waited_seconds += now - started
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if deadline is not None:
+                if now + wait > deadline:
+                    return False
+            time.sleep(wait)
+
+    def available(self) -> float:
+        """当前可用令牌数"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
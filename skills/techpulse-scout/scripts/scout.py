@@ -2,19 +2,35 @@
 # =============================================================================
 # TechPulse Scout - 科技脉搏·侦察兵
 # 功能：轻量级扫描、去重过滤、重要性评分、结构化输出
-# 执行频率：每 1-2 小时
+# 执行频率：每 1-2 小时；--watch 常驻运行，各领域按自适应间隔轮询
 # 输出：JSON 事件列表（仅 High/Medium）
 # =============================================================================
 
 import os
 import sys
+import logging
 import json
+import time
+import signal
 import hashlib
+import argparse
+import threading
 import subprocess
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from difflib import SequenceMatcher
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+
+from event_store import EventStore
+from dedup_index import DedupIndex
+from artifact_index import write_artifact, record_artifact, TYPE_SCOUT_EVENTS, TYPE_SCOUT_STREAM
+from event_stream import EventStreamWriter, stream_path_for, STATUS_COMPLETED, STATUS_FAILED
+from rate_limiter import TokenBucket
+from news_item import NewsItem
+from source_registry import source_class
+from url_canon import canonical_url
+from query_compiler import SiteOrSupport, compile_queries, split_by_site
+from log_config import setup_logger, LOG_LEVELS
 
 # ==================== 配置区域 ====================
 WORKSPACE = Path("/home/admin/.openclaw/workspace")
@@ -22,8 +38,11 @@ SKILL_DIR = WORKSPACE / "skills" / "techpulse-scout"
 SEARXNG_DIR = WORKSPACE / "skills" / "searxng"
 LOG_FILE = SKILL_DIR / "logs" / "scout.log"
 DATA_DIR = SKILL_DIR / "data"
-EVENTS_FILE = DATA_DIR / "known_events.json"
+EVENTS_FILE = DATA_DIR / "known_events.json"  # 旧版事件库，首次运行时导入 EVENTS_DB
+EVENTS_DB = DATA_DIR / "events.db"
 OUTPUT_FILE = SKILL_DIR / "events" / f"events-{datetime.now().strftime('%Y%m%d-%H%M')}.json"
+STREAM_FILE = stream_path_for(OUTPUT_FILE)  # 事件流：边扫描边追加，下游可提前开始分析
+ARTIFACT_INDEX = WORKSPACE / "data" / "artifact-index.json"  # 产出物索引（两个技能共用）
 
 # 监控领域和关键词
 MONITORED_DOMAINS = {
@@ -49,6 +68,51 @@ MONITORED_DOMAINS = {
     "汇率波动": ["美元", "人民币", "汇率", "USD", "CNY", "日元", "欧元", "外汇"],
 }
 
+# 并发扫描：同时扫描的领域数、全局同时进行的搜索数上限、单个领域的时间上限（秒）
+SCAN_WORKERS = 6
+MAX_CONCURRENT_SEARCHES = 4
+DOMAIN_TIMEOUT = 240
+
+# 单次搜索超时（秒）
+SEARCH_TIMEOUT = 60
+
+# 全局搜索并发闸门（所有领域共享，避免同时打满 SearXNG）
+SEARCH_SLOTS = threading.BoundedSemaphore(MAX_CONCURRENT_SEARCHES)
+
+# 领域扫描的搜索站点：权威财经媒体（始终包含）、Nitter 不可用时的国内替代源、Nitter 可用时查询的 X 账号
+AUTHORITATIVE_SITES = ["cls.cn", "stcn.com", "bloomberg.com"]  # 财联社、证券时报、彭博
+DOMESTIC_ALT_SITES = ["wallstreetcn.com", "36kr.com"]  # 华尔街见闻、36 氪
+NITTER_ACCOUNTS = ["elonmusk", "OpenAI"]
+GENERIC_QUERY_SUFFIX = "最新进展 2026"  # 通用搜索（备选）
+
+# 单个领域：参与搜索的关键词数、搜索次数上限、结果条数上限；每个站点（或通用搜索）取前 N 条
+DOMAIN_KEYWORDS = 4
+MAX_QUERIES_PER_DOMAIN = 15
+MAX_NEWS_PER_DOMAIN = 12
+RESULTS_PER_SITE = 2
+SEARCH_RESULTS_PER_SITE = 3  # 每次搜索向后端请求的条数（合并查询按站点数放大）
+
+# site: OR 合并查询支持情况（进程内共享，环境变量 SCOUT_SITE_OR 控制，见 query_compiler.py）
+SITE_OR = SiteOrSupport()
+
+# watch 模式：领域轮询间隔（秒）。有新事件时间隔乘以 WATCH_SHRINK_FACTOR，
+# 扫描无新事件时乘以 WATCH_GROWTH_FACTOR，始终限制在 [最小, 最大] 之间
+WATCH_INITIAL_INTERVAL = 1800
+WATCH_MIN_INTERVAL = 300
+WATCH_MAX_INTERVAL = 7200
+WATCH_SHRINK_FACTOR = 0.5
+WATCH_GROWTH_FACTOR = 1.5
+
+# watch 模式：全局搜索速率上限（令牌桶，每分钟次数 / 突发次数）
+WATCH_SEARCHES_PER_MINUTE = 30
+WATCH_SEARCH_BURST = 15
+
+# watch 模式：事件流心跳间隔、维护间隔（过期淘汰）、数据源后台复检间隔、事件流轮换周期（秒）
+WATCH_HEARTBEAT_INTERVAL = 60
+WATCH_MAINTENANCE_INTERVAL = 3600
+WATCH_SOURCE_REFRESH_INTERVAL = 1800
+WATCH_STREAM_ROTATE_SECONDS = 24 * 3600
+
 # 权威性评分（优化：X 平台权威账号单独分类）
 SOURCE_AUTHORITY_SCORES = {
     "官方公告": 100,  # SEC/巨潮/港交所/公司官网
@@ -74,86 +138,27 @@ BREAKTHROUGH_KEYWORDS = [
     "新一代", "革命性", "重大进展", "正式", "宣布", "启动", "确认",
 ]
 
-# 权威 X 账号白名单（投资合伙人指定高价值信源）
-# 分类：AI/大模型 | 半导体/硬件 | 新能源汽车/自动驾驶 | 宏观/创投
-AUTHORITATIVE_X_ACCOUNTS = {
-    # ==================== 1. 人工智能 (AI) & 大模型 ====================
-    "sama": "Sam Altman (OpenAI CEO) - GPT 系列/算力合作",
-    "elonmusk": "Elon Musk (xAI/Tesla AI/Optimus) - FSD/Dojo 超算",
-    "ylecun": "Yann LeCun (Meta 首席 AI 科学家) - 开源派/技术瓶颈",
-    "karpathy": "Andrej Karpathy (Eureka Labs) - LLM 原理/训练细节",
-    "DarioAmodei": "Dario Amodei (Anthropic CEO) - AI 安全/Claude",
-    "JensenHuang": "Jensen Huang (NVIDIA) - GPU 出货/新架构",
-    "runwayml": "Runway ML - 视频生成/Sora 类技术",
-    "OpenAI": "OpenAI 官方",
-    "AnthropicAI": "Anthropic (Claude) 官方",
-    "nvidia": "NVIDIA 官方",
-    "MetaAI": "Meta AI 官方",
-    
-    # ==================== 2. 半导体 & 硬件制造 ====================
-    "TSMC": "台积电官方 - 扩产计划/财报",
-    "ASML": "ASML 官方 - EUV 设备交付",
-    "patgelsinger": "Pat Gelsinger (Intel CEO) - IDM 2.0",
-    "LisaSu": "Lisa Su (AMD CEO) - AI 芯片/数据中心",
-    "SemiAnalysis": "SemiAnalysis (Dylan Patel) - 硬核半导体分析",
-    "ICInsights": "IC Insights - 半导体市场数据",
-    "AMD": "AMD 官方",
-    "Intel": "Intel 官方",
-    
-    # ==================== 3. 新能源汽车 (EV) & 自动驾驶 ====================
-    "Tesla": "Tesla 官方 - Battery Day/FSD",
-    "TeslaAI": "Tesla AI 官方",
-    "LiBin_CN": "李斌 (蔚来) - 换电联盟",
-    "NIO": "蔚来汽车官方",
-    "XPengMotors": "小鹏汽车 - 智驾/MONA 系列",
-    "BYDCompany": "比亚迪 - 高端化/出海",
-    "CathieDWood": "Cathie Wood (ARK Invest) - Tesla 估值/Big Ideas",
-    "SawyerMerritt": "Sawyer Merritt - Tesla/EV 数据分析",
-    
-    # ==================== 4. 宏观、创投与深度分析 ====================
-    "a16z": "a16z 官方 - AI/Crypto/Bio 布局",
-    "bhorowitz": "Ben Horowitz (a16z) - 创投趋势",
-    "msacks": "Marc Sacks (a16z) - 投资洞察",
-    "benedictevans": "Benedict Evans - 科技趋势宏观分析",
-    "mattlevine": "Matt Levine (Bloomberg) - 科技并购/资本运作",
-    "theinformation": "The Information - 独家重磅爆料",
-    "technology": "Bloomberg Tech - 实时财经科技新闻",
-    
-    # ==================== 5. 政治人物 ====================
-    "realDonaldTrump": "特朗普 - 政策/关税",
-    "POTUS": "美国总统官方",
-    "WhiteHouse": "白宫官方",
-    
-    # ==================== 6. 科技媒体 ====================
-    "BloombergTech": "彭博科技",
-    "ReutersTech": "路透科技",
-    "WSJ": "华尔街日报",
+# 权威 X 账号白名单、X/Nitter 主机与各域名的来源类型见 data/sources.json（source_registry.py）
+
+# 事件标签：公司名、技术关键词、X 关键人物（账号 → 显示名称）
+TAG_COMPANIES = ["NVIDIA", "特斯拉", "比亚迪", "宁德时代", "华为", "ASML", "台积电", "英特尔", "AMD", "OpenAI", "Anthropic", "SpaceX"]
+TAG_TECH_KEYWORDS = ["HBM", "CoWoS", "GAA", "EUV", "FSD", "eVTOL", "6G", "量子"]
+TAG_X_ACCOUNTS = {
+    "elonmusk": "马斯克",
+    "OpenAI": "OpenAI",
+    "sama": "Sam Altman",
+    "AnthropicAI": "Anthropic",
+    "realDonaldTrump": "特朗普",
+    "NVIDIA": "NVIDIA 官方",
+    "Tesla": "Tesla 官方",
+    "SpaceX": "SpaceX 官方",
 }
+MAX_TAGS = 8
 
-# 权威 X 账号域名模式
-AUTHORITATIVE_X_PATTERNS = [
-    "twitter.com/elonmusk",
-    "twitter.com/OpenAI",
-    "twitter.com/sama",
-    "twitter.com/AnthropicAI",
-    "twitter.com/DarioAmodei",
-    "twitter.com/realDonaldTrump",
-    "twitter.com/BloombergTech",
-    "twitter.com/ReutersTech",
-    "twitter.com/NVIDIA",
-    "twitter.com/Tesla",
-    "twitter.com/SpaceX",
-    "x.com/elonmusk",
-    "x.com/OpenAI",
-    # Nitter 实例（X 的开源前端，无需 API）
-    "nitter.net/elonmusk",
-    "nitter.net/OpenAI",
-    "nitter.net/sama",
-    "nitter.net/realDonaldTrump",
-    "nitter.net/NVIDIA",
-    "nitter.net/Tesla",
-    "nitter.net/SpaceX",
-]
+# 预先转小写的匹配词（与 news.text_lower 比较）
+_TAG_COMPANY_TERMS = [(c.lower(), c) for c in TAG_COMPANIES]
+_TAG_TECH_TERMS = [(kw.lower(), kw) for kw in TAG_TECH_KEYWORDS]
+_TAG_X_PATTERNS = [((f"twitter.com/{a.lower()}", f"x.com/{a.lower()}"), name) for a, name in TAG_X_ACCOUNTS.items()]
 
 # Nitter 实例列表（X 的开源前端，无需 API 密钥）
 NITTER_INSTANCES = [
@@ -164,13 +169,10 @@ NITTER_INSTANCES = [
 ]
 
 # ==================== 日志函数 ====================
-def log(message: str):
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    log_msg = f"[{timestamp}] {message}"
-    print(log_msg)
-    LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(log_msg + "\n")
+LOGGER = setup_logger("scout", LOG_FILE)
+
+def log(message: str, level: str = "INFO"):
+    LOGGER.log(LOG_LEVELS.get(level, logging.INFO), message)
 
 # ==================== 工具函数 ====================
 def generate_event_id(title: str, source: str, timestamp: str) -> str:
@@ -181,49 +183,15 @@ def generate_event_id(title: str, source: str, timestamp: str) -> str:
     return f"evt_{date_str}_{hash_md5}"
 
 def classify_source(url: str) -> str:
-    """分类信息来源（优化：识别 Nitter/X 账号）"""
-    url_lower = url.lower()
-    
-    # 官方公告
-    if any(d in url_lower for d in ["cninfo.com.cn", "sec.gov", "hkexnews.hk", "sse.com.cn", "szse.cn"]):
-        return "官方公告"
-    
-    # 顶级财经
-    if any(d in url_lower for d in ["bloomberg.com", "reuters.com", "wsj.com", "caixin.com"]):
-        return "顶级财经"
-    
-    # 权威 X 账号（包括 Nitter）
-    if any("twitter.com/" in url_lower or "x.com/" in url_lower or "nitter.net/" in url_lower for _ in [1]):
-        for pattern in AUTHORITATIVE_X_PATTERNS:
-            if pattern in url_lower:
-                return "权威 X 账号"
-        # 检查是否在白名单中
-        for account in AUTHORITATIVE_X_ACCOUNTS.keys():
-            if any(f"{domain}/{account.lower()}" in url_lower for domain in ["twitter.com", "x.com", "nitter.net"]):
-                return "权威 X 账号"
-        # 普通 X 账号
-        return "普通 X 账号"
-    
-    # 科技媒体
-    if any(d in url_lower for d in ["36kr.com", "anandtech.com", "eetimes.com", "techcrunch.com"]):
-        return "科技媒体"
-    
-    # 主流财经
-    if any(d in url_lower for d in ["eastmoney.com", "10jqka.com.cn", "sina.com.cn", "cls.cn", "stcn.com"]):
-        return "主流财经"
-    
-    # 社交媒体
-    if any(d in url_lower for d in ["zhihu.com", "weibo.com"]):
-        return "社交媒体"
-    
-    return "未知来源"
-
-def calculate_priority_score(news: Dict, domain: str) -> int:
+    """分类信息来源（按可注册域名与 X 账号查信源表，见 source_registry.py）"""
+    return source_class(url)
+
+def calculate_priority_score(news: NewsItem, domain: str) -> int:
     """计算重要性评分（优化后）"""
     score = 0
     
     # 1. 来源权威性 (0-60 分) - 提高权重
-    source_type = classify_source(news.get("url", ""))
+    source_type = news.scout_class
     base_score = SOURCE_AUTHORITY_SCORES.get(source_type, 50)
     
     if source_type == "官方公告":
@@ -238,7 +206,7 @@ def calculate_priority_score(news: Dict, domain: str) -> int:
         score += 20
     
     # 2. 突破关键词 (0-30 分)
-    text = (news.get("title", "") + " " + news.get("content", "")).lower()
+    text = news.text_lower
     breakthrough_count = sum(1 for kw in BREAKTHROUGH_KEYWORDS if kw.lower() in text)
     score += min(breakthrough_count * 10, 30)
     
@@ -258,233 +226,273 @@ def get_priority(score: int) -> str:
     else:
         return "LOW"
 
-def extract_tags(domain: str, text: str) -> List[str]:
-    """提取标签（优化：识别 X 账号）"""
-    tags = [domain]
+def extract_entities(news: NewsItem, domain: str) -> Dict[str, List[str]]:
+    """
+    一次提取标签、公司和 X 账号（复用评分时已缓存的 news.text_lower）
+    返回：{"tags": [领域, 公司..., 技术..., "X:名称"...]（最多 MAX_TAGS 个，顺序固定），
+           "companies": 标签中除领域外的部分, "x_accounts": 命中的 X 账号名称}
+    """
+    text = news.text_lower
+    x_accounts = [name for patterns, name in _TAG_X_PATTERNS if any(p in text for p in patterns)]
     
-    # 提取公司名
-    companies = ["NVIDIA", "特斯拉", "比亚迪", "宁德时代", "华为", "ASML", "台积电", "英特尔", "AMD", "OpenAI", "Anthropic", "SpaceX"]
-    for company in companies:
-        if company.lower() in text.lower():
-            tags.append(company)
-    
-    # 提取技术关键词
-    tech_keywords = ["HBM", "CoWoS", "GAA", "EUV", "FSD", "eVTOL", "6G", "量子"]
-    for kw in tech_keywords:
-        if kw.lower() in text.lower():
-            tags.append(kw)
-    
-    # 识别 X 账号（关键人物）
-    x_accounts = {
-        "elonmusk": "马斯克",
-        "OpenAI": "OpenAI",
-        "sama": "Sam Altman",
-        "AnthropicAI": "Anthropic",
-        "realDonaldTrump": "特朗普",
-        "NVIDIA": "NVIDIA 官方",
-        "Tesla": "Tesla 官方",
-        "SpaceX": "SpaceX 官方",
+    tags = [domain]
+    tags.extend(name for term, name in _TAG_COMPANY_TERMS if term in text)
+    tags.extend(name for term, name in _TAG_TECH_TERMS if term in text)
+    tags.extend(f"X:{name}" for name in x_accounts)
+    tags = list(dict.fromkeys(tags))[:MAX_TAGS]
+    
+    return {
+        "tags": tags,
+        "companies": [t for t in tags if t not in MONITORED_DOMAINS],
+        "x_accounts": x_accounts,
     }
-    for account, name in x_accounts.items():
-        if f"twitter.com/{account}" in text.lower() or f"x.com/{account}" in text.lower():
-            tags.append(f"X:{name}")
-    
-    return list(set(tags))[:8]  # 最多 8 个标签
 
-def is_duplicate(new_event: Dict, known_events: List[Dict], hours: int = 24) -> bool:
-    """检查是否重复"""
-    cutoff_time = datetime.now() - timedelta(hours=hours)
-    
-    for event in known_events:
-        # 时间检查
-        try:
-            event_time = datetime.fromisoformat(event.get("timestamp", "").replace("Z", "+00:00"))
-            if event_time < cutoff_time:
-                continue
-        except:
-            continue
-        
-        # 标题相似度检查
-        similarity = SequenceMatcher(None, new_event["title"], event["title"]).ratio()
-        if similarity > 0.8:
-            return True
-        
-        # URL 相同检查
-        if new_event.get("source_url") == event.get("source_url"):
-            return True
-    
-    return False
+def is_duplicate(new_event: Dict, dedup_index: DedupIndex) -> bool:
+    """检查是否重复（规范化后同 URL 或标题相似度 > 0.8，见 dedup_index.py / url_canon.py）"""
+    return dedup_index.is_duplicate(new_event)
 
-def load_known_events() -> List[Dict]:
-    """加载已知事件"""
-    if EVENTS_FILE.exists():
-        try:
-            with open(EVENTS_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            return []
-    return []
-
-def save_known_events(events: List[Dict]):
-    """保存已知事件"""
-    EVENTS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    # 只保留最近 7 天的事件
-    cutoff = datetime.now() - timedelta(days=7)
-    filtered = []
-    for event in events:
-        try:
-            event_time = datetime.fromisoformat(event.get("timestamp", "").replace("Z", "+00:00"))
-            if event_time > cutoff:
-                filtered.append(event)
-        except:
-            filtered.append(event)
-    
-    with open(EVENTS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(filtered, f, ensure_ascii=False, indent=2)
+def open_event_store() -> EventStore:
+    """打开事件库（首次运行时导入旧版 known_events.json）"""
+    store = EventStore(EVENTS_DB)
+    imported = store.import_json(EVENTS_FILE)
+    if imported:
+        log(f"已导入旧版事件库：{imported}条")
+    return store
 
 # ==================== 核心功能 ====================
-def scan_domain(domain: str, keywords: List[str]) -> List[Dict]:
-    """扫描某个领域的新闻（优化：自动选择最佳数据源）"""
+def scan_domain(domain: str, keywords: List[str], deadline: Optional[float] = None,
+                rate_limiter: Optional[TokenBucket] = None, best_source: Optional[Dict[str, Any]] = None,
+                slots: Optional[Dict[str, int]] = None) -> List[NewsItem]:
+    """
+    扫描某个领域的新闻（优化：自动选择最佳数据源）
+    deadline: time.monotonic() 截止时间，到期后停止发起新搜索并返回已获得的结果
+    rate_limiter: 全局搜索限速（watch 模式），每次搜索前取一个令牌
+    best_source: 本轮已确定的最佳数据源（get_best_source 的结果）；未传入时现查
+    slots: 传入时记录 slots[domain] = 成功返回的搜索可取的结果位总数（热点评分据此折算新闻条数）
+    """
     all_results = []
+    seen_urls = set()
     
-    # 获取最佳数据源（Nitter 或国内替代）
-    from nitter_health_check import get_best_source
-    best_source = get_best_source()
-    
-    log(f"  数据源：{best_source['source_type']} ({'Nitter' if best_source['source_type'] == 'nitter' else '国内替代'})")
+    # 最佳数据源（Nitter 或国内替代）由调用方每轮确定一次
+    if best_source is None:
+        from nitter_health_check import get_best_source
+        best_source = get_best_source()
     
-    # 构建搜索查询
-    queries = []
+    log(f"  数据源：{best_source['source_type']} ({'Nitter' if best_source['source_type'] == 'nitter' else '国内替代'})", "DEBUG")
     
-    for kw in keywords[:4]:
-        # 权威财经媒体（始终包含）
-        queries.append(f"{kw} site:cls.cn")  # 财联社
-        queries.append(f"{kw} site:stcn.com")  # 证券时报
-        queries.append(f"{kw} site:bloomberg.com")  # 彭博
+    # 限定站点（Nitter 可用时查询 X 账号，否则使用国内替代源）
+    sites = list(AUTHORITATIVE_SITES)
+    if best_source["source_type"] == "nitter" and best_source.get("source_url"):
+        nitter_domain = best_source["source_url"].replace("https://", "").rstrip("/")
+        sites += [f"{nitter_domain}/{account}" for account in NITTER_ACCOUNTS]
+    else:
+        sites += DOMESTIC_ALT_SITES
+    
+    # 构建搜索查询（后端支持时每个关键词的站点合并为一条 OR 查询）
+    pending = compile_queries(keywords[:DOMAIN_KEYWORDS], sites, GENERIC_QUERY_SUFFIX, merge=SITE_OR.enabled)
+    searches = 0
+    result_slots = 0
+    
+    while pending and searches < MAX_QUERIES_PER_DOMAIN:
+        query = pending.pop(0)
+        if query.merged and not SITE_OR.enabled:
+            # 本轮扫描中途判定后端不支持 OR，剩余合并查询改为逐站点查询
+            pending[:0] = query.split()
+            continue
+        searches += 1
+        try:
+            results = run_search(query.text(), SEARCH_RESULTS_PER_SITE * max(len(query.sites), 1), deadline, rate_limiter)
+        except TimeoutError:
+            log(f"  {domain} 扫描超时，已获得 {len(all_results)} 条")
+            break
+        if results is None:
+            continue
         
-        # 根据数据源类型添加特定查询
-        if best_source["source_type"] == "nitter" and best_source.get("source_url"):
-            # Nitter 可用，添加 X 平台查询
-            nitter_domain = best_source["source_url"].replace("https://", "")
-            queries.append(f"{kw} site:{nitter_domain}/elonmusk")
-            queries.append(f"{kw} site:{nitter_domain}/OpenAI")
+        if query.merged:
+            buckets = split_by_site(results, query.sites)
+            hit = any(buckets.values())
+            if SITE_OR.record(hit):
+                log("  搜索后端不支持 site: OR 合并，改为逐站点查询", "WARNING")
+            if not hit and SITE_OR.fallback_allowed:
+                pending[:0] = query.split()
+                continue
+            results = [r for site in query.sites for r in buckets[site][:RESULTS_PER_SITE]]
         else:
-            # Nitter 不可用，使用国内替代源
-            queries.append(f"{kw} site:wallstreetcn.com")  # 华尔街见闻
-            queries.append(f"{kw} site:36kr.com")  # 36 氪
+            results = results[:RESULTS_PER_SITE]
+        result_slots += RESULTS_PER_SITE * max(len(query.sites), 1)
         
-        # 通用搜索（备选）
-        queries.append(f"{kw} 最新进展 2026")
-    
-    for query in queries[:15]:
-        try:
-            cmd = ["uv", "run", "scripts/searxng.py", "search", query, "-n", "3", "--format", "json"]
-            result = subprocess.run(cmd, cwd=SEARXNG_DIR, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, timeout=60)
-            
-            if result.returncode == 0:
-                try:
-                    data = json.loads(result.stdout)
-                    for r in data.get("results", [])[:2]:
-                        news = {
-                            "title": r.get("title", ""),
-                            "url": r.get("url", ""),
-                            "content": r.get("content", ""),
-                            "domain": domain,
-                        }
-                        # 去重 + 过滤低质
-                        if news["url"] not in [n["url"] for n in all_results]:
-                            # 过滤知乎问答/维基/百度百科
-                            if any(x in news["url"].lower() for x in ["zhihu.com/question", "wikipedia", "baike.baidu.com"]):
-                                continue
-                            all_results.append(news)
-                except:
-                    pass
-        except Exception as e:
-            log(f"  搜索失败：{str(e)[:50]}")
+        for r in results:
+            news = NewsItem.from_search_result(r, domain=domain)
+            url_key = canonical_url(news.url)
+            # 去重（规范化 URL）+ 过滤低质
+            if url_key not in seen_urls:
+                # 过滤知乎问答/维基/百度百科
+                if any(x in news.url_lower for x in ["zhihu.com/question", "wikipedia", "baike.baidu.com"]):
+                    continue
+                seen_urls.add(url_key)
+                all_results.append(news)
         
-        if len(all_results) >= 12:
+        if len(all_results) >= MAX_NEWS_PER_DOMAIN:
             break
     
-    return all_results[:12]
+    if slots is not None:
+        slots[domain] = result_slots
+    return all_results[:MAX_NEWS_PER_DOMAIN]
 
-def process_news(news: Dict, known_events: List[Dict]) -> Optional[Dict]:
+def run_search(query: str, count: int, deadline: Optional[float] = None,
+               rate_limiter: Optional[TokenBucket] = None) -> Optional[List[Dict[str, Any]]]:
+    """
+    执行一次 SearXNG 搜索（受全局限速、并发闸门与截止时间约束）
+    返回：搜索结果列表；搜索失败返回 None；截止时间前未能发起搜索时抛出 TimeoutError
+    """
+    remaining = deadline - time.monotonic() if deadline else SEARCH_TIMEOUT
+    if rate_limiter and remaining > 0 and not rate_limiter.acquire(timeout=remaining):
+        remaining = 0
+    if remaining <= 0 or not SEARCH_SLOTS.acquire(timeout=remaining):
+        raise TimeoutError(query)
+    try:
+        remaining = deadline - time.monotonic() if deadline else SEARCH_TIMEOUT
+        cmd = ["uv", "run", "scripts/searxng.py", "search", query, "-n", str(count), "--format", "json"]
+        result = subprocess.run(cmd, cwd=SEARXNG_DIR, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True,
+                                timeout=max(min(SEARCH_TIMEOUT, remaining), 1))
+        if result.returncode != 0:
+            return None
+        return json.loads(result.stdout).get("results", [])
+    except Exception as e:
+        log(f"  搜索失败：{str(e)[:50]}")
+        return None
+    finally:
+        SEARCH_SLOTS.release()
+
+def process_news(news: NewsItem, dedup_index: DedupIndex, store: Optional[EventStore] = None) -> Optional[Dict]:
     """处理单条新闻，生成事件"""
-    domain = news.get("domain", "未知")
+    news = NewsItem.from_dict(news)
+    domain = news.domain or "未知"
     
     # 计算评分
     score = calculate_priority_score(news, domain)
     priority = get_priority(score)
+    entities = extract_entities(news, domain)
     
     # 生成事件
     event = {
-        "id": generate_event_id(news["title"], news["url"], datetime.now().isoformat()),
+        "id": generate_event_id(news.title, news.url, datetime.now().isoformat()),
         "priority": priority,
-        "title": news["title"],
-        "summary": news["content"][:200] if news.get("content") else news["title"],
-        "tags": extract_tags(domain, news["title"] + " " + news.get("content", "")),
-        "source_url": news["url"],
-        "source_type": classify_source(news["url"]),
+        "title": news.title,
+        "summary": news.content[:200] if news.content else news.title,
+        "tags": entities["tags"],
+        "source_url": news.url,
+        "source_type": news.scout_class,
         "timestamp": datetime.now().isoformat() + "Z",
-        "companies": [t for t in extract_tags(domain, news["title"] + " " + news.get("content", "")) if t not in MONITORED_DOMAINS],
+        "companies": entities["companies"],
         "score": score,
         "trigger_next": priority in ["HIGH", "MEDIUM"],
     }
     
-    # 去重检查
-    if is_duplicate(event, known_events):
+    # 去重检查（先查索引：URL/标题指纹完全相同，再做标题相似度比对）
+    if store and (store.has_url(event["source_url"]) or store.has_title(event["title"])):
+        log(f"  跳过重复：{event['title'][:50]}...")
+        return None
+    if is_duplicate(event, dedup_index):
         log(f"  跳过重复：{event['title'][:50]}...")
         return None
     
+    # 加入索引，本轮后续领域中的同一新闻/相似标题也视为重复
+    dedup_index.add(event)
     return event
 
-# ==================== 主流程 ====================
-def main():
-    """主入口"""
-    log("=" * 60)
-    log("TechPulse Scout - 科技脉搏·侦察兵启动")
-    log("=" * 60)
-    
+def collect_domain(domain: str, keywords: List[str], best_source: Optional[Dict[str, Any]] = None,
+                   slots: Optional[Dict[str, int]] = None) -> List[NewsItem]:
+    """扫描单个领域（限时 DOMAIN_TIMEOUT，失败返回空列表），供并发扫描与共用主题引擎调用"""
+    log(f"扫描：{domain}...")
+    started = time.monotonic()
     try:
-        # 先检测 Nitter 实例可用性
-        log("检测数据源可用性...")
-        from nitter_health_check import check_all_nitter_instances, save_status, get_best_source
-        
-        nitter_status = check_all_nitter_instances()
-        save_status(nitter_status)
+        news_list = scan_domain(domain, keywords, deadline=started + DOMAIN_TIMEOUT, best_source=best_source, slots=slots)
+    except Exception as e:
+        log(f"  {domain} 扫描失败：{str(e)[:100]}")
+        return []
+    log(f"  {domain} 完成：{len(news_list)} 条（{time.monotonic() - started:.1f}s）")
+    return news_list
+
+def scan_all_domains(best_source: Optional[Dict[str, Any]] = None) -> Iterator[Tuple[str, List[NewsItem]]]:
+    """
+    并发扫描全部领域（每个领域一个任务，搜索数受全局闸门限制，共用同一数据源选择）
+    按 MONITORED_DOMAINS 顺序逐个产出 (领域, 新闻列表)：某领域及其之前的领域都扫描完即产出，
+    不等其余领域；产出顺序与完成先后无关，去重结果保持确定
+    """
+    with ThreadPoolExecutor(max_workers=SCAN_WORKERS, thread_name_prefix="scan") as pool:
+        futures = {domain: pool.submit(collect_domain, domain, keywords, best_source)
+                   for domain, keywords in MONITORED_DOMAINS.items()}
+        for domain, future in futures.items():
+            yield domain, future.result()
+
+# ==================== 主流程 ====================
+def run_scan(topic_news: Optional[Iterator[Tuple[str, List[NewsItem]]]] = None,
+             best_source: Optional[Dict[str, Any]] = None) -> Dict:
+    """
+    执行一次完整扫描，返回输出内容（异常直接抛出，供流水线判断失败）
+    topic_news: 已由共用主题引擎（topic_engine.py）采集的 (主题, 新闻列表)，
+                只处理 MONITORED_DOMAINS 中的主题；未传入时自行扫描全部领域
+    best_source: 调用方已确定的最佳数据源；未传入时本轮检测一次
+    """
+    # 事件流最先创建并登记到产出物索引，下游在扫描进行中即可找到
+    # 异常退出时 stream 补写失败汇总（含登记索引失败），下游不必等到超时；
+    # 扫描期间定时写心跳，长时间没有新事件时下游也不会误判扫描已结束
+    with EventStreamWriter(STREAM_FILE) as stream:
+        stream.start_heartbeat()
+        record_artifact(ARTIFACT_INDEX, TYPE_SCOUT_STREAM, STREAM_FILE)
+        log(f"事件流：{STREAM_FILE}")
         
-        best_source = get_best_source()
+        # 先检测 Nitter 实例可用性（本轮只检测一次，结果传给各领域扫描，不再逐领域读取状态文件）
+        if best_source is None:
+            log("检测数据源可用性...")
+            from nitter_health_check import refresh_status, best_source_from_status
+            best_source = best_source_from_status(refresh_status())
         if best_source["source_type"] == "nitter":
             log(f"✅ 使用 Nitter: {best_source['source_url']}")
         else:
             log(f"🔄 使用国内替代源：财联社/华尔街见闻/36 氪")
         
-        # 加载已知事件
-        known_events = load_known_events()
-        log(f"已知事件库：{len(known_events)}条")
+        # 加载已知事件（去重只需最近 24 小时）
+        store = open_event_store()
+        dedup_index = DedupIndex(hours=24)
+        dedup_index.add_all(store.recent(24))
+        log(f"已知事件库：{store.count()}条（最近 24 小时 {len(dedup_index)}条）")
         
-        # 扫描所有领域
-        all_events = []
-        for domain, keywords in MONITORED_DOMAINS.items():
-            log(f"扫描：{domain}...")
-            news_list = scan_domain(domain, keywords)
-            
-            for news in news_list:
-                event = process_news(news, known_events)
-                if event:
-                    all_events.append(event)
-                    log(f"  + {event['priority']}: {event['title'][:50]}...")
+        try:
+            # 并发扫描所有领域，按领域顺序逐条处理（去重结果与完成先后无关），
+            # High/Medium 事件确认后立即写入事件流
+            scan_started = time.monotonic()
+            all_events = []
+            news_count = 0
+            for domain, news_list in topic_news or scan_all_domains(best_source):
+                if domain not in MONITORED_DOMAINS:
+                    continue
+                news_count += len(news_list)
+                for news in news_list:
+                    event = process_news(news, dedup_index, store)
+                    if event:
+                        all_events.append(event)
+                        log(f"  + {event['priority']}: {event['title'][:50]}...")
+                        if event["priority"] in ["HIGH", "MEDIUM"]:
+                            stream.emit(event)
+            log(f"领域扫描完成：{news_count} 条新闻（{time.monotonic() - scan_started:.1f}s）")
         
-        # 按优先级排序
-        priority_order = {"HIGH": 0, "MEDIUM": 1, "LOW": 2}
-        all_events.sort(key=lambda x: (priority_order.get(x["priority"], 3), -x["score"]))
+            # 按优先级排序
+            priority_order = {"HIGH": 0, "MEDIUM": 1, "LOW": 2}
+            all_events.sort(key=lambda x: (priority_order.get(x["priority"], 3), -x["score"]))
         
-        # 分离 High/Medium 和 Low
-        high_medium_events = [e for e in all_events if e["priority"] in ["HIGH", "MEDIUM"]]
-        low_events = [e for e in all_events if e["priority"] == "LOW"]
+            # 分离 High/Medium 和 Low
+            high_medium_events = [e for e in all_events if e["priority"] in ["HIGH", "MEDIUM"]]
+            low_events = [e for e in all_events if e["priority"] == "LOW"]
         
-        # 保存已知事件
-        all_known = known_events + all_events
-        save_known_events(all_known)
+            # 保存已知事件：增量插入新事件，删除过期事件
+            inserted = store.insert(all_events)
+            expired = store.expire()
+            log(f"事件库更新：新增 {inserted}条，过期删除 {expired}条")
+        
+        finally:
+            store.close()
         
         # 生成输出
         output = {
@@ -501,31 +509,212 @@ def main():
         }
         
         # 保存输出
-        OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-            json.dump(output, f, ensure_ascii=False, indent=2)
-        log(f"输出已保存：{OUTPUT_FILE}")
-        
-        # 输出摘要
-        log("=" * 60)
-        log(f"扫描完成：{len(MONITORED_DOMAINS)}个领域，发现{len(all_events)}个事件")
-        log(f"High: {output['high_priority']}, Medium: {output['medium_priority']}, Low: {output['low_priority']}")
-        
-        if high_medium_events:
-            log(f"\n触发 TechChain Insight: ✅")
-            log(f"待分析事件：{len(high_medium_events)}个")
-            for e in high_medium_events[:5]:
-                log(f"  - [{e['priority']}] {e['title'][:60]}...")
-        else:
-            log(f"\n触发 TechChain Insight: ❌")
-            log(f"无 High/Medium 事件，流程结束")
-        
-        log("=" * 60)
+        write_artifact(ARTIFACT_INDEX, TYPE_SCOUT_EVENTS, OUTPUT_FILE, output, summary={
+            "total_events": output["total_events"],
+            "high_priority": output["high_priority"],
+            "medium_priority": output["medium_priority"],
+            "low_priority": output["low_priority"],
+        })
         
+        # 汇总记录（不含事件列表，事件已逐条写入流）
+        stream.finish(dict({k: v for k, v in output.items() if k != "events"}, events_file=str(OUTPUT_FILE)))
+    
+    log(f"输出已保存：{OUTPUT_FILE}")
+    
+    # 输出摘要
+    log("=" * 60)
+    log(f"扫描完成：{len(MONITORED_DOMAINS)}个领域，发现{len(all_events)}个事件")
+    log(f"High: {output['high_priority']}, Medium: {output['medium_priority']}, Low: {output['low_priority']}")
+    
+    if high_medium_events:
+        log(f"\n触发 TechChain Insight: ✅")
+        log(f"待分析事件：{len(high_medium_events)}个")
+        for e in high_medium_events[:5]:
+            log(f"  - [{e['priority']}] {e['title'][:60]}...")
+    else:
+        log(f"\n触发 TechChain Insight: ❌")
+        log(f"无 High/Medium 事件，流程结束")
+    
+    log("=" * 60)
+    
+    return output
+
+# ==================== 持续监控（watch 模式） ====================
+def next_poll_interval(interval: float, new_events: int) -> float:
+    """领域下次轮询间隔：有新事件缩短，无新事件放宽，限制在 [WATCH_MIN_INTERVAL, WATCH_MAX_INTERVAL]"""
+    if new_events:
+        return max(WATCH_MIN_INTERVAL, interval * WATCH_SHRINK_FACTOR)
+    return min(WATCH_MAX_INTERVAL, interval * WATCH_GROWTH_FACTOR)
+
+def open_watch_stream() -> EventStreamWriter:
+    """创建 watch 模式事件流并登记到产出物索引"""
+    path = SKILL_DIR / "events" / f"events-{datetime.now().strftime('%Y%m%d-%H%M')}-watch.jsonl"
+    stream = EventStreamWriter(path)
+    record_artifact(ARTIFACT_INDEX, TYPE_SCOUT_STREAM, path)
+    log(f"事件流：{path}")
+    return stream
+
+def run_watch(duration: float = 0) -> Dict:
+    """
+    持续监控：各领域按自适应间隔独立轮询，全部搜索共享令牌桶限速，
+    事件确认后立即写入事件流并入库
+    duration：运行时长（秒），0 表示一直运行，直到 SIGTERM / Ctrl-C
+    返回：运行汇总（与事件流最后一条汇总记录一致）
+    """
+    from nitter_health_check import SourceRefresher
+    
+    # 数据源在后台线程按固定间隔复检，各领域扫描取最近一次结果
+    log("检测数据源可用性...")
+    sources = SourceRefresher(WATCH_SOURCE_REFRESH_INTERVAL)
+    best_source = sources.start()
+    log(f"数据源：{'Nitter ' + best_source['source_url'] if best_source['source_type'] == 'nitter' else '国内替代源'}")
+    
+    limiter = TokenBucket(WATCH_SEARCHES_PER_MINUTE, WATCH_SEARCH_BURST)
+    store = open_event_store()
+    dedup_index = DedupIndex(hours=24)
+    dedup_index.add_all(store.recent(24))
+    log(f"已知事件库：{store.count()}条（最近 24 小时 {len(dedup_index)}条）")
+    log(f"watch 模式：{len(MONITORED_DOMAINS)}个领域，轮询间隔 {WATCH_MIN_INTERVAL // 60}-{WATCH_MAX_INTERVAL // 60} 分钟，"
+        f"搜索上限 {WATCH_SEARCHES_PER_MINUTE} 次/分钟")
+    
+    # SIGTERM 与 Ctrl-C 一样：停止调度新扫描，处理完进行中的领域后写汇总退出
+    stop = threading.Event()
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    
+    started = time.monotonic()
+    schedule = {domain: {"interval": WATCH_INITIAL_INTERVAL, "next_due": started} for domain in MONITORED_DOMAINS}
+    counts = {"HIGH": 0, "MEDIUM": 0, "LOW": 0}
+    stats = {"scans": 0}
+    inflight: Dict[Future, str] = {}
+    
+    def summary() -> Dict:
+        elapsed_minutes = max((time.monotonic() - started) / 60, 1e-6)
+        return {
+            "mode": "watch",
+            "scan_time": datetime.now().isoformat() + "Z",
+            "running_minutes": round(elapsed_minutes, 1),
+            "domain_scans": stats["scans"],
+            "searches": limiter.acquired,
+            "searches_per_minute": round(limiter.acquired / elapsed_minutes, 1),
+            "total_events": sum(counts.values()),
+            "high_priority": counts["HIGH"],
+            "medium_priority": counts["MEDIUM"],
+            "low_priority": counts["LOW"],
+            "intervals": {domain: round(state["interval"]) for domain, state in schedule.items()},
+        }
+    
+    def handle(domain: str, future: Future):
+        try:
+            news_list = future.result()
+        except Exception as e:
+            log(f"  {domain} 扫描失败：{str(e)[:100]}")
+            news_list = []
+        new_events = []
+        for news in news_list:
+            event = process_news(news, dedup_index, store)
+            if event:
+                new_events.append(event)
+                counts[event["priority"]] += 1
+                log(f"  + {event['priority']}: {event['title'][:50]}...")
+                if event["priority"] in ["HIGH", "MEDIUM"]:
+                    stream.emit(event)
+        if new_events:
+            store.insert(new_events)
+        state = schedule[domain]
+        state["interval"] = next_poll_interval(state["interval"], len(new_events))
+        state["next_due"] = time.monotonic() + state["interval"]
+        stats["scans"] += 1
+        log(f"  {domain}：{len(news_list)} 条新闻，新事件 {len(new_events)} 个，{state['interval'] / 60:.0f} 分钟后再扫")
+    
+    stream = open_watch_stream()
+    stream_opened = last_heartbeat = last_maintenance = started
+    status = STATUS_FAILED
+    try:
+        with ThreadPoolExecutor(max_workers=SCAN_WORKERS, thread_name_prefix="watch") as pool:
+            try:
+                while not stop.is_set():
+                    now = time.monotonic()
+                    if duration and now - started >= duration:
+                        break
+                    
+                    # 提交到期且不在扫描中的领域
+                    scanning = set(inflight.values())
+                    for domain, state in schedule.items():
+                        if domain not in scanning and state["next_due"] <= now:
+                            inflight[pool.submit(scan_domain, domain, MONITORED_DOMAINS[domain],
+                                                 now + DOMAIN_TIMEOUT, limiter, sources.current())] = domain
+                    
+                    # 等到任一领域扫描完成、下一个领域到期或该写心跳
+                    scanning = set(inflight.values())
+                    due = [state["next_due"] for domain, state in schedule.items() if domain not in scanning]
+                    timeout = min([max(t - now, 0) for t in due] + [WATCH_HEARTBEAT_INTERVAL])
+                    if duration:
+                        timeout = min(timeout, max(started + duration - now, 0))
+                    if inflight:
+                        done, _ = wait(list(inflight), timeout=timeout, return_when=FIRST_COMPLETED)
+                    else:
+                        done = set()
+                        stop.wait(timeout)
+                    for future in done:
+                        handle(inflight.pop(future), future)
+                    
+                    now = time.monotonic()
+                    if now - last_heartbeat >= WATCH_HEARTBEAT_INTERVAL:
+                        stream.heartbeat({"scanning": sorted(inflight.values())})
+                        last_heartbeat = now
+                    if now - last_maintenance >= WATCH_MAINTENANCE_INTERVAL:
+                        dedup_index.expire()
+                        expired = store.expire()
+                        log(f"维护：过期删除 {expired}条，去重索引 {len(dedup_index)}条")
+                        last_maintenance = now
+                    if now - stream_opened >= WATCH_STREAM_ROTATE_SECONDS:
+                        stream.finish(summary())
+                        stream = open_watch_stream()
+                        stream_opened = now
+            except KeyboardInterrupt:
+                log("收到中断信号，停止调度")
+            
+            # 处理完进行中的领域再退出
+            if inflight:
+                log(f"等待进行中的 {len(inflight)} 个领域扫描完成...")
+                for future in list(inflight):
+                    wait([future])
+                    handle(inflight.pop(future), future)
+        status = STATUS_COMPLETED
+    finally:
+        sources.stop()
+        result = summary()
+        stream.finish(result, status=status)
+        store.close()
+    
+    log("=" * 60)
+    log(f"watch 结束：运行 {result['running_minutes']} 分钟，领域扫描 {result['domain_scans']} 次，"
+        f"搜索 {result['searches']} 次（{result['searches_per_minute']} 次/分钟）")
+    log(f"High: {counts['HIGH']}, Medium: {counts['MEDIUM']}, Low: {counts['LOW']}")
+    log("=" * 60)
+    return result
+
+def main() -> Optional[Dict]:
+    """主入口"""
+    parser = argparse.ArgumentParser(description="TechPulse Scout - 科技脉搏·侦察兵")
+    parser.add_argument("--watch", action="store_true", help="持续监控：各领域自适应轮询，事件实时写入事件流")
+    parser.add_argument("--duration", type=float, default=0, help="watch 模式运行时长（秒），默认一直运行")
+    args = parser.parse_args()
+    
+    log("=" * 60)
+    log("TechPulse Scout - 科技脉搏·侦察兵启动")
+    log("=" * 60)
+    
+    try:
+        if args.watch:
+            return run_watch(args.duration)
+        return run_scan()
     except Exception as e:
         log(f"❌ 执行异常：{str(e)}")
         import traceback
         log(traceback.format_exc())
+        return None
 
 if __name__ == "__main__":
     main()
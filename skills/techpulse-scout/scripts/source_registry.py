@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# =============================================================================
+# 信源注册表（TechPulse Scout / TechChain Insight 共用）
+# 功能：URL 只解析一次主机名，按域名后缀逐级查表（O(标签数) 次 dict 查找），
+#       X/Nitter 链接再按账号路径查表；给出来源类型、权威分、显示名称
+# 数据：data/sources.json（域名 → 类型/权威分/名称，X 主机与权威账号列表）
+# =============================================================================
+
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import urlsplit
+
+SOURCES_FILE = Path(__file__).resolve().parent.parent / "data" / "sources.json"
+
+# 未收录来源的类型
+UNKNOWN_CLASS = "未知来源"
+
+# 主机名 → 解析结果缓存条数
+HOST_CACHE_SIZE = 4096
+
+_REGISTRY: Optional[Dict[str, Any]] = None
+
+def load_registry(sources_file: Path = SOURCES_FILE) -> Dict[str, Any]:
+    """读取信源数据文件（X 账号统一转小写，分组展开为一张表）"""
+    with open(sources_file, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    accounts = {}
+    for group in data.get("x_accounts", []):
+        for account, name in group.get("accounts", {}).items():
+            accounts[account.lower()] = name
+    return {
+        "domains": data.get("domains", {}),
+        "x_hosts": set(data.get("x_hosts", [])),
+        "x_source": data.get("x_source", {}),
+        "x_accounts": accounts,
+    }
+
+def registry() -> Dict[str, Any]:
+    """信源表（首次使用时加载）"""
+    global _REGISTRY
+    if _REGISTRY is None:
+        _REGISTRY = load_registry()
+    return _REGISTRY
+
+def reload_registry(sources_file: Path = SOURCES_FILE):
+    """重新读取数据文件并清空缓存"""
+    global _REGISTRY
+    _REGISTRY = load_registry(sources_file)
+    _resolve_host.cache_clear()
+
+@lru_cache(maxsize=HOST_CACHE_SIZE)
+def _resolve_host(host: str) -> Tuple[Dict[str, Any], bool]:
+    """
+    主机名 → (域名条目, 是否 X/Nitter 主机)
+    从完整主机名开始逐级去掉左侧标签查表，finance.sina.com.cn 命中 sina.com.cn，miit.gov.cn 命中 gov.cn
+    """
+    reg = registry()
+    labels = host.split(".")
+    suffixes = [".".join(labels[i:]) for i in range(len(labels) - 1)]
+    entry = next((reg["domains"][s] for s in suffixes if s in reg["domains"]), {})
+    is_x = labels[0] == "nitter" or any(s in reg["x_hosts"] for s in suffixes)
+    return entry, is_x
+
+def parse_source(url: str) -> Tuple[str, Dict[str, Any], bool, str]:
+    """
+    解析 URL 来源
+    返回：(主机名, 域名条目, 是否 X/Nitter 链接, X 账号小写)
+    """
+    try:
+        parts = urlsplit(url)
+        host = (parts.hostname or "").lower()
+    except ValueError:
+        return "", {}, False, ""
+    if not host:
+        return "", {}, False, ""
+    entry, is_x = _resolve_host(host)
+    account = parts.path.strip("/").split("/", 1)[0].lower() if is_x else ""
+    return host, entry, is_x, account
+
+def x_account(url: str) -> str:
+    """X/Nitter 链接的账号名（小写，非 X 链接返回空字符串）"""
+    return parse_source(url)[3]
+
+def is_authoritative_x(url: str) -> bool:
+    """是否为白名单中的权威 X 账号"""
+    account = x_account(url)
+    return bool(account) and account in registry()["x_accounts"]
+
+def source_class(url: str) -> str:
+    """
+    scout 口径的来源类型
+    官方公告/顶级财经/权威 X 账号/普通 X 账号/科技媒体/主流财经/社交媒体/未知来源
+    """
+    _, entry, is_x, account = parse_source(url)
+    if "class" in entry:
+        return entry["class"]
+    if is_x:
+        x_source = registry()["x_source"]
+        if account in registry()["x_accounts"]:
+            return x_source.get("authoritative_class", UNKNOWN_CLASS)
+        return x_source.get("class", UNKNOWN_CLASS)
+    return UNKNOWN_CLASS
+
+def analysis_class(url: str) -> str:
+    """techchain 口径的来源类型：官方公告/科技媒体/财经媒体/券商研报/社交媒体/未知来源"""
+    _, entry, is_x, _ = parse_source(url)
+    if "analysis_class" in entry:
+        return entry["analysis_class"]
+    if is_x:
+        return registry()["x_source"].get("analysis_class", UNKNOWN_CLASS)
+    return UNKNOWN_CLASS
+
+def authority_points(url: str) -> int:
+    """可信度评分中的来源权威加分（未收录为 0）"""
+    return parse_source(url)[1].get("authority", 0)
+
+def is_authoritative(url: str) -> bool:
+    """是否为热点判定认可的权威信源"""
+    return parse_source(url)[1].get("authoritative", False)
+
+def display_name(url: str) -> str:
+    """来源显示名称（未收录时返回去掉 www. 的主机名）"""
+    host, entry, _, _ = parse_source(url)
+    if "name" in entry:
+        return entry["name"]
+    return host[4:] if host.startswith("www.") else host
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# =============================================================================
+# 主题扫描引擎（TechPulse Scout / TechChain Insight 共用）
+# 功能：合并多个技能的监控主题（同名主题只扫描一次，关键词取并集），
+#       每个主题由第一个声明它的技能的采集函数联网搜索，
+#       采集到的新闻按主题分发给所有关注该主题的技能
+# 用途：工作流中 Scout 事件与热点评分共用同一轮搜索结果
+# =============================================================================
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Callable, Iterator, Tuple
+
+from news_item import NewsItem
+
+# 默认并发采集的主题数
+DEFAULT_WORKERS = 6
+
+def merge_topics(topic_sets: Dict[str, Dict[str, List[str]]]) -> Dict[str, Dict[str, Any]]:
+    """
+    合并各技能的主题定义
+    topic_sets：{技能名: {主题: 关键词列表}}，技能按优先级排列（字典顺序）
+    返回：{主题: {"keywords": 关键词并集（先出现的在前）, "consumers": 关注该主题的技能}}，
+          主题按首次出现的顺序排列
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    for consumer, topics in topic_sets.items():
+        for topic, keywords in topics.items():
+            entry = merged.setdefault(topic, {"keywords": [], "consumers": []})
+            entry["keywords"] = list(dict.fromkeys(entry["keywords"] + list(keywords)))
+            entry["consumers"].append(consumer)
+    return merged
+
+class TopicScanEngine:
+    """
+    合并主题的一轮扫描
+
+    - collectors：{技能名: 采集函数(主题, 关键词) -> 新闻列表}；
+      每个主题用其 consumers 中第一个技能的采集函数，只采集一次
+    - scan()：并发采集，按主题顺序产出 (主题, 新闻列表)（某主题及其之前的都完成即产出）
+    - news_for(技能名)：扫描结束后该技能关注的 {主题: 新闻列表}
+    """
+
+    def __init__(self, topics: Dict[str, Dict[str, Any]],
+                 collectors: Dict[str, Callable[[str, List[str]], List[NewsItem]]],
+                 workers: int = DEFAULT_WORKERS):
+        self.topics = topics
+        self.collectors = collectors
+        self.workers = workers
+        self.news: Dict[str, List[NewsItem]] = {}
+
+    def collector_for(self, topic: str) -> str:
+        """负责采集该主题的技能"""
+        return next(c for c in self.topics[topic]["consumers"] if c in self.collectors)
+
+    def scan(self) -> Iterator[Tuple[str, List[NewsItem]]]:
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="topic") as pool:
+            futures = {
+                topic: pool.submit(self.collectors[self.collector_for(topic)], topic, entry["keywords"])
+                for topic, entry in self.topics.items()
+            }
+            for topic, future in futures.items():
+                self.news[topic] = future.result()
+                yield topic, self.news[topic]
+
+    def scan_all(self) -> Dict[str, List[NewsItem]]:
+        """采集全部主题（不需要边采集边处理时使用）"""
+        for _ in self.scan():
+            pass
+        return self.news
+
+    def news_for(self, consumer: str) -> Dict[str, List[NewsItem]]:
+        return {topic: news for topic, news in self.news.items() if consumer in self.topics[topic]["consumers"]}
+
+    def stats(self) -> Dict[str, int]:
+        """主题总数、被多个技能共用的主题数（每个共用主题省去一轮重复搜索）"""
+        return {
+            "topics": len(self.topics),
+            "shared_topics": sum(1 for entry in self.topics.values() if len(entry["consumers"]) > 1),
+        }
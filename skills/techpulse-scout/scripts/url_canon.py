@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# =============================================================================
+# URL 规范化（TechPulse Scout / TechChain Insight 共用）
+# 功能：同一篇报道的不同 URL 写法归一为同一个去重键
+#       - 统一 https、主机名小写、去掉 www./m./mobile./wap./amp. 前缀与默认端口
+#       - 去掉跟踪参数（utm_*、spm、from 等）与锚点，其余参数按名称排序
+#       - AMP 变体（.amp.html、Google AMP 缓存）还原为原文地址；路径中的 amp 段（/amp/...、.../amp）
+#         只在有 AMP 标记（amp 参数、amp. 子域、来自 AMP 缓存）时去掉，避免误合并不同页面
+#       - X/Nitter 链接统一为 x.com；推文按 ID 归一（账号大小写、/i/web/status 写法不影响）
+# 校验：python3 scripts/url_canon.py 用 data/url_canon_cases.json 中的等价/不等价 URL 对自检
+# =============================================================================
+
+import re
+import sys
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Tuple
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+from source_registry import parse_source
+
+CASES_FILE = Path(__file__).resolve().parent.parent / "data" / "url_canon_cases.json"
+
+# 规范化结果缓存条数
+CANON_CACHE_SIZE = 8192
+
+# 跟踪参数（整名匹配，小写）与前缀
+TRACKING_PARAMS = {
+    "spm", "from", "share", "share_source", "share_medium", "share_from", "sharetype", "share_token",
+    "fbclid", "gclid", "yclid", "msclkid", "igshid", "ref", "ref_src", "ref_url", "referrer",
+    "isappinstalled", "wfr", "scene", "srcid", "ncid", "cmpid", "tt_from", "utm",
+}
+TRACKING_PREFIXES = ("utm_", "mc_", "pk_", "hmsr", "share_")
+
+# AMP 标记参数（outputType 仅在值为 amp 时算标记）
+AMP_PARAMS = {"amp", "outputtype", "amp_js_v", "usqp"}
+
+# 移动版 / AMP 子域前缀（去掉后至少保留两级域名）
+HOST_PREFIXES = ("www.", "m.", "mobile.", "wap.", "amp.")
+
+# Google AMP 缓存：google.com/amp/s/<原地址>、<xxx>.cdn.ampproject.org/c/s/<原地址>
+_GOOGLE_AMP_PATH = re.compile(r"^/amp/(s/)?(?P<rest>.+)$")
+_AMPPROJECT_PATH = re.compile(r"^/[cv]/(s/)?(?P<rest>.+)$")
+
+# 推文路径：/<账号>/status/<ID>[/photo/1 ...]、/i/web/status/<ID>
+_X_STATUS_PATH = re.compile(r"^/(?:[^/]+|i/web)/status(?:es)?/(?P<id>\d+)", re.IGNORECASE)
+
+def _strip_host_prefixes(host: str) -> str:
+    changed = True
+    while changed:
+        changed = False
+        for prefix in HOST_PREFIXES:
+            rest = host[len(prefix):]
+            if host.startswith(prefix) and "." in rest:
+                host, changed = rest, True
+    return host
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name in AMP_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+def _is_amp_marker(name: str, value: str) -> bool:
+    name = name.lower()
+    if name == "outputtype":
+        return value.lower() == "amp"
+    return name in AMP_PARAMS
+
+def _normalize_path(path: str, amp: bool = False) -> str:
+    """
+    路径规范化
+    amp: URL 带 AMP 标记，此时开头的 /amp/ 与末尾的 /amp 段也视为 AMP 写法去掉
+    """
+    path = re.sub(r"/{2,}", "/", path or "/")
+    if len(path) > 1 and path.endswith("/"):
+        path = path.rstrip("/")
+    # AMP 路径变体
+    if path.endswith(".amp.html"):
+        path = path[:-len(".amp.html")] + ".html"
+    if amp:
+        if path.startswith("/amp/"):
+            path = path[len("/amp"):]
+        if path.endswith("/amp"):
+            path = path[:-len("/amp")]
+    return path or "/"
+
+def _unwrap_amp_cache(host: str, path: str) -> str:
+    """Google AMP 缓存地址中的原文地址（不是缓存地址时返回空字符串）"""
+    if host in ("google.com", "www.google.com"):
+        match = _GOOGLE_AMP_PATH.match(path)
+    elif host.endswith(".cdn.ampproject.org"):
+        match = _AMPPROJECT_PATH.match(path)
+    else:
+        return ""
+    return "https://" + match.group("rest") if match else ""
+
+def _canonical_x(path: str) -> str:
+    """X/Nitter 链接：推文按 ID 归一，其余页面按小写路径归一到 x.com"""
+    match = _X_STATUS_PATH.match(path)
+    if match:
+        return f"https://x.com/i/status/{match.group('id')}"
+    path = _normalize_path(path).lower()
+    return "https://x.com" + ("" if path == "/" else path)
+
+@lru_cache(maxsize=CANON_CACHE_SIZE)
+def canonical_url(url: str) -> str:
+    """
+    URL 的规范形式（去重键）
+    无法解析或没有主机名的字符串原样返回（去掉首尾空白）
+    """
+    return _canonical(url)
+
+def _canonical(url: str, from_amp_cache: bool = False) -> str:
+    url = (url or "").strip()
+    try:
+        parts = urlsplit(url if "://" in url else "https://" + url)
+        host = (parts.hostname or "").lower().rstrip(".")
+        parts.port  # 非法端口在这里抛出 ValueError
+    except ValueError:
+        return url
+    if not host:
+        return url
+
+    original = _unwrap_amp_cache(host, parts.path)
+    if original:
+        return _canonical(original, from_amp_cache=True)
+
+    _, _, is_x, _ = parse_source(url if "://" in url else "https://" + url)
+    if is_x:
+        return _canonical_x(parts.path)
+
+    raw_params = parse_qsl(parts.query, keep_blank_values=True)
+    amp = (from_amp_cache or (host.startswith("amp.") and host.count(".") > 1)
+           or any(_is_amp_marker(k, v) for k, v in raw_params))
+    params = [(k, v) for k, v in raw_params if not _is_tracking_param(k)]
+    query = urlencode(sorted(params))
+    return f"https://{_strip_host_prefixes(host)}{_normalize_path(parts.path, amp)}" + (f"?{query}" if query else "")
+
+def same_story(url_a: str, url_b: str) -> bool:
+    """两个 URL 是否指向同一篇内容"""
+    return canonical_url(url_a) == canonical_url(url_b)
+
+# ==================== 自检 ====================
+def check_cases(cases_file: Path = CASES_FILE) -> List[Tuple[str, str, str]]:
+    """
+    用 URL 对样例自检
+    返回：失败列表 [(类别, url_a, url_b)]；equivalent 应规范化为同一 URL，distinct 应不同
+    """
+    with open(cases_file, "r", encoding="utf-8") as f:
+        cases: Dict[str, List[List[str]]] = json.load(f)
+    failures = []
+    for url_a, url_b in cases.get("equivalent", []):
+        if not same_story(url_a, url_b):
+            failures.append(("equivalent", url_a, url_b))
+    for url_a, url_b in cases.get("distinct", []):
+        if same_story(url_a, url_b):
+            failures.append(("distinct", url_a, url_b))
+    return failures
+
+if __name__ == "__main__":
+    with open(CASES_FILE, "r", encoding="utf-8") as f:
+        total = sum(len(v) for v in json.load(f).values())
+    failures = check_cases()
+    for kind, url_a, url_b in failures:
+        print(f"❌ [{kind}] {url_a}\n    → {canonical_url(url_a)}\n   {url_b}\n    → {canonical_url(url_b)}")
+    print(f"{total - len(failures)}/{total} 组通过")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,12 @@
+# =============================================================================
+# TechPulse Scout - 测试公共配置
+# 脚本目录加入 sys.path，与脚本运行时的同目录导入一致
+# =============================================================================
+
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
@@ -0,0 +1,110 @@
+# =============================================================================
+# 近重复事件索引：近阈值标题对的 LSH 召回、小窗口逐条比对、URL 去重与过期
+# =============================================================================
+
+import random
+from datetime import datetime, timedelta
+from difflib import SequenceMatcher
+
+import pytest
+
+import dedup_index
+from dedup_index import DedupIndex, FULL_SCAN_MAX_EVENTS, SIMILARITY_THRESHOLD
+
+NOW = datetime(2026, 10, 19, 12, 0)
+
+# ratio 落在 (SIMILARITY_THRESHOLD, NEAR_RATIO_MAX] 内的标题对最难召回
+NEAR_RATIO_MAX = 0.86
+NEAR_RECALL_MIN = 0.99
+
+def make_event(title, url="", hours_ago=1.0):
+    return {"title": title, "source_url": url, "timestamp": (NOW - timedelta(hours=hours_ago)).isoformat()}
+
+def random_titles(count, seed=7):
+    rng = random.Random(seed)
+    pool = [chr(0x4E00 + i) for i in range(400)]
+    return ["".join(rng.choice(pool) for _ in range(rng.randint(14, 30))) for _ in range(count)]
+
+def near_threshold_variant(title, rng):
+    """逐字替换/插入/删除，直到与原标题的 ratio 刚好低于 NEAR_RATIO_MAX；落在阈值区间外返回 None"""
+    variant = list(title)
+    ratio = 1.0
+    while ratio > NEAR_RATIO_MAX:
+        op, pos = rng.randrange(3), rng.randrange(len(variant))
+        if op == 0:
+            variant[pos] = chr(0x4E00 + rng.randrange(400))
+        elif op == 1:
+            variant.insert(pos, chr(0x4E00 + rng.randrange(400)))
+        elif len(variant) > 6:
+            del variant[pos]
+        ratio = SequenceMatcher(None, "".join(variant), title).ratio()
+    return "".join(variant) if ratio > SIMILARITY_THRESHOLD else None
+
+@pytest.fixture(scope="module")
+def corpus():
+    titles = random_titles(400)
+    index = DedupIndex()
+    index.add_all([make_event(title) for title in titles])
+    rng = random.Random(11)
+    pairs = []
+    while len(pairs) < 300:
+        entry_id = rng.randrange(len(titles))
+        variant = near_threshold_variant(titles[entry_id], rng)
+        if variant:
+            pairs.append((variant, entry_id))
+    return index, pairs
+
+def test_near_threshold_pairs_are_lsh_candidates(corpus):
+    index, pairs = corpus
+    assert len(index) > FULL_SCAN_MAX_EVENTS
+    found = sum(entry_id in index.candidates(variant) for variant, entry_id in pairs)
+    assert found / len(pairs) >= NEAR_RECALL_MIN
+
+def test_near_threshold_pairs_are_duplicates(corpus):
+    index, pairs = corpus
+    hits = sum(index.is_duplicate(make_event(variant, hours_ago=0), now=NOW) for variant, _ in pairs)
+    assert hits / len(pairs) >= NEAR_RECALL_MIN
+
+def test_below_threshold_titles_are_not_duplicates():
+    rng = random.Random(3)
+    titles = random_titles(60, seed=5)
+    index = DedupIndex()
+    index.add_all([make_event(title) for title in titles])
+    for title in titles[:20]:
+        variant = list(title)
+        while SequenceMatcher(None, "".join(variant), title).ratio() > 0.7:
+            variant[rng.randrange(len(variant))] = chr(0x9000 + rng.randrange(100))
+        assert not index.is_duplicate(make_event("".join(variant), hours_ago=0), now=NOW)
+
+def test_small_window_scans_every_event(monkeypatch):
+    index = DedupIndex()
+    index.add_all([make_event(title) for title in random_titles(FULL_SCAN_MAX_EVENTS - 1)])
+    index.add(make_event("英伟达发布新一代 Rubin 架构芯片"))
+    monkeypatch.setattr(index, "candidates", lambda title: pytest.fail("小窗口不应查 LSH"))
+    assert index.is_duplicate(make_event("英伟达发布新一代 Rubin 架构", hours_ago=0), now=NOW)
+    assert index.comparisons <= FULL_SCAN_MAX_EVENTS
+
+def test_canonical_url_duplicates():
+    index = DedupIndex()
+    index.add(make_event("标题甲", "https://www.cls.cn/detail/1?utm_source=wx"))
+    assert index.is_duplicate(make_event("完全不同的标题", "http://cls.cn/detail/1"), now=NOW)
+    assert not index.is_duplicate(make_event("完全不同的标题", "https://www.cls.cn/detail/2"), now=NOW)
+
+def test_events_outside_window_expire():
+    index = DedupIndex(hours=24)
+    index.add(make_event("台积电上调资本开支", "https://example.com/old", hours_ago=30))
+    index.add(make_event("宁德时代发布钠电池", hours_ago=2))
+    assert not index.is_duplicate(make_event("台积电上调资本开支", "https://example.com/old", hours_ago=0), now=NOW)
+
+    index.expire(now=NOW)
+    assert len(index) == 1
+    assert index.is_duplicate(make_event("宁德时代发布钠电池！", hours_ago=0), now=NOW)
+
+def test_empty_title_and_unparsable_time():
+    index = DedupIndex()
+    index.add({"title": "无时间戳", "timestamp": "昨天"})
+    assert len(index) == 0
+    assert not index.is_duplicate(make_event(""), now=NOW)
+
+def test_band_layout_matches_signature_length():
+    assert dedup_index.LSH_BANDS * dedup_index.LSH_ROWS == dedup_index.NUM_PERM
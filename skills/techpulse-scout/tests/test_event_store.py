@@ -0,0 +1,73 @@
+# =============================================================================
+# 事件库（SQLite）：按 ID/规范化 URL/标题指纹去重、按时间窗口查询与过期
+# =============================================================================
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from event_store import EventStore, RETENTION_DAYS, parse_event_time, title_fingerprint
+
+def make_event(event_id, title, url="", hours_ago=0.0):
+    timestamp = (datetime.now() - timedelta(hours=hours_ago)).isoformat()
+    return {"id": event_id, "title": title, "source_url": url, "timestamp": timestamp}
+
+@pytest.fixture
+def store(tmp_path):
+    with EventStore(tmp_path / "events.db") as store:
+        yield store
+
+def test_insert_ignores_duplicate_ids(store):
+    events = [make_event("evt_1", "英伟达发布 Rubin"), make_event("evt_2", "台积电扩产 CoWoS")]
+    assert store.insert(events) == 2
+    assert store.insert([make_event("evt_1", "英伟达发布 Rubin（更新）")]) == 0
+    assert store.count() == 2
+
+def test_insert_skips_events_without_id_or_time(store):
+    bad_time = dict(make_event("evt_3", "无效时间"), timestamp="昨天")
+    assert store.insert([make_event("", "缺少 ID"), bad_time]) == 0
+    assert store.count() == 0
+
+def test_has_url_uses_canonical_url(store):
+    store.insert([make_event("evt_1", "标题", "https://www.cls.cn/detail/1?utm_source=x")])
+    assert store.has_url("http://cls.cn/detail/1")
+    assert not store.has_url("https://www.cls.cn/detail/2")
+    assert not store.has_url("")
+
+def test_has_title_ignores_case_width_and_punctuation(store):
+    store.insert([make_event("evt_1", "NVIDIA 发布 HBM4！")])
+    assert store.has_title("ｎｖｉｄｉａ发布hbm4")
+    assert not store.has_title("NVIDIA 发布 HBM3")
+    assert title_fingerprint("A, B") == title_fingerprint("ab")
+
+def test_window_queries_exclude_old_events(store):
+    store.insert([
+        make_event("old", "旧事件", "https://example.com/old", hours_ago=30),
+        make_event("new", "新事件", "https://example.com/new", hours_ago=1),
+    ])
+    assert [e["id"] for e in store.recent(24)] == ["new"]
+    assert [e["id"] for e in store.recent(48)] == ["old", "new"]
+    assert not store.has_url("https://example.com/old")
+    assert store.has_url("https://example.com/old", hours=48)
+    assert not store.has_title("旧事件")
+
+def test_expire_removes_events_past_retention(store):
+    store.insert([
+        make_event("expired", "过期", hours_ago=RETENTION_DAYS * 24 + 1),
+        make_event("kept", "保留", hours_ago=RETENTION_DAYS * 24 - 1),
+    ])
+    assert store.expire() == 1
+    assert [e["id"] for e in store.recent(RETENTION_DAYS * 24)] == ["kept"]
+
+def test_import_json_once(store, tmp_path):
+    legacy = tmp_path / "known_events.json"
+    legacy.write_text(json.dumps([make_event("evt_1", "旧版事件")], ensure_ascii=False), encoding="utf-8")
+    assert store.import_json(legacy) == 1
+    assert not legacy.exists()
+    assert (tmp_path / "known_events.json.imported").exists()
+    assert store.import_json(legacy) == 0
+
+def test_parse_event_time_accepts_legacy_z_suffix():
+    assert parse_event_time("2026-03-03T02:00:00Z") == datetime(2026, 3, 3, 2, 0)
+    assert parse_event_time("") is None
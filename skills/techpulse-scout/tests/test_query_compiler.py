@@ -0,0 +1,135 @@
+# =============================================================================
+# 搜索查询编译：site: OR 合并、结果按站点拆回、后端不支持 OR 时退回逐站点查询
+# =============================================================================
+
+import re
+
+import pytest
+
+import scout
+from query_compiler import SITE_OR_MAX_MISSES, SiteOrSupport, SiteQuery, compile_queries, match_site, split_by_site
+
+SITES = ["cls.cn", "stcn.com", "nitter.net/elonmusk"]
+
+def result(url):
+    return {"title": f"标题 {url}", "url": url, "content": ""}
+
+# ==================== 编译与拆分 ====================
+def test_compile_merges_sites_per_keyword():
+    queries = compile_queries(["HBM", "CoWoS"], SITES, "最新进展")
+    assert [q.text() for q in queries] == [
+        "HBM (site:cls.cn OR site:stcn.com OR site:nitter.net/elonmusk)",
+        "HBM 最新进展",
+        "CoWoS (site:cls.cn OR site:stcn.com OR site:nitter.net/elonmusk)",
+        "CoWoS 最新进展",
+    ]
+    assert [q.text() for q in compile_queries(["HBM"], SITES, merge=False)] == [
+        "HBM site:cls.cn", "HBM site:stcn.com", "HBM site:nitter.net/elonmusk",
+    ]
+    assert not SiteQuery("HBM", ["cls.cn"]).merged
+
+@pytest.mark.parametrize("url, site, expected", [
+    ("https://www.cls.cn/detail/1", "cls.cn", True),
+    ("https://notcls.cn/detail/1", "cls.cn", False),
+    ("https://nitter.net/ElonMusk/status/1", "nitter.net/elonmusk", True),
+    ("https://nitter.net/elonmusk2/status/1", "nitter.net/elonmusk", False),
+    ("https://nitter.net/OpenAI", "nitter.net/elonmusk", False),
+    ("", "cls.cn", False),
+])
+def test_match_site(url, site, expected):
+    assert match_site(url, site) is expected
+
+def test_split_by_site_keeps_rank_and_drops_unmatched():
+    results = [
+        result("https://stcn.com/a"),
+        result("https://www.cls.cn/1"),
+        result("https://example.com/x"),
+        result("https://m.cls.cn/2"),
+        result("https://nitter.net/elonmusk/status/9"),
+    ]
+    buckets = split_by_site(results, SITES)
+    assert [r["url"] for r in buckets["cls.cn"]] == ["https://www.cls.cn/1", "https://m.cls.cn/2"]
+    assert [r["url"] for r in buckets["stcn.com"]] == ["https://stcn.com/a"]
+    assert [r["url"] for r in buckets["nitter.net/elonmusk"]] == ["https://nitter.net/elonmusk/status/9"]
+
+# ==================== 合并支持判定 ====================
+def test_auto_mode_disables_after_consecutive_misses():
+    support = SiteOrSupport("auto")
+    assert support.enabled and support.fallback_allowed
+    assert not support.record(False)
+    assert not support.record(True)  # 命中后重新计数
+    for _ in range(SITE_OR_MAX_MISSES - 1):
+        assert not support.record(False)
+    assert support.record(False)
+    assert not support.enabled
+    assert support.fallbacks == SITE_OR_MAX_MISSES + 1
+
+def test_fixed_modes(monkeypatch):
+    on = SiteOrSupport("on")
+    for _ in range(SITE_OR_MAX_MISSES + 1):
+        on.record(False)
+    assert on.enabled and not on.fallback_allowed
+    assert not SiteOrSupport("off").enabled
+
+    monkeypatch.setenv("SCOUT_SITE_OR", "OFF")
+    assert SiteOrSupport().mode == "off"
+    monkeypatch.setenv("SCOUT_SITE_OR", "bogus")
+    assert SiteOrSupport().mode == "auto"
+
+# ==================== 领域扫描中的退回 ====================
+class FakeBackend:
+    """记录查询；or_supported=False 时合并查询返回不在任何限定站点的结果"""
+
+    def __init__(self, or_supported):
+        self.or_supported = or_supported
+        self.queries = []
+
+    def __call__(self, query, count, deadline=None, rate_limiter=None):
+        self.queries.append(query)
+        n = len(self.queries)
+        sites = re.findall(r"site:([^\s)]+)", query)
+        if not sites or (len(sites) > 1 and not self.or_supported):
+            return [result(f"https://example.com/{n}")]
+        return [result(f"https://{site}/{n}-{i}") for site in sites for i in range(3)]
+
+@pytest.fixture
+def scan(monkeypatch):
+    def run(or_supported, mode="auto", keywords=("HBM", "CoWoS", "Rubin")):
+        backend = FakeBackend(or_supported)
+        monkeypatch.setattr(scout, "SITE_OR", SiteOrSupport(mode))
+        monkeypatch.setattr(scout, "run_search", backend)
+        monkeypatch.setattr(scout, "log", lambda message, level="INFO": None)
+        monkeypatch.setattr(scout, "MAX_QUERIES_PER_DOMAIN", 100)
+        monkeypatch.setattr(scout, "MAX_NEWS_PER_DOMAIN", 100)
+        slots = {}
+        news = scout.scan_domain("半导体", list(keywords), best_source={"source_type": "domestic"}, slots=slots)
+        return backend, news, slots
+    return run
+
+def test_scan_uses_merged_queries_when_supported(scan):
+    backend, news, slots = scan(True)
+    sites = scout.AUTHORITATIVE_SITES + scout.DOMESTIC_ALT_SITES
+    assert sum(" OR " in q for q in backend.queries) == 3
+    assert not any("site:" in q and " OR " not in q for q in backend.queries)
+    # 每个站点取前 RESULTS_PER_SITE 条
+    assert len(news) == 3 * (len(sites) * scout.RESULTS_PER_SITE + 1)
+    assert slots["半导体"] == 3 * (len(sites) + 1) * scout.RESULTS_PER_SITE
+    assert scout.SITE_OR.enabled
+
+def test_scan_falls_back_to_single_site_queries(scan):
+    backend, news, _ = scan(False)
+    sites = scout.AUTHORITATIVE_SITES + scout.DOMESTIC_ALT_SITES
+    # 前 SITE_OR_MAX_MISSES 个关键词先试合并查询再退回，之后直接逐站点查询
+    assert sum(" OR " in q for q in backend.queries) == SITE_OR_MAX_MISSES
+    for kw in ("HBM", "CoWoS", "Rubin"):
+        assert [q for q in backend.queries if q.startswith(kw + " site:")] == [f"{kw} site:{s}" for s in sites]
+    assert not scout.SITE_OR.enabled
+    assert len(news) == 3 * (len(sites) * scout.RESULTS_PER_SITE + 1)
+
+def test_scan_on_mode_does_not_fall_back(scan):
+    backend, news, _ = scan(False, mode="on")
+    assert sum(" OR " in q for q in backend.queries) == 3
+    assert not any("site:" in q and " OR " not in q for q in backend.queries)
+    assert scout.SITE_OR.enabled
+    # 合并查询结果不在限定站点内，只剩通用搜索的结果
+    assert len(news) == 3
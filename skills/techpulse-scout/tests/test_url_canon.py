@@ -0,0 +1,41 @@
+# =============================================================================
+# URL 规范化：data/url_canon_cases.json 中的等价（合并）/ 不等价（保持区分）URL 对
+# =============================================================================
+
+import json
+
+import pytest
+
+from url_canon import CASES_FILE, canonical_url, same_story
+
+with open(CASES_FILE, "r", encoding="utf-8") as f:
+    CASES = json.load(f)
+
+@pytest.mark.parametrize("url_a, url_b", CASES["equivalent"])
+def test_equivalent_urls_merge(url_a, url_b):
+    assert canonical_url(url_a) == canonical_url(url_b)
+
+@pytest.mark.parametrize("url_a, url_b", CASES["distinct"])
+def test_distinct_urls_stay_apart(url_a, url_b):
+    assert canonical_url(url_a) != canonical_url(url_b)
+
+@pytest.mark.parametrize("url", [
+    "https://www.cls.cn/detail/1587421?utm_source=wechat",
+    "https://cdn.ampproject.org/c/s/www.cnbc.com/amp/2026/03/03/nvidia.html",
+    "https://nitter.net/elonmusk/status/1897000000000000000",
+])
+def test_canonical_url_is_idempotent(url):
+    assert canonical_url(canonical_url(url)) == canonical_url(url)
+
+def test_query_params_are_order_insensitive():
+    assert same_story("https://example.com/a?b=2&a=1", "https://example.com/a?a=1&b=2&utm_campaign=x")
+
+@pytest.mark.parametrize("url, expected", [
+    ("", ""),
+    ("   ", ""),
+    (" http://[::1 ", "http://[::1"),
+    (" https://a.com:99999/x ", "https://a.com:99999/x"),
+    ("https:///path", "https:///path"),
+])
+def test_unparsable_input_returned_stripped(url, expected):
+    assert canonical_url(url) == expected